@@ -0,0 +1,157 @@
+# Python file for loading and caching images
+
+import pygame
+from collections import OrderedDict
+from functools import lru_cache
+
+# The default memory cap for the surface cache, in bytes
+DEFAULT_MEMORY_CAP = 64 * 1024 * 1024
+
+# The default memory cap for the rendered text cache, in bytes
+DEFAULT_TEXT_MEMORY_CAP = 8 * 1024 * 1024
+
+# How many fonts can be open at once, each of which is a font file at one size
+FONT_CACHE_SIZE = 32
+
+class SurfaceCache():
+    def __init__(self, memory_cap: int = DEFAULT_MEMORY_CAP):
+        """A least-recently-used store of surfaces that never uses more memory than its cap."""
+        self.memory_cap = memory_cap
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict() # Key -> (surface, size in bytes), oldest first
+
+    def get(self, key, factory):
+        """Returns the surface stored under a key, creating it with the factory if it is missing."""
+        # If the surface is stored, mark it as the most recently used and return it
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        self.misses += 1
+        surface = factory()
+        size = surface_size(surface)
+
+        # Surfaces bigger than the whole cache are handed out without being stored
+        if size <= self.memory_cap:
+            self.entries[key] = (surface, size)
+            self.memory_used += size
+            self.evict()
+
+        return surface
+
+    def evict(self):
+        """Removes the least recently used surfaces until the cache fits within its memory cap."""
+        while self.memory_used > self.memory_cap and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.memory_used -= size
+
+    def set_memory_cap(self, memory_cap: int):
+        """Changes the memory cap of the cache, evicting surfaces if needed."""
+        self.memory_cap = memory_cap
+        self.evict()
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self.entries.clear()
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns the counters of the cache."""
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+                "memory_used": self.memory_used,
+                "memory_cap": self.memory_cap}
+
+def surface_size(surface: pygame.Surface) -> int:
+    """Calculates the number of bytes the pixels of a surface take up."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+# Process-wide cache used for every image in the game
+cache = SurfaceCache()
+
+def load_image(path: str, frame = None, size = None) -> pygame.Surface:
+    """
+    Returns an image that has been loaded, converted and scaled, using the cache where possible.
+
+    Frame is the part of the image to cut out as (x, y, width, height), for sprite sheets.
+    Size is the (width, height) that the image should be scaled to.
+
+    The same surface is handed to every caller, so it must only be drawn and never drawn on.
+    """
+    # Normalise the arguments so that equal requests share a key
+    if frame is not None:
+        frame = tuple(int(value) for value in frame)
+    if size is not None:
+        size = (int(size[0]), int(size[1]))
+
+    key = (path, frame, size)
+
+    def factory():
+        # The whole image, decoded from the disk
+        if frame is None and size is None:
+            image = pygame.image.load(path)
+            # Converting needs a display, so images loaded before one exists stay as they are
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            return image
+
+        # Anything else is made from the whole image, which is also cached
+        image = load_image(path)
+        if frame is not None:
+            image = image.subsurface(pygame.Rect(frame))
+
+        # Scaling creates a new surface; otherwise copy so that the entry does not keep the parent alive
+        if size is not None:
+            return pygame.transform.scale(image, size)
+        return image.copy()
+
+    return cache.get(key, factory)
+
+# Every animation that has been loaded, kept for the whole process so that sprites can share frames
+animations = {}
+
+def load_animation(path: str, frame_count: int, size, frame_size: int = 16) -> tuple:
+    """
+    Returns the frames of a sprite sheet laid out from left to right, already scaled to size.
+
+    The frames are only loaded and scaled the first time, after which every sprite shares them,
+    so changing frame is just a matter of changing which surface is used.
+    """
+    size = (int(size[0]), int(size[1]))
+    key = (path, frame_count, size, frame_size)
+
+    if key not in animations:
+        animations[key] = tuple(load_image(path, (frame_size * index, 0, frame_size, frame_size), size)
+                                for index in range(frame_count))
+
+    return animations[key]
+
+def set_memory_cap(memory_cap: int):
+    """Changes how many bytes of images can be kept in memory at once."""
+    cache.set_memory_cap(memory_cap)
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: str, size: int) -> pygame.font.Font:
+    """Returns a font at a size, which is only opened from the disk the first time it is asked for."""
+    return pygame.font.Font(path, size)
+
+# Process-wide cache used for every piece of text in the game, kept apart so that text never pushes out images
+text_cache = SurfaceCache(DEFAULT_TEXT_MEMORY_CAP)
+
+def render_text(path: str, size: int, contents: str, colour: tuple, antialias: bool = True) -> pygame.Surface:
+    """
+    Returns a string rendered in a font, using the cache where possible.
+
+    Like images, the same surface is handed to every caller, so it must only be drawn and never drawn on.
+    """
+    size = int(size)
+    colour = tuple(colour)
+    key = (path, size, contents, colour, antialias)
+
+    return text_cache.get(key, lambda: load_font(path, size).render(contents, antialias, colour))
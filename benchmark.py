@@ -0,0 +1,166 @@
+# Python file for measuring how fast every level plays, so changes can be compared
+
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+import pygame
+import main
+import levels
+import seeds
+import simulation
+from profiler import profiler
+
+try:
+    import resource # Only on Unix, so peak memory isn't measured elsewhere
+except ImportError:
+    resource = None
+
+BENCHMARK_VERSION = 1 # Changes whenever results stop being comparable with older ones
+FRAMES = 1800 # Frames played on each level, which is 30 seconds of play
+ALLOCATION_FRAMES = 300 # Frames played again while tracing memory, which is much slower
+KEY_INTERVAL = 12 # Frames between key presses, a little longer than a move takes
+THRESHOLD = 0.1 # How much slower a level can get before it counts as a regression
+
+def peak_rss_kb():
+    """Returns the most memory the process has used so far in kilobytes, or None if it can't be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS measures it in bytes rather than kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def script(seed: int, frames: int) -> dict:
+    """Returns the keys pressed on each frame, which are random but the same every time for the same seed."""
+    keys = random.Random(seed)
+    return {frame: keys.choice("WASD") for frame in range(0, frames, KEY_INTERVAL)}
+
+def play(number: int, frames: int, seed: int, draw: bool = True) -> dict:
+    """Plays a level for a number of frames, starting it again whenever it is won or lost, and counts what happened."""
+    presses = script(seed, frames)
+    counts = {"restarts": 0, "wins": 0}
+
+    scene = main.play_level(number, seed) # The enemies and voice lines pick the same things every run
+    scene.enter()
+    for frame in range(frames):
+        if frame in presses:
+            scene.handle_event(pygame.event.Event(pygame.KEYDOWN, key=simulation.KEYS[presses[frame]]))
+
+        with profiler.phase("step"):
+            scene.update()
+
+        if draw:
+            with profiler.phase("draw"):
+                scene.draw()
+
+        # Play the level again rather than going to the win menu, with the seed the game would restart it with
+        if scene.next_scene is not None:
+            counts["wins" if isinstance(scene.next_scene, main.WinMenu) else "restarts"] += 1
+            scene = main.play_level(number, seeds.derive(scene.seed, "restart"))
+            scene.enter()
+
+        profiler.end_frame()
+
+    return counts
+
+def measure(number: int, frames: int = FRAMES, seed: int = 0, draw: bool = True,
+            allocation_frames: int = ALLOCATION_FRAMES) -> dict:
+    """Plays a level, then plays it again while tracing memory, and returns the results."""
+    profiler.reset(frames)
+    profiler.enabled = True
+
+    start = time.perf_counter()
+    counts = play(number, frames, seed, draw)
+    seconds = time.perf_counter() - start
+
+    stats = profiler.stats()
+    profiler.enabled = False
+
+    # Tracing makes everything much slower, so it is done separately from the timing
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    play(number, allocation_frames, seed, draw)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"frames": frames,
+            "seconds": seconds,
+            "fps": frames / seconds,
+            "restarts": counts["restarts"],
+            "wins": counts["wins"],
+            "frame_p50_ms": stats["p50"],
+            "frame_p99_ms": stats["p99"],
+            "phases": stats["phases"],
+            "allocation_peak_kb": (peak - before) / 1024,
+            "allocation_retained_kb": (after - before) / 1024,
+            "peak_rss_kb": peak_rss_kb()}
+
+def run_benchmark(numbers: list, frames: int = FRAMES, seed: int = 0, draw: bool = True,
+                  allocation_frames: int = ALLOCATION_FRAMES) -> dict:
+    """Measures each level, returning everything needed to compare with another run."""
+    main.create_app(display=draw)
+
+    results = {}
+    for number in numbers:
+        results[str(number)] = measure(number, frames, seed, draw, allocation_frames)
+        print(f"Level {number}: {results[str(number)]['fps']:,.0f} frames per second")
+
+    return {"version": BENCHMARK_VERSION,
+            "seed": seed,
+            "frames": frames,
+            "draw": draw,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "levels": results,
+            "peak_rss_kb": peak_rss_kb()}
+
+def compare(results: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+    """Prints how the frames per second of each level changed from the baseline, returning the levels that got slower."""
+    if baseline.get("version") != results["version"]:
+        print(f"The baseline is from version {baseline.get('version')} of the benchmark, so it can't be compared.")
+        return []
+
+    if (baseline["seed"], baseline["frames"], baseline["draw"]) != (results["seed"], results["frames"], results["draw"]):
+        print("Warning: the baseline was made with a different seed, frame count or drawing setting.")
+
+    regressions = []
+    for number, level in results["levels"].items():
+        if number not in baseline["levels"]:
+            continue
+        old = baseline["levels"][number]["fps"]
+        change = (level["fps"] - old) / old
+        slower = change < -threshold
+        if slower:
+            regressions.append(number)
+        print(f"Level {number}: {old:,.0f} -> {level['fps']:,.0f} frames per second ({change:+.1%}){'  SLOWER' if slower else ''}")
+
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays every level headlessly and measures how fast it runs.")
+    parser.add_argument("--levels", type=int, nargs="+", help="levels to play, which is all of them by default")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="frames played on each level")
+    parser.add_argument("--allocation-frames", type=int, default=ALLOCATION_FRAMES, help="frames played while tracing memory")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the enemies and the key presses")
+    parser.add_argument("--no-draw", action="store_true", help="only play the levels, without drawing them")
+    parser.add_argument("--output", default="benchmark.json", help="where to save the results")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="how much slower a level can get, such as 0.1 for 10%%")
+    arguments = parser.parse_args()
+
+    numbers = arguments.levels or list(range(1, levels.level_count() + 1))
+    results = run_benchmark(numbers, arguments.frames, arguments.seed, not arguments.no_draw, arguments.allocation_frames)
+
+    with open(arguments.output, "w") as output_file:
+        json.dump(results, output_file, indent=4)
+    print(f"Saved the results to {arguments.output}")
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, arguments.threshold):
+            sys.exit(1) # Lets scripts notice that something got slower
@@ -0,0 +1,25 @@
+# Python file for the values that the rest of the game is built around
+
+from os.path import join
+
+# Setup for the screen/window
+WIDTH = 1280
+HEIGHT = 720
+CAPTION = "Logical Psycho" # Caption of the window
+FPS = 60 # Frames per second drawn, such as 30, 60 or 144, or 0 to draw as many as possible
+TICK_RATE = 60 # Ticks per second, which is how fast the game plays whatever the frame rate
+MAX_TICKS_PER_FRAME = 5 # Most ticks played before a frame is drawn when the computer falls behind
+DIRTY_RENDERING = False # Only send the parts of the screen that changed to the display
+
+# Setup for the tiles
+SQUARE_LENGTH = 80 # Length of each edge of the tile
+grid = [[x for x in range(0, WIDTH, SQUARE_LENGTH)], [y for y in range(0, HEIGHT, SQUARE_LENGTH)]] # Coordinate map for each tile
+
+# Setup for images
+background1 = join("Assets", "Block", "Background1.png") # Encapsulated path
+background2 = join("Assets", "Block", "Background2.png")
+background3 = join("Assets", "Block", "Background3.png")
+background4 = join("Assets", "Block", "Background4.png")
+background5 = join("Assets", "Block", "Background5.png")
+background6 = join("Assets", "Block", "Background6.png")
+block = join("Assets", "Block", "Block.png")
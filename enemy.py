@@ -1,22 +1,44 @@
 import pygame
-import main
 import random
+import config
+import levels
 import sounds
+import assets
+import settings
+from enum import IntEnum
 from os.path import join
 
+class Direction(IntEnum):
+    """The directions an enemy can move in, numbered in the same order as the swarm's direction arrays."""
+    LEFT = 0
+    RIGHT = 1
+    UP = 2
+    DOWN = 3
+
+# Change in (column, row) for each direction an enemy can move in, indexed by direction
+DIRECTIONS = ((-1, 0),
+              (1, 0),
+              (0, -1),
+              (0, 1))
+
+# Every direction, and the pairs of directions an axisbound enemy can be stuck to
+ALL_DIRECTIONS = tuple(Direction)
+AXES = ((Direction.LEFT, Direction.RIGHT), (Direction.UP, Direction.DOWN))
+
 class Enemy:
     """The home of all enemies in the Logical Psycho game."""
 
     class Static(pygame.sprite.Sprite):
+        # Slots keep every enemy small, as there can be a lot of them on a big map
+        __slots__ = ("image_path", "frames", "index", "image", "rect", "drawn_rect")
+
         def __init__(self, x: int, y: int):
             """Enemy that does nothing. It sits still and menacingly."""
             super().__init__()
             self.image_path = join("Assets", "Enemy", "StaticBeing", "Staticbeing.png")
-            self.frames = [main.get_sprite_sheet(self.image_path, (0, 0, 16, 16)),
-                           main.get_sprite_sheet(self.image_path, (16, 0, 16, 16))]
+            self.frames = assets.load_animation(self.image_path, 2, (config.SQUARE_LENGTH, config.SQUARE_LENGTH))
             self.index: float = 0
-            self.image_normal = self.frames[self.index].convert_alpha()
-            self.image = pygame.transform.scale(self.image_normal, (main.SQUARE_LENGTH, main.SQUARE_LENGTH))
+            self.image = self.frames[self.index]
             self.rect = self.image.get_rect(topleft = (x, y))
         
         def check_collision(self, moving_thing):
@@ -29,8 +51,7 @@ class Enemy:
         
         def set_image(self, index: int):
             """Sets the image of the object"""
-            self.image_normal = self.frames[int(index)].convert_alpha()
-            self.image = pygame.transform.scale(self.image_normal, (main.SQUARE_LENGTH, main.SQUARE_LENGTH))
+            self.image = self.frames[int(index)]
 
         def update(self):
             """Updates the object."""
@@ -45,9 +66,23 @@ class Enemy:
             # Set the image of the sprite
             self.set_image(self.index)
 
-    class Dynamic(pygame.sprite.Sprite):
+        def snapshot(self) -> tuple:
+            """Returns where the animation is, so it can be put back with restore()."""
+            return (self.image, self.index)
+
+        def restore(self, snapshot: tuple):
+            """Puts the animation back how it was when a snapshot was taken."""
+            self.image, self.index = snapshot
 
-        def __init__(self, x: int, y: int, frequency: int = 3, delay: int = 0, style: str = "seek"):
+    class Dynamic(pygame.sprite.Sprite):
+        __slots__ = ("image_path", "frames", "index", "image", "rect", "drawn_rect",
+                     "sound", "volume", "random",
+                     "dy", "dx", "current_frame", "target_frame", "moving", "player_position", "style", "tile_map",
+                     "burst_complete", "burst_count", "burst_direction",
+                     "last_move", "movement_choices",
+                     "since_movement", "target_movement_time")
+
+        def __init__(self, x: int, y: int, frequency: int = 3, delay: int = 0, style: str = "seek", rng: random.Random = None):
             """
             Enemy that pinpoints the player location and moves accordingly.
 
@@ -62,20 +97,23 @@ class Enemy:
             2 - Seek (default): Moves optimally towards player
             3 - Burst: Move 3 times in a row and then wait for a little bit
             4 - Axisbound: Moves only on the X or Y axis
+
+            Rng is where the random moves come from, so giving it a seeded random.Random makes the enemy move the same way every time.
             """
             super().__init__()
             self.image_path = join("Assets", "Enemy", "DynamicBeing", "DynamicBeing.png")
-            self.frames = [main.get_sprite_sheet(self.image_path, (0, 0, 16, 16)),
-                           main.get_sprite_sheet(self.image_path, (16, 0, 16, 16))]
+            self.frames = assets.load_animation(self.image_path, 2, (config.SQUARE_LENGTH, config.SQUARE_LENGTH))
             self.index: float = 0
-            self.image_normal = self.frames[self.index].convert_alpha()
-            self.image = pygame.transform.scale(self.image_normal, (main.SQUARE_LENGTH, main.SQUARE_LENGTH))
+            self.image = self.frames[self.index]
             self.rect = self.image.get_rect(topleft = (x, y))
 
             # Sound attributes
-            self.sound = pygame.mixer.Sound(sounds.effect_sounds[6])
-            self.volume = main.sound_volume
+            self.sound = sounds.bank.get(sounds.effect_sounds[6])
+            self.volume = settings.store.get("sound_volume")
             self.sound.set_volume(self.volume)
+            settings.store.subscribe(self.change_volume) # Follow the volume in the settings
+
+            self.random = rng if rng is not None else random.Random() # Every enemy has its own, so enemies don't affect each other
 
             # Movement attributes
             self.dy = 0
@@ -83,127 +121,73 @@ class Enemy:
             self.current_frame = 0
             self.target_frame = 10
             self.moving = False
-            self.player_position = []
-            self.style = style
+            self.player_position = (0, 0)
+            self.style = style.lower()
+            self.tile_map = None # Tiles the enemy cannot move onto
 
             # Burst algorithm attributes
             self.burst_complete = False
             self.burst_count = 0
             self.burst_direction = None
 
-            # Moving attributes for movement bug
-            self.last_move = ""
-            self.last_enemy_position = []
-            self.translated_distances = []
-            self.movement_choices = []
-            self.bash_wall = False # Ensures that the algorithm detects wall bashing
+            # Moving attributes
+            self.last_move = None
+            self.movement_choices = ALL_DIRECTIONS
 
             # Axisbound algorithm attributes
-            if self.style.lower() ==  "axisbound":
-                self.movement_choices = random.choice([["L", "R"], ["U", "D"]])
+            if self.style == "axisbound":
+                self.movement_choices = self.random.choice(AXES)
 
             # Creating timer for movement
             self.since_movement = 0 - delay
-            self.target_movement_time = round(main.FPS / frequency)
+            self.target_movement_time = round(config.TICK_RATE / frequency)
 
         def seek(self):
             """Optimised movement towards enemy."""
-            # Other distances assuming that the enemy moved in that direction
-
-            distance_if_left = round(((self.player_position[1] - self.rect.y) ** 2 + (self.player_position[0] - (self.rect.x - 80)) ** 2) ** 0.5, 3)
-            distance_if_right = round(((self.player_position[1] - self.rect.y) ** 2 + (self.player_position[0] - (self.rect.x + 80)) ** 2) ** 0.5, 3)
-            distance_if_up = round(((self.player_position[1] - (self.rect.y - 80)) ** 2 + (self.player_position[0] - self.rect.x) ** 2) ** 0.5, 3)
-            distance_if_down = round(((self.player_position[1] - (self.rect.y + 80)) ** 2 + (self.player_position[0] - self.rect.x) ** 2) ** 0.5, 3)
-
-            # Action to take if the enemy does not change position / hits a wall
-            if [self.rect.x, self.rect.y] == self.last_enemy_position:
-                # Gets the move that leads to such a condition and removes it
-                self.translated_distances.remove(self.translated_distances[self.movement_choices.index(self.last_move)])
-                # Removes the respective direction
-                self.movement_choices.remove(self.last_move)
-                self.bash_wall = True
-
-            else:
-                # List of all distances
-                self.translated_distances = [distance_if_left, distance_if_right, distance_if_up, distance_if_down]
-                self.movement_choices = ["L", "R", "U", "D"]
-
-                # If there is a last move..
-                if self.last_move != "" and self.bash_wall:
-                    # Find the opposing direction to the last movement
-                    opposing_direction = self.reverse_movement(self.last_move)
-                    # Remove that direction from being accessible
-                    self.translated_distances.remove(self.translated_distances[self.movement_choices.index(opposing_direction)])
-                    self.movement_choices.remove(opposing_direction)
-                    self.bash_wall = False
-
-            # Finds the best distance between the player and the enemy
-            best_distance = min(self.translated_distances)
-
-            # Index to find the respective direction
-            index = self.translated_distances.index(best_distance)
-            choice_of_movement = self.movement_choices[index] # Direction
-
-            # Stores the direction of the enemy's movement and the coordinates of the payer
+            # Without a level, there are no walls to go around
+            tile_map = self.tile_map if self.tile_map is not None else levels.load_tile_map(frozenset())
+
+            # How many moves every tile is from the player, shared by every enemy seeking the same tile
+            distances = tile_map.distance_field(tile_map.tile(self.player_position[0], self.player_position[1]))
+            column, row = tile_map.tile(self.rect.x, self.rect.y)
+
+            # Only moves along a shortest path around the walls get closer to the player
+            current_distance = distances.get((column, row))
+            options = []
+            for direction in ALL_DIRECTIONS:
+                move_x, move_y = DIRECTIONS[direction]
+                distance = distances.get((column + move_x, row + move_y))
+                if distance is not None and current_distance is not None and distance < current_distance:
+                    # Ties are broken by the straight line distance, so the enemy heads at the player as it used to
+                    straight_line = ((self.player_position[0] - (self.rect.x + move_x * config.SQUARE_LENGTH)) ** 2 +
+                                     (self.player_position[1] - (self.rect.y + move_y * config.SQUARE_LENGTH)) ** 2)
+                    options.append((straight_line, direction))
+
+            # Equal distances go to the first direction in the order left, right, up, down, like before
+            choice_of_movement = min(options, key=lambda option: option[0])[1] if options else None
+
+            # Stores the direction of the enemy's movement
             self.last_move = choice_of_movement
-            self.last_enemy_position = [self.rect.x, self.rect.y]
-
-            # Move in the direction that corresponds to the letter
-            if choice_of_movement == "U":
-                self.dy = -(main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
 
-            if choice_of_movement == "D":
-                self.dy = (main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "L":
-                self.dy = 0
-                self.dx = -(main.SQUARE_LENGTH / self.target_frame)
-
-            if choice_of_movement == "R":
+            # Wait where it is if the player can't be reached or has already been reached
+            if choice_of_movement is None:
                 self.dy = 0
-                self.dx = (main.SQUARE_LENGTH / self.target_frame)
+                self.dx = 0
+                self.moving = True
+                return
 
-            # Reset the movement frames so that the enemy moves
-            self.moving = True
-            self.get_volume()
-            self.sound.play()
+            self.set_direction(choice_of_movement)
 
         def randomised(self):
             """Enemy moves randomly."""
 
-            # List of all directions to move
-            self.movement_choices = ["L", "R", "U", "D"]
-            choice_of_movement = random.choice(self.movement_choices) # Direction
+            choice_of_movement = self.random.choice(self.movement_choices) # Direction
 
-            # Move in the direction that corresponds to the letter
-            if choice_of_movement == "U":
-                self.dy = -(main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "D":
-                self.dy = (main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "L":
-                self.dy = 0
-                self.dx = -(main.SQUARE_LENGTH / self.target_frame)
-
-            if choice_of_movement == "R":
-                self.dy = 0
-                self.dx = (main.SQUARE_LENGTH / self.target_frame)
-
-            # Reset the movement frames so that the enemy moves
-            self.moving = True
-            self.get_volume()
-            self.sound.play()
+            self.set_direction(choice_of_movement)
 
         def burst(self):
             """Allows the enemy to move thrice before stopping temporarily."""
-            # List of all directions to move
-            self.movement_choices = ["L", "R", "U", "D"]
-            choice_of_movement = random.choice(self.movement_choices) # Direction
+            choice_of_movement = self.random.choice(self.movement_choices) # Direction
             
             # Save the current direction
             if self.burst_direction is None:
@@ -213,30 +197,10 @@ class Enemy:
             else:
                 choice_of_movement = self.burst_direction
 
-            # Move in the direction that corresponds to the letter
-            if choice_of_movement == "U":
-                self.dy = -(main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "D":
-                self.dy = (main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "L":
-                self.dy = 0
-                self.dx = -(main.SQUARE_LENGTH / self.target_frame)
-
-            if choice_of_movement == "R":
-                self.dy = 0
-                self.dx = (main.SQUARE_LENGTH / self.target_frame)
-
-            # Reset the movement frames so that the enemy moves
-            self.moving = True
-            self.get_volume()
-            self.sound.play()
+            self.set_direction(choice_of_movement)
 
             # Increment the counter
-            if self.burst_direction:
+            if self.burst_direction is not None:
                 self.burst_count += 1
 
                 # Burst movement can only happen 3 times in a row
@@ -245,34 +209,14 @@ class Enemy:
                       
         def axisbound(self):
             """A very normal algorithm."""
-            choice_of_movement = random.choice(self.movement_choices) # Direction
-
-            # Move in the direction that corresponds to the letter
-            if choice_of_movement == "U":
-                self.dy = -(main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
-
-            if choice_of_movement == "D":
-                self.dy = (main.SQUARE_LENGTH / self.target_frame)
-                self.dx = 0
+            choice_of_movement = self.random.choice(self.movement_choices) # Direction
 
-            if choice_of_movement == "L":
-                self.dy = 0
-                self.dx = -(main.SQUARE_LENGTH / self.target_frame)
-
-            if choice_of_movement == "R":
-                self.dy = 0
-                self.dx = (main.SQUARE_LENGTH / self.target_frame)
-
-            # Reset the movement frames so that the enemy moves
-            self.moving = True
-            self.get_volume()
-            self.sound.play()
+            self.set_direction(choice_of_movement)
 
         def movement(self):
             """Moves the enemy closer to the player using a chosen algorithm.""" 
             
-            style = self.style.lower()
+            style = self.style
 
             if style == "randomised":
                 self.randomised()
@@ -286,19 +230,22 @@ class Enemy:
             if style == "seek":
                 self.seek()
 
-        def reverse_movement(self, movement_choice):
-            """Reverses a movement choice. Assume that the movement choice is one of 4 characters below."""
+            # Stay in place instead of moving if the tile being moved to is blocked
+            if self.tile_map is not None:
+                if self.tile_map.is_blocked(self.rect.x + self.dx * self.target_frame, self.rect.y + self.dy * self.target_frame):
+                    self.dx = 0
+                    self.dy = 0
 
-            # Reverser dictionary
-            reverser = {
-                "L": "R",
-                "R": "L",
-                "U": "D",
-                "D": "U"
-            }
+        def set_direction(self, direction: Direction):
+            """Starts moving one tile in a direction."""
+            move_x, move_y = DIRECTIONS[direction]
+            self.dx = move_x * (config.SQUARE_LENGTH / self.target_frame)
+            self.dy = move_y * (config.SQUARE_LENGTH / self.target_frame)
+
+            # Reset the movement frames so that the enemy moves
+            self.moving = True
+            sounds.bank.play(self.sound)
 
-            return reverser[movement_choice]
-            
         def check_collision(self, moving_thing):
             """Checks if a moving thing is colliding with the static enemy."""
 
@@ -308,25 +255,19 @@ class Enemy:
                 
             return False
         
-        def get_volume(self):
-            """Gets the volume of the sound."""
-
-            # Open the file in read mode
-            with open("volume.txt", "r") as file:
-                file_copy = file.readlines()
-
-                # Obtains the volume from the file
-                self.volume = float(file_copy[1].replace("\n", ""))
+        def change_volume(self, name: str, value: float):
+            """Changes the volume of the sound when the sound volume setting changes."""
+            if name == "sound_volume":
+                self.volume = value
                 self.sound.set_volume(self.volume)
 
         def get_player_position(self, player_position):
             """Gets the player's position as a rectangle and extracts the x and y coordinates."""
-            self.player_position = [player_position.x, player_position.y]
+            self.player_position = (player_position.x, player_position.y)
          
         def set_image(self, index: int):
             """Sets the image of the object"""
-            self.image_normal = self.frames[int(index)].convert_alpha()
-            self.image = pygame.transform.scale(self.image_normal, (main.SQUARE_LENGTH, main.SQUARE_LENGTH))
+            self.image = self.frames[int(index)]
 
         def update(self):
             """Updates the object."""
@@ -377,16 +318,15 @@ class Enemy:
                 if self.since_movement >= self.target_movement_time and not self.moving:
                     self.movement()
 
-def enemy_factory(enemies: list, type):
-        """Creates enemies based upon a list of enemies."""
-
-        # Have a list to store all the enemies we want to add to the group
-        enemy_list = []
-
-        # For each enemy, map their coordinates properly and add them to a list
-        for enemy in enemies:
-            x = enemy[0] * main.SQUARE_LENGTH
-            y = enemy[1] * main.SQUARE_LENGTH
-            enemy_list.append(type(x, y))
-
-        return enemy_list
\ No newline at end of file
+        def snapshot(self) -> tuple:
+            """Returns everything about the enemy that changes as it moves, so it can be put back with restore()."""
+            return (self.rect.topleft, self.image, self.index, self.dx, self.dy, self.current_frame, self.moving,
+                    self.player_position, self.burst_complete, self.burst_count, self.burst_direction,
+                    self.last_move, self.movement_choices, self.since_movement, self.random.getstate())
+
+        def restore(self, snapshot: tuple):
+            """Puts the enemy back how it was when a snapshot was taken."""
+            (self.rect.topleft, self.image, self.index, self.dx, self.dy, self.current_frame, self.moving,
+             self.player_position, self.burst_complete, self.burst_count, self.burst_direction,
+             self.last_move, self.movement_choices, self.since_movement, random_state) = snapshot
+            self.random.setstate(random_state)
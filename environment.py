@@ -0,0 +1,262 @@
+# Python file for training agents on the levels, with the reset() and step() of a Gym environment
+
+import os
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("Environments need NumPy, which can be installed with 'pip install numpy'.") from error
+
+import sys
+import time
+import multiprocessing
+import pygame
+import main
+import config
+import levels
+import seeds
+from simulation import KEYS # Importing simulation also means nothing is shown or heard, here or in the workers
+
+# Actions an agent can take, by number: press nothing, or press W, A, S or D
+ACTIONS = (None, "W", "A", "S", "D")
+
+# Layers of an observation, each a grid with a 1 on every tile that has one in it
+WALLS = 0
+ENEMIES = 1
+WIN = 2
+PLAYER = 3
+LAYERS = 4
+
+TICKS = 10 # Ticks played for each action, which is how long the player takes to move one tile
+STEPS = 360 # Actions in an episode before it is cut off, which is a minute of play
+
+# Rewards for how an episode ends
+WIN_REWARD = 1.0
+LOSE_REWARD = -1.0
+
+class Environment():
+    def __init__(self, number: int, seed: int = None, ticks: int = TICKS, max_steps: int = STEPS):
+        """
+        One level played by an agent, without drawing anything or waiting between ticks.
+
+        Each step presses one of ACTIONS and plays the level on by a number of ticks. By default that is
+        exactly one move of the player, so the player can always move again at the start of a step.
+        Observations are grids of bytes with a layer each for the walls, enemies, win block and player.
+
+        With a seed, every episode plays out the same way for the same actions, each episode getting its
+        own seed from it so random enemies still move differently from one episode to the next.
+        """
+        main.create_app(display=False)
+        self.data = levels.load_level(number)
+        self.seed = seed if seed is not None else seeds.new_seed()
+        self.ticks = ticks
+        self.max_steps = max_steps
+        self.episodes = 0 # Episodes started, which picks the seed of the next one
+        self.steps = 0 # Steps taken in this episode
+        self.state = None
+        self.result = None # WON or LOST once the episode is over
+
+        # Walls and the win block never move, so their layers are only made once
+        tile_map = levels.load_tile_map(self.data.walls)
+        self.shape = (LAYERS, tile_map.rows, tile_map.columns)
+        self.background = np.zeros(self.shape, dtype=np.uint8)
+        for column, row in self.data.walls:
+            if 0 <= column < tile_map.columns and 0 <= row < tile_map.rows:
+                self.background[WALLS, row, column] = 1
+        self.background[WIN, self.data.win[1], self.data.win[0]] = 1
+
+    def reset(self, seed: int = None) -> tuple:
+        """Starts a new episode, returning the first observation and a dictionary of information about it."""
+        if seed is None:
+            seed = seeds.derive(self.seed, "environment", "episode", self.episodes)
+        self.episodes += 1
+        self.steps = 0
+        self.result = None
+        self.state = main.LevelState(self.data, seed)
+        return self.observe(), {"seed": seed}
+
+    def step(self, action: int) -> tuple:
+        """
+        Presses one of ACTIONS and plays on, returning (observation, reward, terminated, truncated, info).
+
+        Terminated is True once the level has been won or lost, and truncated is True once the episode
+        has run out of steps without either happening.
+        """
+        if self.result is not None:
+            raise RuntimeError("The episode is over, so reset() needs to be called before step().")
+
+        state = self.state
+        key = ACTIONS[action]
+        if key is not None:
+            state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=KEYS[key]))
+
+        for _ in range(self.ticks):
+            self.result = state.step()
+            if self.result is None and state.player.loss:
+                self.result = main.LOST # Nothing can save the player once caught, so the lose animation isn't waited for
+            if self.result is not None:
+                break
+        self.steps += 1
+
+        reward = WIN_REWARD if self.result == main.WON else LOSE_REWARD if self.result == main.LOST else 0.0
+        terminated = self.result is not None
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(), reward, terminated, truncated, {"result": self.result, "frame": state.frame}
+
+    def observe(self) -> np.ndarray:
+        """Returns the grid of walls, enemies, win block and player, with moving things on the tile they are nearest."""
+        observation = self.background.copy()
+        state = self.state
+        rows, columns = self.shape[1:]
+
+        for thing in state.enemies:
+            column, row = round(thing.rect.x / config.SQUARE_LENGTH), round(thing.rect.y / config.SQUARE_LENGTH)
+            if 0 <= column < columns and 0 <= row < rows:
+                observation[ENEMIES, row, column] = 1
+
+        if state.swarm is not None and len(state.swarm):
+            enemy_columns = np.rint(state.swarm.x / config.SQUARE_LENGTH).astype(int)
+            enemy_rows = np.rint(state.swarm.y / config.SQUARE_LENGTH).astype(int)
+            inside = (enemy_columns >= 0) & (enemy_columns < columns) & (enemy_rows >= 0) & (enemy_rows < rows)
+            observation[ENEMIES, enemy_rows[inside], enemy_columns[inside]] = 1
+
+        column, row = state.player.tile_map.tile(state.player.rect.x, state.player.rect.y)
+        observation[PLAYER, row, column] = 1
+        return observation
+
+class VectorEnvironment():
+    def __init__(self, numbers: list, seed: int = None, ticks: int = TICKS, max_steps: int = STEPS):
+        """
+        Any number of environments stepped together in this process, with everything returned as arrays.
+
+        Numbers are the levels played, one environment each, so the same level can be given many times.
+        An environment whose episode ends is reset straight away, and its info keeps the last observation
+        of the episode that ended under 'final_observation'.
+        """
+        seed = seed if seed is not None else seeds.new_seed()
+        self.environments = [Environment(number, seeds.derive(seed, "environment", index), ticks, max_steps)
+                             for index, number in enumerate(numbers)]
+
+    def __len__(self) -> int:
+        return len(self.environments)
+
+    def reset(self) -> tuple:
+        """Starts a new episode in every environment, returning the observations and a list of information."""
+        observations, infos = zip(*(environment.reset() for environment in self.environments))
+        return np.stack(observations), list(infos)
+
+    def step(self, actions) -> tuple:
+        """Steps every environment with its action, returning arrays of observations, rewards, terminated and truncated."""
+        count = len(self.environments)
+        observations = np.empty((count,) + self.environments[0].shape, dtype=np.uint8)
+        rewards = np.zeros(count, dtype=np.float32)
+        terminated = np.zeros(count, dtype=bool)
+        truncated = np.zeros(count, dtype=bool)
+        infos = []
+
+        for index, (environment, action) in enumerate(zip(self.environments, actions)):
+            observation, rewards[index], terminated[index], truncated[index], info = environment.step(int(action))
+            if terminated[index] or truncated[index]:
+                info["final_observation"] = observation
+                observation, reset_info = environment.reset()
+                info["seed"] = reset_info["seed"]
+            observations[index] = observation
+            infos.append(info)
+
+        return observations, rewards, terminated, truncated, infos
+
+    def close(self):
+        """Does nothing, as there are no processes to stop, so either kind of vector environment can be closed."""
+
+def work(connection, numbers: list, seed: int, ticks: int, max_steps: int):
+    """Runs a share of the environments in a worker process, doing whatever is sent down the connection."""
+    environments = VectorEnvironment(numbers, seed, ticks, max_steps)
+    while True:
+        command, argument = connection.recv()
+        if command == "step":
+            connection.send(environments.step(argument))
+        elif command == "reset":
+            connection.send(environments.reset())
+        elif command == "close":
+            connection.close()
+            return
+
+class ProcessVectorEnvironment():
+    def __init__(self, numbers: list, seed: int = None, ticks: int = TICKS, max_steps: int = STEPS, workers: int = None):
+        """
+        Any number of environments split across worker processes, which all step their share at the same time.
+
+        Behaves just like VectorEnvironment, but every call goes to all of the workers at once, so many
+        environments are stepped in the time it takes one process to step its share.
+        """
+        seed = seed if seed is not None else seeds.new_seed()
+        workers = min(workers or os.cpu_count() or 1, len(numbers)) or 1
+        self.count = len(numbers)
+
+        # Environments are shared out in order, so the results can be joined back together in order
+        self.shares = [(start * self.count // workers, (start + 1) * self.count // workers) for start in range(workers)]
+        self.connections = []
+        self.processes = []
+        for index, (start, end) in enumerate(self.shares):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=work, args=(worker_connection, numbers[start:end],
+                                                                 seeds.derive(seed, "worker", index), ticks, max_steps),
+                                              daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reset(self) -> tuple:
+        """Starts a new episode in every environment, returning the observations and a list of information."""
+        for connection in self.connections:
+            connection.send(("reset", None))
+        observations, infos = zip(*(connection.recv() for connection in self.connections))
+        return np.concatenate(observations), [info for share in infos for info in share]
+
+    def step(self, actions) -> tuple:
+        """Steps every environment with its action, returning arrays of observations, rewards, terminated and truncated."""
+        actions = np.asarray(actions)
+        for connection, (start, end) in zip(self.connections, self.shares):
+            connection.send(("step", actions[start:end]))
+        observations, rewards, terminated, truncated, infos = zip(*(connection.recv() for connection in self.connections))
+        return (np.concatenate(observations), np.concatenate(rewards), np.concatenate(terminated),
+                np.concatenate(truncated), [info for share in infos for info in share])
+
+    def close(self):
+        """Stops the worker processes."""
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+if __name__ == "__main__":
+    # 'python environment.py 64 4' steps 64 copies of every level across 4 processes with random actions
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 16 # Environments for each level
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None # Processes, or all of the environments in this one with 0
+    steps = 1000 # Steps of every environment
+
+    numbers = [number for number in range(1, levels.level_count() + 1) for _ in range(copies)]
+    if workers == 0:
+        environments = VectorEnvironment(numbers, seed=0)
+    else:
+        environments = ProcessVectorEnvironment(numbers, seed=0, workers=workers)
+
+    rng = np.random.default_rng(0)
+    environments.reset()
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = environments.step(rng.integers(0, len(ACTIONS), len(environments)))
+        episodes += int(np.count_nonzero(terminated | truncated))
+    seconds = time.perf_counter() - start
+    environments.close()
+
+    print(f"{len(environments)} environments: {len(environments) * steps / seconds:,.0f} steps per second "
+          f"({len(environments) * steps * TICKS / seconds:,.0f} ticks per second, {episodes:,} episodes finished)")
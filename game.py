@@ -2,38 +2,91 @@
 
 import pygame
 import sys
-import main
 import gc
-from os.path import exists
+import config
+import assets
+import settings
+import saves
+from profiler import profiler
 
-pygame.init()
+clock = pygame.time.Clock() # Creates a clock object to set frame rate
 
 # Functions and procedures for a chill life
 def terminate():
     """Terminates the program."""
+    # Save anything that is waiting to be saved, all together
+    with saves.manager.batch():
+        settings.store.flush()
     pygame.quit() # Quits the pygame library
     sys.exit() # Quits the program
 
-def update_state():
-    """Updates the appearance of the game."""
-    main.pygame.display.update() # Updates the display
-    main.clock.tick(main.FPS) # Mimicks frame rate
+def update_state(rects = None) -> int:
+    """Updates the appearance of the game, only in the given rectangles if there are any, and returns the milliseconds since the last frame."""
+    with profiler.phase("display"):
+        if rects is None:
+            pygame.display.update() # Updates the display
+        else:
+            pygame.display.update(rects) # Updates only the parts of the display that changed
+    return clock.tick(config.FPS) # Mimicks frame rate
 
 def generate_tile(image_path, x, y):
     """Generates a tile onto the screen."""
-    tile = pygame.image.load(image_path).convert_alpha() # Loads an image, removes transparency
-    tile_fit = pygame.transform.scale(tile, (80, 80)) # Scales it to the tile's dimensions
+    tile_fit = assets.load_image(image_path, size=(80, 80)) # Loads the image scaled to the tile's dimensions
     tile_rect = tile_fit.get_rect(topleft = (x, y)) # Creates an invisible rectangle using x and y coordinates
-    main.screen.blit(tile_fit, tile_rect) # Displays an image onto the screen
+    pygame.display.get_surface().blit(tile_fit, tile_rect) # Displays an image onto the screen
 
 def generate_background(image_path):
     """Generates a background onto the screen."""
-    tile = pygame.image.load(image_path).convert_alpha()
-    tile_fit = pygame.transform.scale(tile, (80, 80))
-    for x in main.grid[0]: # For each tile space in a given row...
-        for y in main.grid[1]: # For each tile space in a given column...
-            tile_rect = tile_fit.get_rect(topleft = (x, y))
-            main.screen.blit(tile_fit, tile_rect)
+    with profiler.phase("background"):
+        pygame.display.get_surface().blit(render_background(image_path), (0, 0)) # The tiles are only put together once
+
+def render_background(image_path, walls: tuple = ()):
+    """Returns a screen-sized surface of the tiled background with walls drawn on top."""
+
+    def factory():
+        surface = pygame.Surface((config.WIDTH, config.HEIGHT))
+        tile_fit = assets.load_image(image_path, size=(80, 80))
+        for x in config.grid[0]: # For each tile space in a given row...
+            for y in config.grid[1]: # For each tile space in a given column...
+                surface.blit(tile_fit, (x, y))
+
+        # Walls never move, so they are drawn on once as well
+        wall_image = assets.load_image(config.block, size=(config.SQUARE_LENGTH, config.SQUARE_LENGTH))
+        for position in walls:
+            surface.blit(wall_image, position)
+
+        # Match the pixel format of the screen so that drawing it is as fast as possible
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    # Cached by layout, so reloading or restarting a level reuses the surface
+    return assets.cache.get(("background", image_path, walls), factory)
+
+def wall_positions(walls) -> tuple:
+    """Converts (column, row) tiles into the positions of the walls on the screen, in the same order every time."""
+    return tuple(sorted((column * config.SQUARE_LENGTH, row * config.SQUARE_LENGTH) for column, row in walls))
+
+class Background():
+    def __init__(self, image_path: str, walls = ()):
+        """A pre-rendered layer holding the tiled background and every wall of a level, given as (column, row) tiles."""
+        self.image_path = image_path
+        self.walls = wall_positions(walls) # Positions of the walls
+        self.image = None
+
+    def invalidate(self, walls = None):
+        """Throws away the rendered layer so it is rebuilt, optionally with a new set of walls."""
+        if walls is not None:
+            self.walls = wall_positions(walls)
+        self.image = None
+
+    def draw(self):
+        """Displays the background and walls onto the screen with a single blit."""
+        with profiler.phase("background"):
+            # Render the layer the first time it is needed after a change
+            if self.image is None:
+                self.image = render_background(self.image_path, self.walls)
+            pygame.display.get_surface().blit(self.image, (0, 0))
 
 def garbage_disposal(garbage: list):
     """Disposes of all objects that are no longer needed."""
@@ -41,29 +94,60 @@ def garbage_disposal(garbage: list):
         del thing # Delete it
     gc.collect() # Free up space in memory
 
-def update_file(file: str, info, line: int = 0):
-    """Updates a file with information."""
-    # If the file does not exist, create it
-    file_copy = file # Avoids TypeError -> Opening file when it is already open
+class DirtyRenderer():
+    def __init__(self, *groups):
+        """
+        Works out which parts of the screen have changed since the last frame.
+
+        Sprites in the groups are tracked by where they were drawn and which image they used.
+        Anything else that changes on the screen can be marked by hand.
+        This only does anything when config.DIRTY_RENDERING is on.
+        """
+        self.groups = groups
+        self.drawn = {} # Sprite -> (area, image) from the last frame
+        self.marked = [] # Rectangles marked by hand since the last frame
+        self.first_frame = True
+
+    def mark(self, rect):
+        """Marks part of the screen as changed."""
+        self.marked.append(pygame.Rect(rect))
+
+    def rects(self):
+        """Returns the parts of the screen to update, or None if the whole screen should be updated."""
+        if not config.DIRTY_RENDERING:
+            self.marked = [] # Nothing is waiting for them, so they would only pile up
+            return None
+
+        changed = self.marked
+        self.marked = []
+        drawn = {}
+
+        for group in self.groups:
+            for sprite in group:
+                # The area a sprite covers includes any text drawn over it, and may be drawn away from its rect
+                area = getattr(sprite, "drawn_rect", sprite.rect).copy()
+                if hasattr(sprite, "text_rect"):
+                    area.union_ip(sprite.text_rect)
+                drawn[sprite] = (area, sprite.image)
 
-    # Check if the file exists and create a new file if not
-    if not exists(file):
-        with open(file, "w") as file:
-            file.write("text")
+                last = self.drawn.get(sprite)
+                # New sprites only need their area updated
+                if last is None:
+                    changed.append(area)
+                # Moved or animated sprites need both their old and new area updated
+                elif last[0] != area or last[1] is not sprite.image:
+                    changed.append(last[0].union(area))
 
-    # Write data to a list version of the file
-    with open(file_copy, "r") as filecopy:
-        file_as_list = filecopy.readlines()
+        # Sprites that are no longer drawn leave their old area behind
+        for sprite, (area, _) in self.drawn.items():
+            if sprite not in drawn:
+                changed.append(area)
 
-        # Either change the list data or add to it.
-        try:
-            file_as_list[line] = str(info) + "\n"
-        except IndexError:
-            file_as_list.insert(line, str(info) + "\n")
+        self.drawn = drawn
 
-    # Write data to the file
-    with open(file_copy, "w") as file:
-        file.seek(0)
-        for line in file_as_list:
-            file.write(line)
+        # The whole screen is new on the first frame
+        if self.first_frame:
+            self.first_frame = False
+            return None
 
+        return changed
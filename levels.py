@@ -0,0 +1,179 @@
+# Python file for loading the levels of the game
+
+import json
+import config
+from collections import deque
+from functools import lru_cache
+from os.path import join, exists
+from typing import NamedTuple
+
+LEVEL_FOLDER = join("Assets", "Levels") # Where the level files are kept
+
+# Characters used to draw the grid of a level
+FLOOR = "."
+WALL = "#"
+PLAYER = "P"
+WIN = "W"
+
+class EnemyData(NamedTuple):
+    """Where an enemy starts and how it behaves."""
+    type: str # 'static' or 'dynamic'
+    tile: tuple[int, int] # (column, row)
+    frequency: int = 3
+    delay: int = 0
+    style: str = "seek"
+
+class NarratorData(NamedTuple):
+    """Which voice lines can be played when a level starts."""
+    sounds: str # Name of the list of voice lines in sounds.py
+    lines: tuple = None # Indexes of the voice lines that can be picked, or None for all of them
+    chance: int = 1 # A voice line is played one in this many times
+    stop_on_win: bool = False # Whether the voice line is cut off when the level is won
+
+class TextData(NamedTuple):
+    """Text shown on top of a level."""
+    contents: str
+    x: int
+    y: int
+    size: int
+
+class LevelData(NamedTuple):
+    """Everything needed to build a level, which never changes once it has been loaded."""
+    number: int
+    background: str # Path to the background tile
+    columns: int
+    rows: int
+    player: tuple[int, int]
+    win: tuple[int, int]
+    walls: frozenset # (column, row) of every wall
+    enemies: tuple = ()
+    narrator: NarratorData = None
+    text: TextData = None
+    swarm: bool = False # Whether the dynamic enemies are moved together as a swarm, which needs NumPy
+
+def level_path(number: int) -> str:
+    """Returns the path to the file of a level."""
+    return join(LEVEL_FOLDER, f"level_{number}.json")
+
+@lru_cache(maxsize=None)
+def load_level(number: int) -> LevelData:
+    """
+    Loads a level from its file, only reading the file the first time.
+
+    The grid is a list of strings, one per row, where '#' is a wall, 'P' is the player, 'W' is the win and '.' is floor.
+    """
+    with open(level_path(number), "r") as level_file:
+        return compile_level(number, json.load(level_file))
+
+def compile_level(number: int, definition: dict) -> LevelData:
+    """Turns the definition of a level into the form used by the game."""
+    grid = definition["grid"]
+    columns = len(grid[0])
+
+    walls = set()
+    player = None
+    win = None
+
+    # Read the grid one tile at a time
+    for row, line in enumerate(grid):
+        if len(line) != columns:
+            raise ValueError(f"Row {row} of level {number} is {len(line)} tiles long instead of {columns}.")
+
+        for column, character in enumerate(line):
+            if character == WALL:
+                walls.add((column, row))
+            elif character == PLAYER:
+                if player is not None:
+                    raise ValueError(f"Level {number} has more than one player.")
+                player = (column, row)
+            elif character == WIN:
+                if win is not None:
+                    raise ValueError(f"Level {number} has more than one win.")
+                win = (column, row)
+            elif character != FLOOR:
+                raise ValueError(f"Level {number} has an unknown tile '{character}' at ({column}, {row}).")
+
+    if player is None or win is None:
+        raise ValueError(f"Level {number} needs a player and a win.")
+
+    enemies = tuple(EnemyData(enemy["type"], tuple(enemy["tile"]),
+                              enemy.get("frequency", 3), enemy.get("delay", 0), enemy.get("style", "seek"))
+                    for enemy in definition.get("enemies", []))
+
+    narrator = definition.get("narrator")
+    if narrator is not None:
+        lines = narrator.get("lines")
+        narrator = NarratorData(narrator["sounds"],
+                                tuple(lines) if lines is not None else None,
+                                narrator.get("chance", 1),
+                                narrator.get("stop_on_win", False))
+
+    text = definition.get("text")
+    if text is not None:
+        text = TextData(text["contents"], text["x"], text["y"], text["size"])
+
+    return LevelData(number, join("Assets", "Block", definition.get("background", "Background1.png")),
+                     columns, len(grid), player, win, frozenset(walls), enemies, narrator, text,
+                     definition.get("swarm", False))
+
+def level_count() -> int:
+    """Counts how many levels there are, assuming they are numbered from 1 with no gaps."""
+    count = 0
+    while exists(level_path(count + 1)):
+        count += 1
+    return count
+
+class TileMap():
+    def __init__(self, blocked = frozenset()):
+        """An index of the blocked tiles on the grid, so checking a tile takes one look-up however big the level is."""
+        self.columns = len(config.grid[0])
+        self.rows = len(config.grid[1])
+        self.blocked = frozenset(blocked) # (column, row) of every blocked tile
+        self.distance_fields = {} # Target tile -> distances to it, as walls never move
+
+    def tile(self, x: int, y: int) -> tuple[int, int]:
+        """Converts a position on the screen into the (column, row) of the tile it is on."""
+        return (round(x / config.SQUARE_LENGTH), round(y / config.SQUARE_LENGTH))
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Checks if the tile at a position on the screen cannot be moved onto."""
+        column, row = self.tile(x, y)
+
+        # Everything off the grid counts as blocked
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return True
+
+        return (column, row) in self.blocked
+
+    def distance_field(self, target: tuple[int, int]) -> dict:
+        """
+        Returns how many moves it takes to get from every tile to the target tile, going around walls.
+
+        Tiles that can't reach the target are left out. Each field is only worked out once,
+        so every enemy heading for the same tile shares it.
+        """
+        if target not in self.distance_fields:
+            distances = {}
+            column, row = target
+
+            # Flood outwards from the target one ring of tiles at a time
+            if 0 <= column < self.columns and 0 <= row < self.rows and target not in self.blocked:
+                distances[target] = 0
+                queue = deque([target])
+                while queue:
+                    column, row = queue.popleft()
+                    for next_tile in ((column - 1, row), (column + 1, row), (column, row - 1), (column, row + 1)):
+                        if next_tile in distances or next_tile in self.blocked:
+                            continue
+                        if 0 <= next_tile[0] < self.columns and 0 <= next_tile[1] < self.rows:
+                            distances[next_tile] = distances[(column, row)] + 1
+                            queue.append(next_tile)
+
+            self.distance_fields[target] = distances
+
+        return self.distance_fields[target]
+
+@lru_cache(maxsize=None)
+def load_tile_map(walls: frozenset) -> TileMap:
+    """Returns the tile map for a set of walls, which is only made once and then shared by every level that uses it."""
+    return TileMap(walls)
@@ -1,17 +1,27 @@
 # Main file
 
+import time
+STARTED_AT = time.perf_counter() # When the game started loading, for the startup report
+
+import sys
 import pygame
 import game
 import random
 import sounds
 import inspect
 import enemy
-
-from os.path import join, exists
-
-# Initialising pygame library
-pygame.init()
-pygame.mixer.init()
+import config
+import assets
+import levels
+import settings
+import saves
+import seeds
+
+from profiler import profiler
+from os.path import join
+from functools import lru_cache
+from contextlib import contextmanager
+from config import WIDTH, HEIGHT, CAPTION, SQUARE_LENGTH, grid, background2, background4, background5
 
 # Colour setup: (R, G, B)
 WHITE = (255, 255, 255)
@@ -20,41 +30,28 @@ GREEN = (0, 255, 0)
 CYAN = (0, 255, 255)
 BLACK = (0, 0, 0)
 
+# The font used for all text, which can be used commercially
+FONT_PATH = join("Assets", "Fonts", "pixel_pirate.ttf")
+
 # General purpose functions and procedures
 
 # Sprite selection
 def get_sprite_sheet(path, frame):
     """Returns part of a sprite sheet."""
-    image = pygame.image.load(path).convert_alpha() # Get the image
-    desired_frame = image.subsurface(pygame.Rect(frame)) # Create a surface from the image using the frame (x, y, width, height)
-    return desired_frame
+    return assets.load_image(path, frame) # Get the frame (x, y, width, height) of the image from the cache
 
 # Updating the sounds
-def update_sounds(file, mode = "write", volume1 = None, volume2 = None):
-    """Updates and saves the volume of sounds."""
+def apply_setting(name: str, value: float):
+    """Changes the volume of every sound when a volume setting changes."""
     global narrator_volume, sound_volume
-    
-    # Creates the file if it doesn't exist - it would be assumed that we would be writing to the file
-    if not exists(file):
-        with open(file, "w") as file_copy:
-            file_copy.write("text")
-            game.update_file(file_copy, narrator_volume)
-            game.update_file(file_copy, sound_volume, line=1)
-            print("Mode functionality denied. Re-call function.")
-            return
-
-    # If we want to read from the file, read from it and update the volume accordingly
-    if mode.lower() == "read":
-        with open(file, "r") as sound_data:
-            sound_data_copy = sound_data.readlines()
-
-            narrator_volume = float(sound_data_copy[0].replace("\n", ""))
-            sound_volume = float(sound_data_copy[1].replace("\n", ""))
-            
-    # If we want to write to the file, write to it and save the data accordingly
-    if mode.lower() == "write" and (volume1 is not None and volume2 is not None):
-        game.update_file(file, narrator_volume)
-        game.update_file(file, sound_volume, line=1)
+
+    if name == "narrator_volume":
+        narrator_volume = value
+        sounds.change_volume(narrator_sound_list, narrator_volume)
+
+    if name == "sound_volume":
+        sound_volume = value
+        sounds.change_volume(sound_list, sound_volume)
 
 # Class variables
 
@@ -62,12 +59,11 @@ def update_sounds(file, mode = "write", volume1 = None, volume2 = None):
 class Text():
     def __init__(self, contents: str, x: int, y: int, size: int, colour: tuple = WHITE):
         """A customisable Text class that piggybacks off the existing Pygame text class."""
-        main_font = pygame.font.Font(join("Assets", "Fonts", "pixel_pirate.ttf"), size) # Font object, font can be used commercially
-        self.font = main_font
+        self.font = assets.load_font(FONT_PATH, size) # Font object, shared by all text of the same size
         self.contents = contents
         self.x = x
         self.y = y
-        self.text = main_font.render(contents, True, colour)
+        self.text = assets.render_text(FONT_PATH, size, contents, colour) # Only rendered the first time this string is shown
         self.rect = self.text.get_rect(center = (x, y))
 
     def update(self):
@@ -79,10 +75,9 @@ class Button(pygame.sprite.Sprite):
     def __init__(self, image: str, text_contents: str, text_size: int, x: int, y: int, width: int, height: int, colour: tuple = WHITE):
         """Generates a cool button that a user can interact with."""
         super().__init__()
-        self.image_normal = pygame.image.load(image).convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (width, height))
-        self.text_font = pygame.font.Font(join("Assets", "Fonts", "pixel_pirate.ttf"), text_size)
-        self.text = self.text_font.render(text_contents, True, colour)
+        self.image = assets.load_image(image, size=(width, height))
+        self.text_font = assets.load_font(FONT_PATH, text_size)
+        self.text = assets.render_text(FONT_PATH, text_size, text_contents, colour)
         self.rect = self.image.get_rect(center = (x, y))
         self.text_rect = self.text.get_rect(center = (x, y))
 
@@ -93,28 +88,29 @@ class Button(pygame.sprite.Sprite):
 
 # Level setup
 class Level(pygame.sprite.Sprite):
-    def __init__(self, level_number: str, x: int, y: int, level_func, locked: bool = False):
+    def __init__(self, level_number: str, x: int, y: int, level: int, locked: bool = False):
         """Creates a level object that the user can select."""
         super().__init__()
-        self.text = pygame.font.Font(join("Assets", "Fonts", "pixel_pirate.ttf"), 40)
-        self.num = self.text.render(level_number, True, (255, 255, 255))
+        self.text = assets.load_font(FONT_PATH, 40)
+        self.num = assets.render_text(FONT_PATH, 40, level_number, WHITE)
         self.x = x
         self.y = y
-        self.level_func = level_func
+        self.level = level # Number of the level to play
         self.locked = locked
         self.index = 0
         self.frames = [join("Assets", "Buttons", "levelbutton.png"),
                        join("Assets", "Buttons", "levellocked.png")]
-        self.image_small = pygame.image.load(self.frames[self.index]).convert_alpha()
-        self.image = pygame.transform.scale(self.image_small, (SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
+        self.image = assets.load_image(self.frames[self.index], size=(SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
         self.rect = self.image.get_rect(center = (x, y))
         self.text_rect = self.num.get_rect(center= (x, y))
 
     def go_to_level(self, mouse_pos: list[int]):
-        """Goes to the level that the object represents."""
+        """Returns the level that the object represents if it has been pressed, otherwise None."""
         if self.rect.collidepoint(mouse_pos) and not self.locked: # If the level is pressed and is not locked...
-            level_select.play()
-            self.level_func() # Go to the level
+            sounds.bank.play(level_select)
+            return play_level(self.level) # The level to go to
+
+        return None
 
     def lock(self):
         """Locks the level."""
@@ -129,14 +125,12 @@ class Level(pygame.sprite.Sprite):
         # If the level isn't locked, show it. Else, show it.
         if not self.locked:
             self.index = 0
-            self.image_small = pygame.image.load(self.frames[self.index]).convert_alpha()
-            self.image = pygame.transform.scale(self.image_small, (SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
+            self.image = assets.load_image(self.frames[self.index], size=(SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
             screen.blit(self.image, self.rect)
             screen.blit(self.num, (self.text_rect))
         else:
             self.index = 1
-            self.image_small = pygame.image.load(self.frames[self.index]).convert_alpha()
-            self.image = pygame.transform.scale(self.image_small, (SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
+            self.image = assets.load_image(self.frames[self.index], size=(SQUARE_LENGTH * 1.5, SQUARE_LENGTH * 1.5))
             screen.blit(self.image, self.rect)
 
 # Functions related to above class
@@ -161,45 +155,35 @@ def reset_levels(levels, completion_count: int = 1):
         else:
             level.locked = True
 
-def load_data_from_game_file(filename="gamedata.txt"):
-    """Loads the data from the game file."""
-
-    cleaned_file = [] # List represenation of cleaned version of file
+def load_data_from_game_file():
+    """Loads the progress of the player from the save."""
+    progress = saves.manager.read("progress", {"unlocked_levels": 1}) # Only the first level is unlocked if nothing is saved
 
-    # If the file exists, read its data
-    if exists(filename):
-        with open(filename, "r") as game_file:
-            game_data = game_file.readlines()
-            # Remove any trailing newline characters so the item is purely there
-            for data in game_data:
-                data_clean = data.strip("\n")
-                cleaned_file.append(data_clean)
+    # Unlock all the levels accordingly
+    reset_levels(level_buttons(), progress["unlocked_levels"])
 
-        # Unlock all the levels accordingly
-        reset_levels(list_of_levels, int(cleaned_file[0]))
+def save_progress():
+    """Saves how many levels are unlocked."""
+    saves.manager.write("progress", {"unlocked_levels": get_unlocked_level_number(level_buttons())})
 
-    else:
-        # Unlock the first level only
-        reset_levels(list_of_levels, 1)
-  
 # Player setup
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x: int, y: int):
+    # Slots keep the attributes of the player out of a dictionary, which makes them smaller and quicker to look up
+    __slots__ = ("image_path", "image_path_2", "images_1", "images_2", "index", "image", "x", "y", "rect", "drawn_rect",
+                 "dy", "dx", "current_frame", "target_frame", "moving", "tile_map",
+                 "loss", "loss_sound", "loss_animation", "random")
+
+    def __init__(self, x: int, y: int, rng: random.Random = None):
         """Creates a player object that a user can control."""
         super().__init__()
+        self.random = rng if rng is not None else random.Random() # Decides when a voice line is played after losing
         self.image_path = join("Assets", "Player", "PlayerSprite.png")
         self.image_path_2 = join("Assets", "Player", "PlayerLose.png")
         # 1st set of images for player, 2nd set of images for player lose state
-        self.images_1 = [get_sprite_sheet(self.image_path, (0, 0, 16, 16)),
-                        get_sprite_sheet(self.image_path, (16, 0, 16, 16))]
-        
-        self.images_2 = [get_sprite_sheet(self.image_path_2, (0, 0, 16, 16)),
-                         get_sprite_sheet(self.image_path_2, (16, 0, 16, 16)),
-                         get_sprite_sheet(self.image_path_2, (32, 0, 16, 16)),
-                         get_sprite_sheet(self.image_path_2, (48, 0, 16, 16))]
+        self.images_1 = assets.load_animation(self.image_path, 2, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.images_2 = assets.load_animation(self.image_path_2, 4, (SQUARE_LENGTH, SQUARE_LENGTH))
         self.index = 0
-        self.image_normal = self.images_1[self.index].convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.image = self.images_1[self.index]
         self.x = x
         self.y = y
         self.rect = self.image.get_rect(topleft = (self.x, self.y))
@@ -210,6 +194,7 @@ class Player(pygame.sprite.Sprite):
         self.current_frame = 0
         self.target_frame = 10
         self.moving = False
+        self.tile_map = None # Tiles the player cannot move onto
 
         # Attributes for losing
         self.loss = False
@@ -229,7 +214,7 @@ class Player(pygame.sprite.Sprite):
                 self.current_frame = 0
                 self.moving = True
                 self.set_image(0)
-                player_move_sound.play()
+                sounds.bank.play(player_move_sound)
 
             if event.key == pygame.K_s:
                 self.dy = (SQUARE_LENGTH / self.target_frame)
@@ -237,7 +222,7 @@ class Player(pygame.sprite.Sprite):
                 self.current_frame = 0
                 self.moving = True
                 self.set_image(1)
-                player_move_sound.play()
+                sounds.bank.play(player_move_sound)
 
             if event.key == pygame.K_a:
                 self.dy = 0
@@ -245,7 +230,7 @@ class Player(pygame.sprite.Sprite):
                 self.current_frame = 0
                 self.moving = True
                 self.set_image(1)
-                player_move_sound.play()
+                sounds.bank.play(player_move_sound)
 
             if event.key == pygame.K_d:
                 self.dy = 0
@@ -253,7 +238,13 @@ class Player(pygame.sprite.Sprite):
                 self.current_frame = 0
                 self.moving = True
                 self.set_image(0)
-                player_move_sound.play()
+                sounds.bank.play(player_move_sound)
+
+            # Bump in place instead of moving if the tile being moved to is blocked
+            if self.moving and self.tile_map is not None:
+                if self.tile_map.is_blocked(self.rect.x + self.dx * self.target_frame, self.rect.y + self.dy * self.target_frame):
+                    self.dx = 0
+                    self.dy = 0
 
     def set_loss(self, loss):
         """Finds out if the player has entered a lose state."""
@@ -269,13 +260,11 @@ class Player(pygame.sprite.Sprite):
 
     def set_image(self, index: int):
         """Sets the image of the player"""
-        self.image_normal = self.images_1[index].convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.image = self.images_1[index]
 
     def set_image_loss(self, index: int):
         """Sets the image of the player when losing."""
-        self.image_normal = self.images_2[index].convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.image = self.images_2[index]
 
     def update(self):
         """Updates the player sprite."""
@@ -284,12 +273,12 @@ class Player(pygame.sprite.Sprite):
         if self.loss_sound:
 
             # 20% to play a narrator voice line if the player has lost
-            if random.randint(0, 4) == 1:
-                lose_narrator_sound = pygame.mixer.Sound(random.choice(sounds.lose_state_sounds))
+            if self.random.randint(0, 4) == 1:
+                lose_narrator_sound = sounds.bank.get(self.random.choice(sounds.lose_state_sounds))
                 lose_narrator_sound.set_volume(narrator_volume)
-                lose_narrator_sound.play()
+                sounds.bank.play(lose_narrator_sound)
 
-            lose_sound.play()
+            sounds.bank.play(lose_sound)
             self.loss_sound = False
 
         # If the player is losing, show it
@@ -307,63 +296,28 @@ class Player(pygame.sprite.Sprite):
                 # Set the image of the player
                 self.set_image_loss(int(self.index))
 
-# Wall setup
-class Wall(pygame.sprite.Sprite):
-    def __init__(self, x: int, y: int):
-        """Creating a wall object that acts as a barrier for the player."""
-        super().__init__()
-        self.image_normal = pygame.image.load(join("Assets", "Block", "Block.png")).convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
-        self.rect = self.image.get_rect(topleft = (x, y))
-
-    def check_collision(self, moving_thing):
-        """Checks if a moving thing is colliding with the wall."""
-        if moving_thing.dx > 0: # If the moving thing is moving right...
-            if moving_thing.rect.collidepoint(self.rect.midleft): # If the moving thing is colliding with the left of the wall..
-                # Make sure the moving thing does not go through the wall and make sure the moving thing is moving no more
-                moving_thing.rect.x = self.rect.x - 80
-                moving_thing.dx = 0
-                moving_thing.dy = 0
-        if moving_thing.dx < 0:
-            if moving_thing.rect.collidepoint(self.rect.midright):
-                moving_thing.rect.x = self.rect.x + 80
-                moving_thing.dx = 0
-                moving_thing.dy = 0
-        if moving_thing.dy > 0:
-            if moving_thing.rect.collidepoint(self.rect.midtop):
-                moving_thing.rect.y = self.rect.y - 80
-                moving_thing.dx = 0
-                moving_thing.dy = 0
-        if moving_thing.dy < 0:
-            if moving_thing.rect.collidepoint(self.rect.midbottom):
-                moving_thing.rect.y = self.rect.y + 80
-                moving_thing.dx = 0
-                moving_thing.dy = 0
-    
-def wall_factory(wall_list: list) -> list[Wall]:
-    """Creates walls based on a list of walls. """
-    wall_object_list = []
-    for wall in wall_list: # For each wall in the list
-        # Grid reference
-        x = wall[0] * SQUARE_LENGTH
-        y = wall[1] * SQUARE_LENGTH
-        # Add it to the list; once all walls are put into the list, return it
-        wall_object_list.append(Wall(x, y))
-    return wall_object_list
+    def snapshot(self) -> tuple:
+        """Returns everything about the player that changes as a level is played, so it can be put back with restore()."""
+        return (self.rect.topleft, self.image, self.index, self.dx, self.dy, self.current_frame, self.moving,
+                self.loss, self.loss_sound, self.loss_animation, self.random.getstate())
+
+    def restore(self, snapshot: tuple):
+        """Puts the player back how it was when a snapshot was taken."""
+        (self.rect.topleft, self.image, self.index, self.dx, self.dy, self.current_frame, self.moving,
+         self.loss, self.loss_sound, self.loss_animation, random_state) = snapshot
+        self.random.setstate(random_state)
 
 # Win setup
 class Win(pygame.sprite.Sprite):
+    __slots__ = ("image_path", "images", "index", "image", "rect", "drawn_rect")
+
     def __init__(self, x: int, y: int):
         """A win block that when the player is on it, the player 'wins'."""
         super().__init__()
         self.image_path = join("Assets", "Block", "WinBlock.png")
-        self.images = [get_sprite_sheet(self.image_path, (0, 0, 16, 16)),
-                       get_sprite_sheet(self.image_path,(16, 0, 16, 16)),
-                       get_sprite_sheet(self.image_path,(32, 0, 16, 16)),
-                       get_sprite_sheet(self.image_path,(48, 0, 16, 16))]
+        self.images = assets.load_animation(self.image_path, 4, (SQUARE_LENGTH, SQUARE_LENGTH))
         self.index = 0
-        self.image_normal = self.images[int(self.index)].convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.image = self.images[int(self.index)]
         self.rect = self.image.get_rect(topleft = (x,y))
 
     def update(self):
@@ -373,8 +327,15 @@ class Win(pygame.sprite.Sprite):
             self.index = 0
         # Increase the index to change the animation and then redefine the image
         self.index += (1/10)
-        self.image_normal = self.images[int(self.index)].convert_alpha()
-        self.image = pygame.transform.scale(self.image_normal, (SQUARE_LENGTH, SQUARE_LENGTH))
+        self.image = self.images[int(self.index)]
+
+    def snapshot(self) -> tuple:
+        """Returns where the animation is, so it can be put back with restore()."""
+        return (self.image, self.index)
+
+    def restore(self, snapshot: tuple):
+        """Puts the animation back how it was when a snapshot was taken."""
+        self.image, self.index = snapshot
 
 # ----------------------------------------------------------------------- #
 
@@ -389,2121 +350,1015 @@ def not_implemented():
     current_function = inspect.currentframe().f_code.co_name
     raise NotImplementedError(f"'{current_function.upper()}' is not implemented.")
 
-def abstract_level_layout():
-    """DO NOT CALL"""
-    player = Player(grid[0][3], grid[1][5])
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event)
-
-        game.update_state()
-
-def level_1(paused = False, reload_paused = False):
-    """Level one"""
-
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Introductory sound to provoke the user to move the player around
-    narrator = pygame.mixer.Sound(sounds.level_with_only_player_sounds[4])
-    narrator.set_volume(narrator_volume)
-    text = Text("Use the W, A, S and D keys to move.", WIDTH//2, HEIGHT//4, 30) # Text matching voice line
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][5], grid[1][4])
-        win = Win(grid[0][10], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 3] for x in range(4, 12)]),
-                        wall_factory([[4, 4], [11, 4]]),
-                        wall_factory([[x, 5] for x in range(4, 12)]))
-        
-        narrator.play() # Play the sound 
-    
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][10], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 3] for x in range(4, 12)]),
-                        wall_factory([[4, 4], [11, 4]]),
-                       wall_factory([[x, 5] for x in range(4, 12)]))
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-        #game.generate_background(background1)
-        #level_group.draw(screen) <-- Bug
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_1)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_1) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-            for wall in level_group: # For each wall in the group...
-                if isinstance(wall, Wall): # Checks if the "wall" is a wall
-                    wall.check_collision(player)
-            player.current_frame += 1 # Increment the current frame
-
-        # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            narrator.stop()
-            win_menu(level_1)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
-
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        text.update()
-
-        game.update_state()
-
-def level_2(paused = False, reload_paused = False):
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][2], grid[1][4])
-        win = Win(grid[0][6], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 2] for x in range(1, 8)]),
-                        wall_factory([[x, 6] for x in range(1, 8)]),
-                        wall_factory([[1, y] for y in range(3, 6)]),
-                        wall_factory([[7, y] for y in range(3, 6)]),
-                        wall_factory([[4, 4]]))
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3:
-            level_with_only_player_sounds_copy = sounds.level_with_only_player_sounds[:4] # Copy of list without the last voice line
-            narrator = pygame.mixer.Sound(random.choice(level_with_only_player_sounds_copy)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-        
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][6], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 2] for x in range(1, 8)]),
-                        wall_factory([[x, 6] for x in range(1, 8)]),
-                        wall_factory([[1, y] for y in range(3, 6)]),
-                        wall_factory([[7, y] for y in range(3, 6)]),
-                        wall_factory([[4, 4]]))
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-        #game.generate_background(background1)
-        #level_group.draw(screen) <-- Bug
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_2)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_2) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-            for wall in level_group: # For each wall in the group...
-                if isinstance(wall, Wall): # Checks if the "wall" is a wall
-                    wall.check_collision(player)
-            player.current_frame += 1 # Increment the current frame
-
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_2)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
-
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-
-def level_3(paused = False, reload_paused = False):
-    """Level 3"""
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][4], grid[1][2])
-        win = Win(grid[0][11], grid[1][6])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 1] for x in range(3, 13)]),
-                        wall_factory([[x, 7] for x in range(3, 13)]),
-                        wall_factory([[3, y] for y in range(2, 8)]),
-                        wall_factory([[12, y] for y in range(2, 8)]),
-                        wall_factory([[x, 6] for x in range(4, 11)]),
-                        wall_factory([[x, 2] for x in range(5, 12)]),
-                        wall_factory([[x, 3] for x in range(5, 9)]),
-                        wall_factory([[10, y] for y in range(4, 6)]),
-                        wall_factory([[9, 5], [7, 4], [5, 5]])
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3:
-            level_with_only_player_sounds_copy = sounds.level_with_only_player_sounds[:4] # Copy of list without the last voice line
-            narrator = pygame.mixer.Sound(random.choice(level_with_only_player_sounds_copy)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-                        
-        
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][11], grid[1][6])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 1] for x in range(3, 13)]),
-                        wall_factory([[x, 7] for x in range(3, 13)]),
-                        wall_factory([[3, y] for y in range(2, 8)]),
-                        wall_factory([[12, y] for y in range(2, 8)]),
-                        wall_factory([[x, 6] for x in range(4, 11)]),
-                        wall_factory([[x, 2] for x in range(5, 12)]),
-                        wall_factory([[x, 3] for x in range(5, 9)]),
-                        wall_factory([[10, y] for y in range(4, 6)]),
-                        wall_factory([[9, 5], [7, 4], [5, 5]])
-                        )
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-        #game.generate_background(background1)
-        #level_group.draw(screen) <-- Bug
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_3)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_3) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-            for wall in level_group: # For each wall in the group...
-                if isinstance(wall, Wall): # Checks if the "wall" is a wall
-                    wall.check_collision(player)
-            player.current_frame += 1 # Increment the current frame
+# Scene setup
+class Scene():
+    capped = True # Whether the frame rate is limited while the scene is shown
+    alpha = 1.0 # How far the frame being drawn is between the last tick and the next, from 0 to 1
 
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_3)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
+    def __init__(self):
+        """A screen of the game. The scene manager shows one scene at a time, a frame at a time."""
+        self.next_scene = None
 
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-    
-def level_4(paused = False, reload_paused = False):
-    """Level 4"""
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][1], grid[1][5])
-        win = Win(grid[0][9], grid[1][3])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 2] for x in range(0, 17)]), # Top wall barrier
-                        wall_factory([[x, 6] for x in range(0, 17)]), # Bottom wall barrier
-                        wall_factory([[0, y] for y in range(3, 6)]), # Left wall barrier
-                        wall_factory([[15, y] for y in range(3, 6)]), # Rightwall barrier
-                        wall_factory([[2, 4], [2, 5]]), # First rectangle barrier
-                        wall_factory([[4, 3], [4, 4]]), # Second rectangle barrier
-                        wall_factory([[6, 4], [6, 5]]), # Third rectangle barrier
-                        wall_factory([[8, 3]]), # Singular barrier preventing from going to the goal
-                        wall_factory([[x, 4] for x in range(8, 14)]) # Long barrier making journey to goal tedious
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3:
-            level_with_only_player_sounds_copy = sounds.level_with_only_player_sounds[:4] # Copy of list without the last voice line
-            narrator = pygame.mixer.Sound(random.choice(level_with_only_player_sounds_copy)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-        
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][9], grid[1][3])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 2] for x in range(0, 17)]), # Top wall barrier
-                        wall_factory([[x, 6] for x in range(0, 17)]), # Bottom wall barrier
-                        wall_factory([[0, y] for y in range(3, 6)]), # Left wall barrier
-                        wall_factory([[15, y] for y in range(3, 6)]), # Rightwall barrier
-                        wall_factory([[2, 4], [2, 5]]), # First rectangle barrier
-                        wall_factory([[4, 3], [4, 4]]), # Second rectangle barrier
-                        wall_factory([[6, 4], [6, 5]]), # Third rectangle barrier
-                        wall_factory([[8, 3]]), # Singular barrier preventing from going to the goal
-                        wall_factory([[x, 4] for x in range(8, 14)]) # Long barrier making journey to goal tedious
-                        )
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
+    def switch(self, scene):
+        """Tells the scene manager to show another scene after this frame."""
+        self.next_scene = scene
 
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
+    def enter(self):
+        """Runs every time the scene starts being shown."""
 
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_4)
+    def handle_event(self, event):
+        """Reacts to a single event."""
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_4) # The game is paused
+    def update(self):
+        """Moves the scene on by one tick, or one frame if the frame rate isn't limited."""
 
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-            for wall in level_group: # For each wall in the group...
-                if isinstance(wall, Wall): # Checks if the "wall" is a wall
-                    wall.check_collision(player)
-            player.current_frame += 1 # Increment the current frame
+    def draw(self):
+        """Draws the scene, returning the parts of the screen that changed or None for all of it."""
+        return None
 
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_4)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
+def run(scene: Scene):
+    """
+    Shows scenes one after another from a single loop.
 
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-
-def level_5(paused = False, reload_paused = False):
-    """Level 5"""
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][4], grid[1][7])
-        win = Win(grid[0][8], grid[1][5])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 8] for x in range(3, 13)]), # Bottom barrier
-                        wall_factory([[x, 0] for x in range(3, 13)]), # Top barrier
-                        wall_factory([[3, y] for y in range(1, 8)]), # Left barrier
-                        wall_factory([[12, y] for y in range(1, 8)]), # Right barrier
-                        wall_factory([[5, y] for y in range(2, 8)]), # First wall
-                        wall_factory([[x, 2] for x in range(6, 11)]), # Second wall
-                        wall_factory([[10, y] for y in range(2, 7)]), # Third wall
-                        wall_factory([[x, 6] for x in range(8, 10)]), # Fourth wall
-                        wall_factory([[7, y] for y in range(4, 7)]), # Fifth wall
-                        wall_factory([[8, 4]]) # Final wall
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            level_with_only_player_sounds_copy = sounds.level_with_only_player_sounds[:4] # Copy of list without the last voice line
-            narrator = pygame.mixer.Sound(random.choice(level_with_only_player_sounds_copy)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-        
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][8], grid[1][5])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(win, player, pause,
-                        wall_factory([[x, 8] for x in range(3, 13)]), # Bottom barrier
-                        wall_factory([[x, 0] for x in range(3, 13)]), # Top barrier
-                        wall_factory([[3, y] for y in range(1, 8)]), # Left barrier
-                        wall_factory([[12, y] for y in range(1, 8)]), # Right barrier
-                        wall_factory([[5, y] for y in range(2, 8)]), # First wall
-                        wall_factory([[x, 2] for x in range(6, 11)]), # Second wall
-                        wall_factory([[10, y] for y in range(2, 7)]), # Third wall
-                        wall_factory([[x, 6] for x in range(8, 10)]), # Fourth wall
-                        wall_factory([[7, y] for y in range(4, 7)]), # Fifth wall
-                        wall_factory([[8, 4]]) # Final wall
-                        )
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
+    Scenes hand over to each other with Scene.switch instead of calling each other,
+    so the stack stays the same size however long the game is played for.
 
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
+    Scenes with a limited frame rate are updated config.TICK_RATE times a second however fast
+    frames are drawn, by saving up the time between frames and spending it a tick at a time.
+    """
+    tick_time = 1 / config.TICK_RATE # Seconds of play in each tick
+    accumulator = tick_time # Time waiting to be played, starting with enough for one tick
+    pending = [] # Events left over when the last scene switched, which the next scene is given first
 
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_5)
+    scene.enter()
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_5) # The game is paused
+        with profiler.phase("events"):
+            events = pending + pygame.event.get()
+            pending = []
+            for index, event in enumerate(events):
+                profiler.handle_event(event)
+                scene.handle_event(event)
+                if event.type == pygame.QUIT:
+                    game.terminate()
+
+                # Any other events belong to the scene being switched to, so they are kept for it
+                if scene.next_scene is not None:
+                    pending = events[index + 1:]
+                    break
+
+        with profiler.phase("update"):
+            if scene.capped:
+                # Play every tick the time since the last frame covers
+                ticks = 0
+                while accumulator >= tick_time and scene.next_scene is None:
+                    scene.update()
+                    accumulator -= tick_time
+                    ticks += 1
+
+                    # Give up on catching up if the computer can't keep up, rather than slowing down even more
+                    if ticks >= config.MAX_TICKS_PER_FRAME:
+                        accumulator = min(accumulator, tick_time)
+                        break
+
+                scene.alpha = accumulator / tick_time
+
+            elif scene.next_scene is None:
+                scene.update()
+
+        if scene.next_scene is None:
+            with profiler.phase("draw"):
+                rects = scene.draw()
+
+            if scene.capped:
+                # The overlay goes on top of everything, but not on the fading menus as it would never be cleared
+                if profiler.overlay and screen is not None:
+                    overlay_rect = profiler.draw(screen)
+                    if rects is not None:
+                        rects = list(rects) + [overlay_rect]
+
+                # Update all of the screen after the overlay is hidden so that it doesn't stay behind
+                if profiler.full_update:
+                    profiler.full_update = False
+                    rects = None
+
+                accumulator += game.update_state(rects) / 1000 # Milliseconds since the last frame
+            else:
+                with profiler.phase("display"):
+                    pygame.display.update() # Not limiting the frame rate gives the fading menus their look
+
+            profiler.end_frame()
+
+            # Everything up to the first frame counts as starting up
+            if "first frame" not in startup_times:
+                startup_times["first frame"] = time.perf_counter() - STARTED_AT - sum(startup_times.values())
+                if report_startup:
+                    print(startup_report())
+
+        # Move onto the next scene
+        if scene.next_scene is not None:
+            next_scene = scene.next_scene
+            scene.next_scene = None
+            game.garbage_disposal([scene]) # Free up the memory
+            scene = next_scene
+            scene.enter()
+
+            # Time spent on the last scene or loading this one isn't played
+            game.clock.tick()
+            accumulator = tick_time
+
+# Results of a frame of a level
+WON = "won"
+LOST = "lost"
+
+# Keys that move the player, and the letters they are recorded as
+MOVEMENT_KEYS = {pygame.K_w: "W",
+                 pygame.K_a: "A",
+                 pygame.K_s: "S",
+                 pygame.K_d: "D"}
+
+recording_folder = None # Folder that every finished attempt at a level is saved to as a replay, if there is one
+
+class LevelState():
+    def __init__(self, data: levels.LevelData, seed: int = None):
+        """
+        Everything in a level that moves, without anything to do with drawing or sound.
+
+        This is what decides how the level plays, so it can be run without a display,
+        as fast as the computer allows.
+
+        With a seed, everything random in the level happens the same way every time it is played.
+        Without one a seed is picked, so any attempt can be played again from the keys that were pressed.
+        """
+        if seed is None:
+            seed = seeds.new_seed()
+
+        self.data = data
+        self.seed = seed
+        self.frame = 0 # Ticks the level has been played for
+        self.inputs = [] # (frame, letter) of every movement key pressed, so the attempt can be replayed
+
+        self.player = Player(grid[0][data.player[0]], grid[1][data.player[1]], seeds.stream(seed, "level", data.number, "player"))
+        self.win = Win(grid[0][data.win[0]], grid[1][data.win[1]])
+
+        # Walls are only used as blocked tiles
+        tile_map = levels.load_tile_map(data.walls)
+        self.player.tile_map = tile_map
+
+        # Dynamic enemies in a swarm level are all moved at once instead of being sprites
+        self.swarm = None
+        enemies = list(enumerate(data.enemies)) # Each enemy has its own random numbers, found by its place in the level
+        if data.swarm:
+            import swarm # Needs NumPy, so it is only imported for levels that use it
+            dynamic = [(index, enemy_data) for index, enemy_data in enemies if enemy_data.type == "dynamic"]
+            # The swarm draws from the same streams the sprites would, so it moves exactly the same way
+            self.swarm = swarm.Swarm(tile_map, [(grid[0][enemy_data.tile[0]], grid[1][enemy_data.tile[1]],
+                                                 enemy_data.frequency, enemy_data.delay, enemy_data.style)
+                                                for _, enemy_data in dynamic],
+                                     seed=seeds.derive(seed, "level", data.number, "swarm"),
+                                     streams=[seeds.stream(seed, "level", data.number, "enemy", index) for index, _ in dynamic])
+            enemies = [(index, enemy_data) for index, enemy_data in enemies if enemy_data.type != "dynamic"]
+
+        self.enemies = [create_enemy(enemy_data, seeds.stream(seed, "level", data.number, "enemy", index))
+                        for index, enemy_data in enemies]
+        for thing in self.enemies:
+            if isinstance(thing, enemy.Enemy.Dynamic):
+                thing.tile_map = tile_map
+
+        # Everything updated every tick, with the player on top
+        self.level_group = pygame.sprite.Group()
+        self.level_group.add(self.enemies, self.win, self.player)
+
+        self.previous_positions = {} # Sprite -> where it was before the last tick
+
+    def handle_event(self, event):
+        """Moves the player."""
+        if event.type == pygame.KEYDOWN and event.key in MOVEMENT_KEYS:
+            self.inputs.append((self.frame, MOVEMENT_KEYS[event.key]))
+        self.player.movement(event) # Check for the player movement
+
+    def step(self):
+        """Moves everything in the level on by a tick, returning WON or LOST when the level is over, otherwise None."""
+        player = self.player
+        self.frame += 1
+
+        # Remember where everything was so frames between ticks can be drawn in between
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.level_group}
 
         if player.current_frame < player.target_frame: # If the player is not done moving...
             player.rect.y += player.dy # Update the y position
             player.rect.x += player.dx # Update the x position
-            for wall in level_group: # For each wall in the group...
-                if isinstance(wall, Wall): # Checks if the "wall" is a wall
-                    wall.check_collision(player)
             player.current_frame += 1 # Increment the current frame
 
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_5)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
-
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-
-def level_6(paused = False, reload_paused = False):
-    """Level VI"""
-
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][5], grid[1][4])
-        win = Win(grid[0][10], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        static1 = enemy.Enemy.Static(grid[0][9], grid[1][4])
-
-        level_group = pygame.sprite.Group()
-        level_group.add(static1, 
-                        win, player, pause,
-                        wall_factory([[x, 2] for x in range(4, 12)]), # Top barrier
-                        wall_factory([[x, 5] for x in range(4, 12)]), # Bottom barrier
-                        wall_factory([[4, y] for y in range(3, 5)]), # Left barrier
-                        wall_factory([[11, y] for y in range(3, 5)]),) # Right barrier
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            narrator = pygame.mixer.Sound(random.choice(sounds.level_containing_static_sounds)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-            
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][10], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        static1 = enemy.Enemy.Static(grid[0][9], grid[1][4])
-
-        level_group = pygame.sprite.Group()
-        level_group.add(static1, 
-                        win, player, pause,
-                        wall_factory([[x, 2] for x in range(4, 12)]),
-                        wall_factory([[x, 5] for x in range(4, 12)]),
-                        wall_factory([[4, y] for y in range(3, 5)]), 
-                        wall_factory([[11, y] for y in range(3, 5)]),)
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-        #game.generate_background(background1)
-        #level_group.draw(screen) <-- Bug
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_6)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_6) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-
-            player.current_frame += 1 # Increment the current frame
+        # CHECKING OBJECTS
+        with profiler.phase("collisions"):
+            for thing in self.enemies:
+                # Check if the lose state condition is met
+                lose = thing.check_collision(player)
+                if lose and not player.loss:
+                    player.set_loss(lose)
 
-            # CHECKING OBJECTS
-            for object in level_group: # For each object in the group...
-                if isinstance(object, Wall): # Checks if the "wall" is a wall
-                    object.check_collision(player)
+                # Gets the player's coordinates
+                if isinstance(thing, enemy.Enemy.Dynamic):
+                    if thing.since_movement == thing.target_movement_time - 1: # Frame before movement
+                        thing.get_player_position(player.rect)
 
-                # Check if the lose state condition is met 
-                elif isinstance(object, enemy.Enemy.Static):
-                    lose = object.check_collision(player)
-                    if lose and not player.loss:
-                        player.set_loss(lose)
+            if self.swarm is not None and self.swarm.collides(player.rect) and not player.loss:
+                player.set_loss(True)
 
-        # Restart the level if the lose state has been fulfilled
+        # The level is lost once the lose animation has finished
         if not player.loss_animation and player.loss:
             player.loss = False
-            level_6()
-
-        # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_6)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
-
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-
-def level_7(paused = False, reload_paused = False):
-    """LEVEL 7"""
-
-    global index_list, object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][5], grid[1][3])
-        win = Win(grid[0][11], grid[1][3])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-        level_group = pygame.sprite.Group()
-        level_group.add(enemy.enemy_factory([[5, 6], [10, 4], [11, 4]], enemy.Enemy.Static), # Singular enemies
-                        enemy.enemy_factory([[7, y] for y in range(3, 6)], enemy.Enemy.Static), # First wall
-                        enemy.enemy_factory([[8, y] for y in range(3, 5)], enemy.Enemy.Static), # Second wall
-                        win, player, pause,
-                        wall_factory([[x, 2] for x in range(4, 13)]), # Top barrier
-                        wall_factory([[x, 7] for x in range(4, 13)]), # Bottom barrier
-                        wall_factory([[4, y] for y in range(3, 8)]), # Left barrier 
-                        wall_factory([[12, y] for y in range(3, 8)]) # Right barrier
-                        )
-
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            narrator = pygame.mixer.Sound(random.choice(sounds.level_containing_static_sounds)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-    
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-
-        # Define player x and y positions, using index list to find right recursive array position
-        player_x = object_coordinates[index_list[0]][0]
-        player_y = object_coordinates[index_list[0]][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][11], grid[1][3])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        static1 = enemy.Enemy.Static(grid[0][9], grid[1][4])
-
-        level_group = pygame.sprite.Group()
-        level_group.add(enemy.enemy_factory([[5, 6], [10, 4], [11, 4]], enemy.Enemy.Static), # Singular enemies
-                        enemy.enemy_factory([[7, y] for y in range(3, 6)], enemy.Enemy.Static), # First wall
-                        enemy.enemy_factory([[8, y] for y in range(3, 5)], enemy.Enemy.Static), # Second wall
-                        win, player, pause,
-                        wall_factory([[x, 2] for x in range(4, 13)]), # Top barrier
-                        wall_factory([[x, 7] for x in range(4, 13)]), # Bottom barrier
-                        wall_factory([[4, y] for y in range(3, 8)]), # Left barrier 
-                        wall_factory([[12, y] for y in range(3, 8)]) # Right barrier
-                        )
-        
-        index_list = []
-        object_coordinates = [[]]
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-
-        index_list = [0]
-        object_coordinates = [[player.rect.x, player.rect.y]]
-        pause_menu(level_7)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-                        index_list = [0] # Look at first index first
-                        object_coordinates = [[player.rect.x, player.rect.y]] # Coordinates of all MOVING objects
-                        pause_menu(level_7) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-
-            player.current_frame += 1 # Increment the current frame
+            return LOST
 
-            # CHECKING OBJECTS
-            for object in level_group: # For each object in the group...
-                if isinstance(object, Wall): # Checks if the "wall" is a wall
-                    object.check_collision(player)
+        if player.rect == self.win.rect:
+            return WON
 
-                # Check if the lose state condition is met 
-                elif isinstance(object, enemy.Enemy.Static):
-                    lose = object.check_collision(player)
-                    if lose and not player.loss:
-                        player.set_loss(lose)
-
-        # Restart the level if the lose state has been fulfilled
-        if not player.loss_animation and player.loss:
-            player.loss = False
-            level_7()
-
-        # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_7)
-        
         # If the player has completed moving, then tell the game that they are no longer moving
         if player.current_frame >= player.target_frame:
             player.moving = False
 
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-
-        game.update_state()
-
-def level_8(paused = False, reload_paused = False):
-    """Level VIII"""
-    global object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][3], grid[1][5])
-        win = Win(grid[0][14], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(grid[0][9], grid[1][4], style="seek")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[x, 3] for x in range(12, 15)]),
-                        wall_factory([[x, 5] for x in range(12, 15)])
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            narrator = pygame.mixer.Sound(random.choice(sounds.level_containing_dynamic_sounds)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-    
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-        
-        # Update position of moving objects
-        dynamic1_x, dynamic1_y = object_coordinates[0][0], object_coordinates[0][1]
-        player_x, player_y = object_coordinates[1][0], object_coordinates[1][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][14], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(dynamic1_x, dynamic1_y, style="seek")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[x, 3] for x in range(12, 15)]),
-                        wall_factory([[x, 5] for x in range(12, 15)])
-                        )
-        
-        
-        object_coordinates = list()
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-        
-       # Storing co-ordinates of all moving objects
-        # Storing co-ordinates of all moving objects
-        for object in level_group:
-            # If the object can move, get its coordinates
-            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                # Rounding of coordinates
-                if isinstance(object, enemy.Enemy.Dynamic):
-                    print(object.rect.x, object.rect.y)
-                    # If the coordinates fit within the tile spaces, add them to list)
-                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                    # Method if the above condition is not satisfied
-                    else:
-                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
-
-                        # Lists of integers to hold the best two coordinates for each axis
-                        choice_of_x = []
-                        choice_of_y = []
-
-                        # Based on how the number was rounded, determine the best pair of coordinates
-                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
-
-                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
-
-                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                        
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_x = [nearest_x * 80, 10000]
-
-                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
-
-                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
-
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_y = [nearest_y * 80, 10000]
-
-                        # Finds both distances between the object's position and the best choices of the coordinates
-                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
-
-                        # Finds the index for the smallest distance
-                        chosen_x = difference_x.index(min(difference_x))
-                        chosen_y = difference_y.index(min(difference_y))
-
-                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                    
-                else:
-                    object_coordinates.append([object.rect.x, object.rect.y])
-
-        pause_menu(level_8)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-
-                        # Storing co-ordinates of all moving objects
-                        for object in level_group:
-                            # If the object can move, get its coordinates
-                            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                                # Rounding of coordinates
-                                if isinstance(object, enemy.Enemy.Dynamic):
-                                    print(object.rect.x, object.rect.y)
-                                    # If the coordinates fit within the tile spaces, add them to list)
-                                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                                    # Method if the above condition is not satisfied
-                                    else:
-                                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
-
-                                        # Lists of integers to hold the best two coordinates for each axis
-                                        choice_of_x = []
-                                        choice_of_y = []
-
-                                        # Based on how the number was rounded, determine the best pair of coordinates
-                                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
-
-                                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                                        
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_x = [nearest_x * 80, 10000]
-
-                                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
-
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_y = [nearest_y * 80, 10000]
-
-                                        # Finds both distances between the object's position and the best choices of the coordinates
-                                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
-
-                                        # Finds the index for the smallest distance
-                                        chosen_x = difference_x.index(min(difference_x))
-                                        chosen_y = difference_y.index(min(difference_y))
-
-                                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                                    
-                                else:
-                                    object_coordinates.append([object.rect.x, object.rect.y])
-
-                        pause_menu(level_8) # The game is paused
-
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-
-            player.current_frame += 1 # Increment the current frame
+        with profiler.phase("sprites"):
+            self.level_group.update()
+        if self.swarm is not None:
+            with profiler.phase("swarm"):
+                self.swarm.step(player.rect)
+        return None
+
+    def snapshot(self) -> tuple:
+        """
+        Returns everything in the level that changes as it is played, so it can be put back later with restore().
+
+        This lets a level be played on from the same moment again and again without building it from scratch.
+        """
+        return (self.frame, tuple(self.inputs), self.player.snapshot(), self.win.snapshot(),
+                tuple(thing.snapshot() for thing in self.enemies),
+                self.swarm.snapshot() if self.swarm is not None else None)
+
+    def restore(self, snapshot: tuple):
+        """Puts the level back how it was when a snapshot was taken."""
+        frame, inputs, player, win, enemies, swarm = snapshot
+        self.frame = frame
+        self.inputs = list(inputs)
+        self.player.restore(player)
+        self.win.restore(win)
+        for thing, thing_snapshot in zip(self.enemies, enemies):
+            thing.restore(thing_snapshot)
+        if swarm is not None:
+            self.swarm.restore(swarm)
+        self.previous_positions = {} # Everything is drawn where it is until the next tick
+
+    def interpolate(self, sprite, alpha: float) -> pygame.Rect:
+        """Returns where a sprite should be drawn when the frame is alpha of the way from the last tick to the next."""
+        previous = self.previous_positions.get(sprite)
+        if previous is None:
+            return sprite.rect
+
+        x = previous[0] + (sprite.rect.x - previous[0]) * alpha
+        y = previous[1] + (sprite.rect.y - previous[1]) * alpha
+        return pygame.Rect((round(x), round(y)), sprite.rect.size)
+
+class LevelScene(Scene):
+    def __init__(self, data: levels.LevelData, seed: int = None):
+        """
+        A level that the player can play, built from the data loaded from its file.
+
+        Every time a level is played or restarted a new scene is made, but the data and
+        everything made from the walls is shared between all of them.
+
+        With a seed, the level, the voice lines and every restart after it are the same every time.
+        """
+        super().__init__()
+        self.data = data
+        self.number = data.number
+        self.started = False
+
+        self.state = LevelState(data, seed) # Everything that moves
+        self.seed = self.state.seed # Picked by the state if there wasn't one
+        self.random = seeds.stream(self.seed, "level", data.number, "narrator") # Voice lines don't change how the level plays
+        self.narrator = create_narrator(data.narrator, self.random)
+        self.text = Text(data.text.contents, data.text.x, data.text.y, data.text.size) if data.text is not None else None
+
+        self.pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
+
+        # Walls are drawn as part of the background
+        self.background = game.Background(data.background, data.walls)
+
+    def enter(self):
+        """Plays the narrator the first time the level is shown."""
+        if not self.started and self.narrator is not None:
+            sounds.bank.play(self.narrator)
+        self.started = True
+
+        self.renderer = game.DirtyRenderer(self.state.level_group, [self.pause]) # Tracks the parts of the screen that change
+
+    def handle_event(self, event):
+        """Moves the player and pauses the game."""
+        self.state.handle_event(event)
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                if self.pause.rect.collidepoint(event.pos) and not self.state.player.moving:
+                    sounds.bank.play(menu_forward)
+                    self.switch(PauseMenu(self)) # The game is paused
 
-        # CHECKING OBJECTS
-        for object in level_group: # For each object in the group...
-            if isinstance(object, Wall): # Checks if the "wall" is a wall
-                for object_2 in level_group:
-                    if isinstance(object_2, Player) or isinstance(object_2, enemy.Enemy.Dynamic):
-                        object.check_collision(object_2)
-
-            # Check if the lose state condition is met 
-            if isinstance(object, enemy.Enemy.Static) or isinstance(object, enemy.Enemy.Dynamic):
-                lose = object.check_collision(player)
-                if lose and not player.loss:
-                    player.set_loss(lose)
+    def update(self):
+        """Moves everything in the level and checks if the player has won or lost."""
+        result = self.state.step()
 
-            # Gets the player's coordinates
-            if isinstance(object, enemy.Enemy.Dynamic):
-                if object.since_movement == object.target_movement_time - 1: # Frame before movement
-                    object.get_player_position(player.rect)
+        # Save the attempt so that it can be watched or tested again
+        if result is not None and recording_folder is not None:
+            import replay # Only needed while recording
+            replay.save_attempt(self.state, result, recording_folder)
 
         # Restart the level if the lose state has been fulfilled
-        if not player.loss_animation and player.loss:
-            player.loss = False
-            level_8()
+        if result == LOST:
+            self.switch(play_level(self.number, seeds.derive(self.seed, "restart")))
 
         # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_8)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
-
-        game.generate_background(background1)
-
-        level_group.update()
-        level_group.draw(screen)
-        
-        # Pause is not behind blocks
-        pause.update()
-
-        game.update_state()
-
-def level_9(paused = False, reload_paused = False):
-    """Level IX"""
-    global object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][1], grid[1][4])
-        win = Win(grid[0][14], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(grid[0][11], grid[1][3], frequency=5, style="seek")
-        dynamic2 = enemy.Enemy.Dynamic(grid[0][11], grid[1][5], frequency=4, delay=35, style="seek")
-        dynamic3 = enemy.Enemy.Dynamic(grid[0][11], grid[1][4], frequency=3, delay=10, style="burst")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, dynamic2, dynamic3,
-                        win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[x, 3] for x in range(12, 15)]),
-                        wall_factory([[x, 5] for x in range(12, 15)])
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            narrator = pygame.mixer.Sound(random.choice(sounds.level_containing_dynamic_sounds)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-    
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-        
-        # Update position of moving objects
-        dynamic1_x, dynamic1_y = object_coordinates[0][0], object_coordinates[0][1]
-        dynamic2_x, dynamic2_y = object_coordinates[1][0], object_coordinates[1][1]
-        dynamic3_x, dynamic3_y = object_coordinates[2][0], object_coordinates[2][1]
-        player_x, player_y = object_coordinates[3][0], object_coordinates[3][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][14], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(dynamic1_x, dynamic1_y, frequency=5, style="seek")
-        dynamic2 = enemy.Enemy.Dynamic(dynamic2_x, dynamic2_y, frequency=4, delay=35, style="seek")
-        dynamic3 = enemy.Enemy.Dynamic(dynamic3_x, dynamic3_y, frequency=3, delay=10, style="burst")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, dynamic2, dynamic3,
-                        win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[x, 3] for x in range(12, 15)]),
-                        wall_factory([[x, 5] for x in range(12, 15)])
-                        )
-        
-        
-        object_coordinates = list()
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
-
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-        
-       # Storing co-ordinates of all moving objects
-        # Storing co-ordinates of all moving objects
-        for object in level_group:
-            # If the object can move, get its coordinates
-            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                # Rounding of coordinates
-                if isinstance(object, enemy.Enemy.Dynamic):
-                    print(object.rect.x, object.rect.y)
-                    # If the coordinates fit within the tile spaces, add them to list)
-                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                    # Method if the above condition is not satisfied
-                    else:
-                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
+        elif result == WON:
+            if self.narrator is not None and self.data.narrator.stop_on_win:
+                self.narrator.stop()
+            self.switch(WinMenu(self.number, self.random))
 
-                        # Lists of integers to hold the best two coordinates for each axis
-                        choice_of_x = []
-                        choice_of_y = []
+    def draw(self):
+        """Draws the level."""
+        self.background.draw()
 
-                        # Based on how the number was rounded, determine the best pair of coordinates
-                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
+        if self.state.swarm is not None:
+            self.state.swarm.draw(screen, self.alpha)
 
-                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
+        # Draw everything between where it was and where it is, so movement is smooth at any frame rate
+        for sprite in self.state.level_group:
+            sprite.drawn_rect = self.state.interpolate(sprite, self.alpha)
+            screen.blit(sprite.image, sprite.drawn_rect)
 
-                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                        
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_x = [nearest_x * 80, 10000]
+        # Pause is not behind blocks
+        self.pause.update()
 
-                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
+        if self.text is not None:
+            self.text.update()
 
-                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
+        # A swarm can cover any part of the screen, so it is simplest to update all of it
+        if self.state.swarm is not None:
+            return None
+        return self.renderer.rects()
 
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_y = [nearest_y * 80, 10000]
+def create_enemy(enemy_data: levels.EnemyData, rng: random.Random = None):
+    """Creates an enemy from the data of a level, which moves using the random numbers from rng if it is given."""
+    x = grid[0][enemy_data.tile[0]]
+    y = grid[1][enemy_data.tile[1]]
 
-                        # Finds both distances between the object's position and the best choices of the coordinates
-                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
+    if enemy_data.type == "static":
+        return enemy.Enemy.Static(x, y)
+    if enemy_data.type == "dynamic":
+        return enemy.Enemy.Dynamic(x, y, frequency=enemy_data.frequency, delay=enemy_data.delay, style=enemy_data.style, rng=rng)
 
-                        # Finds the index for the smallest distance
-                        chosen_x = difference_x.index(min(difference_x))
-                        chosen_y = difference_y.index(min(difference_y))
+    raise ValueError(f"'{enemy_data.type}' is not a type of enemy.")
 
-                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                    
-                else:
-                    object_coordinates.append([object.rect.x, object.rect.y])
+def create_narrator(narrator_data: levels.NarratorData, rng = random):
+    """Picks the voice line of a level, which only happens some of the time, otherwise there is no voice line."""
+    if narrator_data is None:
+        return None
 
-        pause_menu(level_9)
+    # One in 'chance' times, so a chance of 5 plays a voice line 20% of the time
+    if rng.randint(0, narrator_data.chance - 1) != 0:
+        return None
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-
-                        # Storing co-ordinates of all moving objects
-                        for object in level_group:
-                            # If the object can move, get its coordinates
-                            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                                # Rounding of coordinates
-                                if isinstance(object, enemy.Enemy.Dynamic):
-                                    print(object.rect.x, object.rect.y)
-                                    # If the coordinates fit within the tile spaces, add them to list)
-                                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                                    # Method if the above condition is not satisfied
-                                    else:
-                                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
-
-                                        # Lists of integers to hold the best two coordinates for each axis
-                                        choice_of_x = []
-                                        choice_of_y = []
-
-                                        # Based on how the number was rounded, determine the best pair of coordinates
-                                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
-
-                                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                                        
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_x = [nearest_x * 80, 10000]
-
-                                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
-
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_y = [nearest_y * 80, 10000]
-
-                                        # Finds both distances between the object's position and the best choices of the coordinates
-                                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
-
-                                        # Finds the index for the smallest distance
-                                        chosen_x = difference_x.index(min(difference_x))
-                                        chosen_y = difference_y.index(min(difference_y))
-
-                                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                                    
-                                else:
-                                    object_coordinates.append([object.rect.x, object.rect.y])
-
-                        pause_menu(level_9) # The game is paused
+    voice_lines = getattr(sounds, narrator_data.sounds)
+    if narrator_data.lines is not None:
+        voice_lines = [voice_lines[index] for index in narrator_data.lines]
 
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
-
-            player.current_frame += 1 # Increment the current frame
-
-        # CHECKING OBJECTS
-        for object in level_group: # For each object in the group...
-            if isinstance(object, Wall): # Checks if the "wall" is a wall
-                for object_2 in level_group:
-                    if isinstance(object_2, Player) or isinstance(object_2, enemy.Enemy.Dynamic):
-                        object.check_collision(object_2)
-
-            # Check if the lose state condition is met 
-            if isinstance(object, enemy.Enemy.Static) or isinstance(object, enemy.Enemy.Dynamic):
-                lose = object.check_collision(player)
-                if lose and not player.loss:
-                    player.set_loss(lose)
+    narrator = sounds.bank.get(rng.choice(voice_lines)) # Random choice of voiceline
+    narrator.set_volume(narrator_volume)
+    return narrator
 
-            # Gets the player's coordinates
-            if isinstance(object, enemy.Enemy.Dynamic):
-                if object.since_movement == object.target_movement_time - 1: # Frame before movement
-                    object.get_player_position(player.rect)
+def play_level(number: int, seed: int = None) -> LevelScene:
+    """Creates a fresh copy of a level, ready to be played, which plays the same way every time if it has a seed."""
+    return LevelScene(levels.load_level(number), seed)
 
-        # Restart the level if the lose state has been fulfilled
-        if not player.loss_animation and player.loss:
-            player.loss = False
-            level_9()
+# ----------------------------------------------------------------------- #
 
-        # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_9)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
+# Setup for the screen/window
+screen = None # The window, which is opened by create_app()
 
-        game.generate_background(background1)
+# Setup for sounds
+narrator_volume = settings.DEFAULTS["narrator_volume"] # Variable to hold volume of sound between 0 and 1
+sound_volume = settings.DEFAULTS["sound_volume"]
 
-        level_group.update()
-        level_group.draw(screen)
-        
-        # Pause is not behind blocks
-        pause.update()
-
-        game.update_state()
-
-def level_10(paused = False, reload_paused = False):
-    """Level X"""
-    global object_coordinates
-
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Load in all object in normal positions
-    if not paused:
-
-        player = Player(grid[0][14], grid[1][4])
-        win = Win(grid[0][1], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(grid[0][8], grid[1][4], frequency=4, style="burst")
-        dynamic2 = enemy.Enemy.Dynamic(grid[0][5], grid[1][2], frequency=8, style="axisbound")
-        dynamic3 = enemy.Enemy.Dynamic(grid[0][2], grid[1][4], frequency=5, style="seek")
-        dynamic4 = enemy.Enemy.Dynamic(grid[0][5], grid[1][7], frequency=5, delay=15, style="axisbound")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, dynamic2, dynamic3, dynamic4,
-                        win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[1, 3], [1, 5]]),
-
-                        # Wall guarding the win
-                        wall_factory([[4, y] for y in range(3, 6)]),
-                        wall_factory([[4, 1], [4, 7]])
-                        )
-        
-        # Play a random sound 20% of the time
-        if random.randint(0, 4) == 3: # CHANGE TO 3
-            narrator = pygame.mixer.Sound(random.choice(sounds.level_containing_dynamic_sounds)) # Random choice of voiceline
-            narrator.set_volume(narrator_volume)
-            narrator.play()
-    
-    # Load in objects at last known coordinates based upon the index list's preference
-    elif paused:
-        
-        # Update position of moving objects
-        dynamic1_x, dynamic1_y = object_coordinates[0][0], object_coordinates[0][1]
-        dynamic2_x, dynamic2_y = object_coordinates[1][0], object_coordinates[1][1]
-        dynamic3_x, dynamic3_y = object_coordinates[2][0], object_coordinates[2][1]
-        dynamic4_x, dynamic4_y = object_coordinates[3][0], object_coordinates[3][1]
-        player_x, player_y = object_coordinates[4][0], object_coordinates[4][1]
-        
-        player = Player(player_x, player_y)
-        win = Win(grid[0][1], grid[1][4])
-        pause = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-        dynamic1 = enemy.Enemy.Dynamic(dynamic1_x, dynamic1_y, style="seek")
-        dynamic2 = enemy.Enemy.Dynamic(dynamic2_x, dynamic2_y, frequency=8, style="axisbound")
-        dynamic3 = enemy.Enemy.Dynamic(dynamic3_x, dynamic3_y, frequency=5, style="seek")
-        dynamic4 = enemy.Enemy.Dynamic(dynamic4_x, dynamic4_y, frequency=5, delay=15, style="axisbound")
-
-        level_group = pygame.sprite.Group()
-        level_group.add(dynamic1, dynamic2, dynamic3, dynamic4,
-                        win, player, pause,
-                        # Barrier around level
-                        wall_factory([[x, 0] for x in range(0, 16)]),
-                        wall_factory([[x, 8] for x in range(0, 16)]),
-                        wall_factory([[0, y] for y in range(0, 9)]),
-                        wall_factory([[15, y] for y in range(0, 9)]),
-
-                        # Barriers surrounding win
-                        wall_factory([[1, 3], [1, 5]]),
-
-                        # Wall guarding the win
-                        wall_factory([[4, y] for y in range(3, 6)]),
-                        wall_factory([[4, 1], [4, 7]])
-                        )
-        
-        
-        object_coordinates = list()
-        
-    # Go back to the pause menu and load the objects to the screen
-    if reload_paused:
+# Sounds are decoded by load_sounds(), so until then there is nothing to play
+menu_backward = menu_forward = level_select = lose_sound = player_move_sound = win_sound = dynamic_sound = None
+main_menu_first = main_menu_not_first = win_menu_sound = lose_narrator_sound = None
+sound_list = []
+narrator_sound_list = []
 
-        # Fixes the flashing bug
-        overlay.set_alpha(10)
-        screen.blit(overlay, overlay_rect)
-        
-       # Storing co-ordinates of all moving objects
-        # Storing co-ordinates of all moving objects
-        for object in level_group:
-            # If the object can move, get its coordinates
-            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                # Rounding of coordinates
-                if isinstance(object, enemy.Enemy.Dynamic):
-                    # If the coordinates fit within the tile spaces, add them to list)
-                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                    # Method if the above condition is not satisfied
-                    else:
-                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
+def load_sounds():
+    """Decodes the sounds used by the menus and the player, at the volumes in the settings."""
+    global narrator_volume, sound_volume
+    global menu_backward, menu_forward, level_select, lose_sound, player_move_sound, win_sound, dynamic_sound, sound_list
+    global main_menu_first, main_menu_not_first, win_menu_sound, lose_narrator_sound, narrator_sound_list
 
-                        # Lists of integers to hold the best two coordinates for each axis
-                        choice_of_x = []
-                        choice_of_y = []
+    sounds.bank.preload() # Decode every sound in the background so nothing has to wait for it later
 
-                        # Based on how the number was rounded, determine the best pair of coordinates
-                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
+    narrator_volume = settings.store.get("narrator_volume")
+    sound_volume = settings.store.get("sound_volume")
 
-                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
+    # JUST SOUNDS
+    menu_backward = sounds.bank.get(sounds.effect_sounds[0])
+    menu_backward.set_volume(sound_volume)
 
-                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                        
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_x = [nearest_x * 80, 10000]
+    menu_forward = sounds.bank.get(sounds.effect_sounds[1])
+    menu_forward.set_volume(sound_volume)
 
-                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
+    level_select = sounds.bank.get(sounds.effect_sounds[2])
+    level_select.set_volume(sound_volume)
 
-                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
+    lose_sound = sounds.bank.get(sounds.effect_sounds[3])
+    lose_sound.set_volume(sound_volume * 0.5) # Quite loud
 
-                        # The case for if only one of the coordinates are a multiple of 80
-                        else:
-                            # 10000 as second best coordinate to ensure first coordinate is picked
-                            choice_of_y = [nearest_y * 80, 10000]
+    player_move_sound = sounds.bank.get(sounds.effect_sounds[4])
+    player_move_sound.set_volume(sound_volume)
 
-                        # Finds both distances between the object's position and the best choices of the coordinates
-                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
+    win_sound = sounds.bank.get(sounds.effect_sounds[5])
+    win_sound.set_volume(sound_volume)
 
-                        # Finds the index for the smallest distance
-                        chosen_x = difference_x.index(min(difference_x))
-                        chosen_y = difference_y.index(min(difference_y))
+    dynamic_sound = sounds.bank.get(sounds.effect_sounds[6])
+    dynamic_sound.set_volume(sound_volume)
 
-                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                    
-                else:
-                    object_coordinates.append([object.rect.x, object.rect.y])
+    sound_list = [menu_backward, menu_forward, level_select, lose_sound, player_move_sound, win_sound, dynamic_sound, dynamic_sound]
 
-        pause_menu(level_10)
+    # NARRATOR SOUNDS
+    main_menu_first = sounds.bank.get(random.choice(sounds.main_menu_sounds)) # Sound object to play a sound from a path
+    main_menu_first.set_volume(narrator_volume) # Sets the volume of the sound relative to its original sound
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            player.movement(event) # Check for the player movement
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if pause.rect.collidepoint(event.pos) and not player.moving:
-                        game.garbage_disposal([level_group]) # Free up the memory
-                        menu_forward.play()
-
-                        # Storing co-ordinates of all moving objects
-                        for object in level_group:
-                            # If the object can move, get its coordinates
-                            if isinstance(object, enemy.Enemy.Dynamic) or isinstance(object, Player):
-                                # Rounding of coordinates
-                                if isinstance(object, enemy.Enemy.Dynamic):
-                                    print(object.rect.x, object.rect.y)
-                                    # If the coordinates fit within the tile spaces, add them to list)
-                                    if object.rect.x % SQUARE_LENGTH == 0 and object.rect.y % SQUARE_LENGTH == 0:
-                                        object_coordinates.append([object.rect.x, object.rect.y])
-
-                                    # Method if the above condition is not satisfied
-                                    else:
-                                        # Closest rounded coordinates relative to grid (so not multiple of 80)
-                                        nearest_x = round(object.rect.x / SQUARE_LENGTH)
-                                        nearest_y = round(object.rect.y / SQUARE_LENGTH)
-
-                                        # Lists of integers to hold the best two coordinates for each axis
-                                        choice_of_x = []
-                                        choice_of_y = []
-
-                                        # Based on how the number was rounded, determine the best pair of coordinates
-                                        # C1 < rounded_x < C2 where C1 and C2 are best pair of coordinates
-
-                                        if nearest_x > object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [(nearest_x - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_x < object.rect.x / SQUARE_LENGTH:
-                                            choice_of_x = [nearest_x * 80, (nearest_x + 1) * 80]
-                                        
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_x = [nearest_x * 80, 10000]
-
-                                        if nearest_y < object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [(nearest_y - 1) * 80, nearest_x * 80]
-
-                                        elif nearest_y > object.rect.y / SQUARE_LENGTH:
-                                            choice_of_y = [nearest_y * 80, (nearest_x + 1) * 80]
-
-                                        # The case for if only one of the coordinates are a multiple of 80
-                                        else:
-                                            # 10000 as second best coordinate to ensure first coordinate is picked
-                                            choice_of_y = [nearest_y * 80, 10000]
-
-                                        # Finds both distances between the object's position and the best choices of the coordinates
-                                        difference_x = [abs(object.rect.x - choice_of_x[0]), abs(object.rect.x - choice_of_x[1])]
-                                        difference_y = [abs(object.rect.y - choice_of_y[0]), abs(object.rect.y - choice_of_y[1])]
-
-                                        # Finds the index for the smallest distance
-                                        chosen_x = difference_x.index(min(difference_x))
-                                        chosen_y = difference_y.index(min(difference_y))
-
-                                        object_coordinates.append([choice_of_x[chosen_x], choice_of_y[chosen_y]])
-                                    
-                                else:
-                                    object_coordinates.append([object.rect.x, object.rect.y])
-
-                        pause_menu(level_10) # The game is paused
+    main_menu_not_first = sounds.bank.get(random.choice(sounds.main_menu_return_sounds))
+    main_menu_not_first.set_volume(narrator_volume)
 
-        if player.current_frame < player.target_frame: # If the player is not done moving...
-            player.rect.y += player.dy # Update the y position
-            player.rect.x += player.dx # Update the x position
+    win_menu_sound = sounds.bank.get(random.choice(sounds.win_state_sounds))
+    win_menu_sound.set_volume(narrator_volume)
 
-            player.current_frame += 1 # Increment the current frame
+    lose_narrator_sound = sounds.bank.get(random.choice(sounds.lose_state_sounds))
+    lose_narrator_sound.set_volume(narrator_volume)
 
-        # CHECKING OBJECTS
-        for object in level_group: # For each object in the group...
-            if isinstance(object, Wall): # Checks if the "wall" is a wall
-                for object_2 in level_group:
-                    if isinstance(object_2, Player) or isinstance(object_2, enemy.Enemy.Dynamic):
-                        object.check_collision(object_2)
-
-            # Check if the lose state condition is met 
-            if isinstance(object, enemy.Enemy.Static) or isinstance(object, enemy.Enemy.Dynamic):
-                lose = object.check_collision(player)
-                if lose and not player.loss:
-                    player.set_loss(lose)
+    narrator_sound_list = [main_menu_first, main_menu_not_first, win_menu_sound, lose_sound]
 
-            # Gets the player's coordinates
-            if isinstance(object, enemy.Enemy.Dynamic):
-                if object.since_movement == object.target_movement_time - 1: # Frame before movement
-                    object.get_player_position(player.rect)
+    settings.store.subscribe(apply_setting) # Keep every sound at the volume in the settings
 
-        # Restart the level if the lose state has been fulfilled
-        if not player.loss_animation and player.loss:
-            player.loss = False
-            level_10()
+# Startup
+startup_times = {} # Part of the startup -> seconds it took
+report_startup = False # Whether the startup report is printed once the first frame is shown
 
-        # If the player wins, load the win menu
-        if player.rect == win.rect:
-            game.garbage_disposal([player, win, level_group])
-            win_menu(level_10)
-        
-        # If the player has completed moving, then tell the game that they are no longer moving
-        if player.current_frame >= player.target_frame:
-            player.moving = False
+@contextmanager
+def timed(part: str):
+    """Times part of the startup."""
+    start = time.perf_counter()
+    yield
+    startup_times[part] = time.perf_counter() - start
 
-        game.generate_background(background1)
+def create_app(display: bool = True, report: bool = False):
+    """
+    Starts pygame, opens the window and loads the sounds, which must be done before any scene is run.
 
-        level_group.update()
-        level_group.draw(screen)
-        
-        # Pause is not behind blocks
-        pause.update()
+    Importing the game does none of this, so tools can use the levels without a window.
+    Without a display, only fonts are started, so no window is opened and no sounds are
+    loaded, which is all that playing levels headlessly needs.
+    Calling this again does nothing apart from starting everything if it wasn't started before.
+    """
+    global screen, report_startup
+    report_startup = report
 
-        game.update_state()
+    if "import" not in startup_times:
+        startup_times["import"] = time.perf_counter() - STARTED_AT
 
-# ----------------------------------------------------------------------- #
+    # Text in levels needs fonts, which need neither a window nor the mixer
+    if not pygame.font.get_init():
+        pygame.font.init()
 
-# Setup for the screen/window
-WIDTH = 1280
-HEIGHT = 720
-screen =  pygame.display.set_mode((WIDTH, HEIGHT)) # Dimensions = (1280, 720)
-pygame.display.set_caption("Logical Psycho") # Sets the caption of the window
-clock = pygame.time.Clock() # Creates a clock object to set frame rate
-FPS = 60 # Frames per second5
-
-# Setup for the tiles
-SQUARE_LENGTH = 80 # Length of each edge of the tile
-grid = [[x for x in range(0, WIDTH, SQUARE_LENGTH)], [y for y in range(0, HEIGHT, SQUARE_LENGTH)]] # Coordinate map for each tile
-
-# Setup for images
-background1 = join("Assets", "Block", "Background1.png") # Encapsulated path
-background2 = join("Assets", "Block", "Background2.png")
-background3 = join("Assets", "Block", "Background3.png")
-background4 = join("Assets", "Block", "Background4.png")
-background5 = join("Assets", "Block", "Background5.png")
-background6 = join("Assets", "Block", "Background6.png")
-block = join("Assets", "Block", "Block.png")
+    if not display:
+        return screen
 
-# Setup for sounds
-narrator_volume = 0.5 # Variable to hold volume of sound between 0 and 1
-sound_volume = 0.5
+    if not pygame.get_init():
+        with timed("pygame"):
+            # Initialising pygame library
+            pygame.init()
+            pygame.mixer.init()
 
-# JUST SOUNDS
-menu_backward = pygame.mixer.Sound(sounds.effect_sounds[0])
-menu_backward.set_volume(sound_volume)
+    if screen is None:
+        with timed("display"):
+            screen = pygame.display.set_mode((WIDTH, HEIGHT)) # Dimensions = (1280, 720)
+            pygame.display.set_caption(CAPTION) # Sets the caption of the window
 
-menu_forward = pygame.mixer.Sound(sounds.effect_sounds[1])
-menu_forward.set_volume(sound_volume)
+    if menu_backward is None and pygame.mixer.get_init():
+        with timed("sounds"):
+            load_sounds()
 
-level_select = pygame.mixer.Sound(sounds.effect_sounds[2])
-level_select.set_volume(sound_volume)
+    return screen
 
-lose_sound = pygame.mixer.Sound(sounds.effect_sounds[3])
-lose_sound.set_volume(sound_volume * 0.5) # Quite loud
+def startup_report() -> str:
+    """Describes how long each part of the startup took."""
+    lines = [f"{part:>12}: {seconds * 1000:8.1f} ms" for part, seconds in startup_times.items()]
+    lines.append(f"{'total':>12}: {sum(startup_times.values()) * 1000:8.1f} ms")
+    return "\n".join(lines)
 
-player_move_sound = pygame.mixer.Sound(sounds.effect_sounds[4])
-player_move_sound.set_volume(sound_volume)
-
-win_sound = pygame.mixer.Sound(sounds.effect_sounds[5])
-win_sound.set_volume(sound_volume)
-
-dynamic_sound = pygame.mixer.Sound(sounds.effect_sounds[6])
-dynamic_sound.set_volume(sound_volume)
-
-sound_list = [menu_backward, menu_forward, level_select, lose_sound, player_move_sound, win_sound, dynamic_sound, dynamic_sound]
-
-# NARRATOR SOUNDS
-main_menu_first = pygame.mixer.Sound(random.choice(sounds.main_menu_sounds)) # Sound object to play a sound from a path
-main_menu_first.set_volume(narrator_volume) # Sets the volume of the sound relative to its original sound
-
-main_menu_not_first = pygame.mixer.Sound(random.choice(sounds.main_menu_return_sounds))
-main_menu_not_first.set_volume(narrator_volume)
-
-win_menu_sound = pygame.mixer.Sound(random.choice(sounds.win_state_sounds))
-win_menu_sound.set_volume(narrator_volume)
-
-lose_narrator_sound = pygame.mixer.Sound(random.choice(sounds.lose_state_sounds))
-lose_narrator_sound.set_volume(narrator_volume)
-
-narrator_sound_list = [main_menu_first, main_menu_not_first, win_menu_sound, lose_sound]
+# Paths for the widgets
+button_image = join("Assets", "Buttons", "Playbutton.png") # Path to the button image
+volume_button = join("Assets", "Buttons", "volumebutton.png")
+back_button = join("Assets", "Buttons", "backbutton.png")
+win_title_background_image = join("Assets", "Block", "circularbackground.png") # Our circular background for the text
 
 # Setup for main menu
-
 main_menu_visit_count = 0
 
-text_1 = Text("Logical Psycho", WIDTH//2, HEIGHT//7, 50)
+# The widgets of each menu are only built the first time the menu is visited, and are then shared by every visit
 
-button_image = join("Assets", "Buttons", "Playbutton.png") # Path to the button image
+@lru_cache(maxsize=None)
+def main_menu_widgets():
+    """Builds the title and buttons of the main menu."""
+    title = Text("Logical Psycho", WIDTH//2, HEIGHT//7, 50)
 
-play_button = Button(button_image, "PLAY", 50, WIDTH //2, HEIGHT//2.25, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5) # Button object with arguemnts
-settings_button = Button(button_image, "SETTINGS", 30, WIDTH //2, HEIGHT // 2.25 + 135, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
-quit_button = Button(button_image, "QUIT", 50, WIDTH // 2 , HEIGHT // 2.25 + 270, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
+    play_button = Button(button_image, "PLAY", 50, WIDTH //2, HEIGHT//2.25, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5) # Button object with arguemnts
+    settings_button = Button(button_image, "SETTINGS", 30, WIDTH //2, HEIGHT // 2.25 + 135, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
+    quit_button = Button(button_image, "QUIT", 50, WIDTH // 2 , HEIGHT // 2.25 + 270, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
 
-button_group = pygame.sprite.Group() # Group object
-button_group.add(play_button, settings_button, quit_button) # Adds button object to group | Group object acts as a list for Sprite objects
+    button_group = pygame.sprite.Group() # Group object
+    button_group.add(play_button, settings_button, quit_button) # Adds button object to group | Group object acts as a list for Sprite objects
 
-# Setup for settings menu
-volume_button = join("Assets", "Buttons", "volumebutton.png")
-back_button = join("Assets", "Buttons", "backbutton.png")
+    return title, play_button, settings_button, quit_button, button_group
 
-settings_title = Text("Settings", WIDTH//2, HEIGHT//9, 50)
-narrator_volume_text = Text("Narrator Volume", WIDTH//5, HEIGHT//2.75, 30)
-sound_volume_text = Text("Sound Volume", WIDTH//5, HEIGHT//2.75 + 150, 30)
-delete_save_text = Text("Delete Save", WIDTH//5, HEIGHT//2.75 + 300, 30)
-
-narrator_ui_volume = str(round(narrator_volume * 200)) # 0.5 in program = 100 in game
-sound_ui_volume = str(round(sound_volume * 200))
+@lru_cache(maxsize=None)
+def settings_menu_widgets():
+    """Builds the parts of the settings menu that do not depend on the volume."""
+    settings_title = Text("Settings", WIDTH//2, HEIGHT//9, 50)
+    narrator_volume_text = Text("Narrator Volume", WIDTH//5, HEIGHT//2.75, 30)
+    sound_volume_text = Text("Sound Volume", WIDTH//5, HEIGHT//2.75 + 150, 30)
+    delete_save_text = Text("Delete Save", WIDTH//5, HEIGHT//2.75 + 300, 30)
 
-narrator_volume_number = Text(narrator_ui_volume, WIDTH//2.25, HEIGHT//2.75, 30)
-sound_volume_number = Text(sound_ui_volume, WIDTH//2.25, HEIGHT//2.75 + 150, 30)
+    button_to_hold_narrator_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75, 600, SQUARE_LENGTH * 1.5)
+    button_to_hold_sound_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75 + 150, 600, SQUARE_LENGTH * 1.5)
 
-button_to_hold_narrator_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75, 600, SQUARE_LENGTH * 1.5)
-button_to_hold_sound_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75 + 150, 600, SQUARE_LENGTH * 1.5)
+    delete_save_button = Button(volume_button, "YES", 30, WIDTH//1.35, HEIGHT//2.75 + 300, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
 
-narrator_volume_scroller = Button(volume_button, "", 50, 1200, HEIGHT//2.75, SQUARE_LENGTH, SQUARE_LENGTH * 1.5) # 697 = most left, 1200 = most right
-sound_volume_scroller = Button(volume_button, "", 50, 1200, HEIGHT//2.75 + 150, SQUARE_LENGTH, SQUARE_LENGTH * 1.5)
+    go_back_button = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
 
-delete_save_button = Button(volume_button, "YES", 30, WIDTH//1.35, HEIGHT//2.75 + 300, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
+    return (settings_title, narrator_volume_text, sound_volume_text, delete_save_text,
+            button_to_hold_narrator_volume, button_to_hold_sound_volume, delete_save_button, go_back_button)
 
-go_back_button =  Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
+@lru_cache(maxsize=None)
+def data_deletion_widgets():
+    """Builds the warning and buttons of the 'confirm data deletion' menu."""
+    #warning_string = "                 Are you sure you want to\n       delete your progress?\n       Doing so will remove any futile \nefforts you made in this playthrough."
+    warning_string_replacement = "PRESS 'YES' TO DELETE DATA."
+    warning_text = Text(warning_string_replacement, WIDTH//2, HEIGHT//4, 40)
+    yes_button = Button(volume_button, "YES", 30, 500, HEIGHT - 200, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
+    no_button = Button(volume_button, "NO", 30, WIDTH - 500, HEIGHT - 200, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
 
-settings_button_group = pygame.sprite.Group()
-settings_button_group.add(button_to_hold_narrator_volume, button_to_hold_sound_volume, 
-                          narrator_volume_scroller, sound_volume_scroller,
-                          delete_save_button, go_back_button)
+    data_deletion_group = pygame.sprite.Group()
+    data_deletion_group.add(yes_button, no_button)
 
-# Setup for 'confirm data deletion' menu
-#warning_string = "                 Are you sure you want to\n       delete your progress?\n       Doing so will remove any futile \nefforts you made in this playthrough."
-warning_string_replacement = "PRESS 'YES' TO DELETE DATA."
-warning_text = Text(warning_string_replacement, WIDTH//2, HEIGHT//4, 40)
-yes_button = Button(volume_button, "YES", 30, 500, HEIGHT - 200, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
-no_button = Button(volume_button, "NO", 30, WIDTH - 500, HEIGHT - 200, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
+    return warning_text, yes_button, no_button, data_deletion_group
 
-data_deletion_group = pygame.sprite.Group()
-data_deletion_group.add(yes_button, no_button)
+@lru_cache(maxsize=None)
+def level_buttons() -> list:
+    """Builds a button for every level, locked according to the save, in rows of 5."""
+    list_of_levels = []
+    for number in range(1, levels.level_count() + 1):
+        column = 4 + ((number - 1) % 5) * 2
+        row = 4 + ((number - 1) // 5) * 2
+        list_of_levels.append(Level(f"{number:02}", grid[0][column], grid[1][row], number, False))
 
-# Setup for level selection menu
-level_selection_title =  Text("Level Selection", WIDTH//2, HEIGHT//9, 50)
+    progress = saves.manager.read("progress", {"unlocked_levels": 1})
+    reset_levels(list_of_levels, progress["unlocked_levels"])
 
-go_back_button_2 = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
+    return list_of_levels
 
-level_1_button = Level("01", grid[0][4], grid[1][4], level_1, False)
-level_2_button = Level("02", grid[0][6], grid[1][4], level_2, False)
-level_3_button = Level("03", grid[0][8], grid[1][4], level_3, False)
-level_4_button = Level("04", grid[0][10], grid[1][4], level_4, False)
-level_5_button = Level("05", grid[0][12], grid[1][4], level_5, False)
-level_6_button = Level("06", grid[0][4], grid[1][6], level_6, False)
-level_7_button = Level("07", grid[0][6], grid[1][6], level_7, False)
-level_8_button = Level("08", grid[0][8], grid[1][6], level_8, False)
-level_9_button = Level("09", grid[0][10], grid[1][6], level_9, False)
-level_10_button = Level("10", grid[0][12], grid[1][6], level_10, False)
+@lru_cache(maxsize=None)
+def level_selection_widgets():
+    """Builds the title and buttons of the level selection menu."""
+    level_selection_title =  Text("Level Selection", WIDTH//2, HEIGHT//9, 50)
 
+    go_back_button = Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
 
-list_of_levels = [level_1_button, level_2_button, level_3_button, level_4_button, level_5_button,
-                  level_6_button, level_7_button, level_8_button, level_9_button, level_10_button] # List of all levels
+    level_selection_button_group = pygame.sprite.Group()
+    level_selection_button_group.add(go_back_button, *level_buttons())
 
-level_selection_button_group = pygame.sprite.Group()
-level_selection_button_group.add(go_back_button_2,
-                                 level_1_button, level_2_button, level_3_button, level_4_button, level_5_button,
-                                 level_6_button, level_7_button, level_8_button, level_9_button, level_10_button)
+    return level_selection_title, go_back_button, level_selection_button_group
 
-# Setup for win menu
+@lru_cache(maxsize=None)
+def win_menu_widgets():
+    """Builds the title and buttons of the win menu."""
+    offset = 5 # Offset for the shadow of the text
 
-offset = 5 # Offset for the shadow of the text
+    win_title = Text("Level Complete", WIDTH//2, HEIGHT//9, 40)
+    win_shadow = Text("Level Complete", WIDTH//2 + offset, HEIGHT//9 + offset, 40, BLACK) # The shadow is black and is below and to the right of the text
+    win_background = Button(win_title_background_image, "", 1, WIDTH//2, HEIGHT//9, SQUARE_LENGTH * 12, SQUARE_LENGTH * 1.75)
 
-win_title_background_image = join("Assets", "Block", "circularbackground.png") # Our circular background for the text
+    next_level_button = Button(button_image, "NEXT LEVEL", 30, 400, HEIGHT - 100, SQUARE_LENGTH * 5, SQUARE_LENGTH * 1.5)
+    go_back_to_levels_button = Button(button_image, "BACK TO LEVEL SELECTION", 15, WIDTH - 400, HEIGHT - 100, SQUARE_LENGTH * 5, SQUARE_LENGTH * 1.5)
 
-win_title = Text("Level Complete", WIDTH//2, HEIGHT//9, 40)
-win_shadow = Text("Level Complete", WIDTH//2 + offset, HEIGHT//9 + offset, 40, BLACK) # The shadow is black and is below and to the right of the text
-win_background = Button(win_title_background_image, "", 1, WIDTH//2, HEIGHT//9, SQUARE_LENGTH * 12, SQUARE_LENGTH * 1.75)
+    win_buttons = pygame.sprite.Group()
+    win_buttons.add(next_level_button, go_back_to_levels_button, win_background)
 
-next_level_button = Button(button_image, "NEXT LEVEL", 30, 400, HEIGHT - 100, SQUARE_LENGTH * 5, SQUARE_LENGTH * 1.5)
-go_back_to_levels_button = Button(button_image, "BACK TO LEVEL SELECTION", 15, WIDTH - 400, HEIGHT - 100, SQUARE_LENGTH * 5, SQUARE_LENGTH * 1.5)
+    return win_title, win_shadow, next_level_button, go_back_to_levels_button, win_buttons
 
-win_buttons = pygame.sprite.Group()
-win_buttons.add(next_level_button, go_back_to_levels_button, win_background)
+@lru_cache(maxsize=None)
+def pause_menu_widgets():
+    """Builds the title and buttons of the pause menu."""
+    pause_title = Text("Paused", WIDTH//2, HEIGHT//9, 50)
 
-# Setup for pause menu
-index_list = [] # Stores the indexes we need to access in order to load moving objects into level
-object_coordinates = [] # Stores the coordinates of each moving object
+    resume_button = Button(button_image, "RESUME", 30, WIDTH //2, HEIGHT//2.25, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
+    settings_button = Button(button_image, "SETTINGS", 30, WIDTH //2, HEIGHT // 2.25 + 135, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
+    to_level_select_button = Button(button_image, "GO BACK", 30, WIDTH // 2 , HEIGHT // 2.25 + 270, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
 
-pause_title = Text("Paused", WIDTH//2, HEIGHT//9, 50)
+    pause_group = pygame.sprite.Group()
+    pause_group.add(resume_button, settings_button, to_level_select_button)
 
-resume_button = Button(button_image, "RESUME", 30, WIDTH //2, HEIGHT//2.25, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
-settings_button = Button(button_image, "SETTINGS", 30, WIDTH //2, HEIGHT // 2.25 + 135, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
-to_level_select_button = Button(button_image, "GO BACK", 30, WIDTH // 2 , HEIGHT // 2.25 + 270, SQUARE_LENGTH * 4, SQUARE_LENGTH * 1.5)
+    return pause_title, resume_button, settings_button, to_level_select_button, pause_group
 
-pause_group = pygame.sprite.Group()
-pause_group.add(resume_button, settings_button, to_level_select_button)
-          
 # Menus
-def main_menu():
-    """Main menu that the user will load up."""
-    global main_menu_visit_count
-    
-    # Play a different narrator sound if the user visits the menu too many times
-    if main_menu_visit_count <= 2:
-        if random.randint(1, 5) == 4:
-            main_menu_first = pygame.mixer.Sound(random.choice(sounds.main_menu_sounds))
-            main_menu_first.set_volume(narrator_volume)
-            main_menu_first.play()
-    
-    else:
-        if random.randint(1, 5) == 4:
-            main_menu_not_first = pygame.mixer.Sound(random.choice(sounds.main_menu_return_sounds))
-            main_menu_not_first.set_volume(narrator_volume)
-            main_menu_not_first.play()
-
-    main_menu_visit_count += 1
-    
-    load_data_from_game_file() # Loads data
-    update_sounds(file="volume.txt", mode="read", volume1=narrator_volume, volume2=sound_volume) # Updates sounds
-
-    # Updates volume
-    sounds.change_volume(sound_list, sound_volume)
-    sounds.change_volume(narrator_sound_list, narrator_volume)
-
-    
-    while True:
-        for event in pygame.event.get(): # For each event that can happen...
-            if event.type == pygame.QUIT: # If the user presses 'X' on the top left of the screen...
-                menu_backward.play()
-                game.terminate() # Quits the game
-            if event.type == pygame.MOUSEBUTTONDOWN: # If the user presses the mouse button...
-                if event.button == 1: # If the user presses the LEFT mouse button...
-                    if quit_button.rect.collidepoint(event.pos): # If the mouse presses the quit button...
-                        game.garbage_disposal([text_1, button_group]) # Free memory
-                        game.terminate() # Quits the game
-                    if settings_button.rect.collidepoint(event.pos): # If the mouse presses the settings button...
-                        game.garbage_disposal([text_1, button_group]) # Free memory
-                        menu_forward.play()
-                        settings_menu() # Navigate to the settings menu
-                    if play_button.rect.collidepoint(event.pos): # If the mouse presses the play button...
-                        game.garbage_disposal([text_1, button_group]) # Free memory
-                        menu_forward.play()
-                        level_selection() # Navigate to the level selection menu
+class MainMenu(Scene):
+    def __init__(self):
+        """Gets the widgets of the main menu, building them if this is the first visit."""
+        super().__init__()
+        self.title, self.play_button, self.settings_button, self.quit_button, self.button_group = main_menu_widgets()
 
-        game.generate_background(background5) # Generates the background
+    def enter(self):
+        """Main menu that the user will load up."""
+        global main_menu_visit_count
 
-        text_1.update() # Displays text
-        button_group.update() # Updates all the buttons
+        # Play a different narrator sound if the user visits the menu too many times
+        if main_menu_visit_count <= 2:
+            if random.randint(1, 5) == 4:
+                main_menu_first = sounds.bank.get(random.choice(sounds.main_menu_sounds))
+                main_menu_first.set_volume(narrator_volume)
+                sounds.bank.play(main_menu_first)
 
-        game.update_state() # Updates the game window
+        else:
+            if random.randint(1, 5) == 4:
+                main_menu_not_first = sounds.bank.get(random.choice(sounds.main_menu_return_sounds))
+                main_menu_not_first.set_volume(narrator_volume)
+                sounds.bank.play(main_menu_not_first)
+
+        main_menu_visit_count += 1
+
+        load_data_from_game_file() # Loads data
+
+        self.renderer = game.DirtyRenderer(self.button_group) # Tracks the parts of the screen that change
+
+    def handle_event(self, event):
+        """Checks which button has been pressed."""
+        if event.type == pygame.QUIT: # If the user presses 'X' on the top left of the screen...
+            sounds.bank.play(menu_backward)
+        if event.type == pygame.MOUSEBUTTONDOWN: # If the user presses the mouse button...
+            if event.button == 1: # If the user presses the LEFT mouse button...
+                if self.quit_button.rect.collidepoint(event.pos): # If the mouse presses the quit button...
+                    game.terminate() # Quits the game
+                if self.settings_button.rect.collidepoint(event.pos): # If the mouse presses the settings button...
+                    sounds.bank.play(menu_forward)
+                    self.switch(SettingsMenu()) # Navigate to the settings menu
+                if self.play_button.rect.collidepoint(event.pos): # If the mouse presses the play button...
+                    sounds.bank.play(menu_forward)
+                    self.switch(LevelSelection()) # Navigate to the level selection menu
+
+    def draw(self):
+        """Draws the main menu."""
+        game.generate_background(background5) # Generates the background
 
-def settings_menu(return_menu = main_menu):
-    """Settings menu so the user can change features of the game."""
-    global narrator_volume, sound_volume
-    global narrator_volume_number, sound_volume_number
-    global narrator_ui_volume, sound_ui_volume
+        self.title.update() # Displays text
+        self.button_group.update() # Updates all the buttons
+
+        return self.renderer.rects()
 
+class SettingsMenu(Scene):
     LOWERBOUND = 658
     UPPERBOUND = 1168
     RANGE = UPPERBOUND - LOWERBOUND # 1168 - 658 = 510
 
-    narrator_moving = False
-    sound_moving = False
-
-    # REDEFINE IT ALL
-    volume_button = join("Assets", "Buttons", "volumebutton.png")
-    back_button = join("Assets", "Buttons", "backbutton.png")
-
-    settings_title = Text("Settings", WIDTH//2, HEIGHT//9, 50)
-    narrator_volume_text = Text("Narrator Volume", WIDTH//5, HEIGHT//2.75, 30)
-    sound_volume_text = Text("Sound Volume", WIDTH//5, HEIGHT//2.75 + 150, 30)
-    delete_save_text = Text("Delete Save", WIDTH//5, HEIGHT//2.75 + 300, 30)
-
-    narrator_ui_volume = str(round(narrator_volume * 200)) # 0.5 in program = 100 in game
-    sound_ui_volume = str(round(sound_volume * 200))
-
-    narrator_volume_number = Text(narrator_ui_volume, WIDTH//2.25, HEIGHT//2.75, 30)
-    sound_volume_number = Text(sound_ui_volume, WIDTH//2.25, HEIGHT//2.75 + 150, 30)
-
-    button_to_hold_narrator_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75, 600, SQUARE_LENGTH * 1.5)
-    button_to_hold_sound_volume = Button(button_image, "", 50, WIDTH // 1.35, HEIGHT // 2.75 + 150, 600, SQUARE_LENGTH * 1.5)
-
-    # Repositioned buttons to ensure that the volume sliding is not broken
-    narrator_volume_scroller = Button(volume_button, "", 50, 697 + ((2 * narrator_volume) * (1200 - 697)), HEIGHT//2.75, SQUARE_LENGTH, SQUARE_LENGTH * 1.5) # 697 = most left, 1200 = most right
-    sound_volume_scroller = Button(volume_button, "", 50, 697 + ((2 * sound_volume) * (1200 - 697)), HEIGHT//2.75 + 150, SQUARE_LENGTH, SQUARE_LENGTH * 1.5) 
-
-    delete_save_button = Button(volume_button, "YES", 30, WIDTH//1.35, HEIGHT//2.75 + 300, SQUARE_LENGTH * 2.25, SQUARE_LENGTH * 2, BLACK)
-
-    go_back_button =  Button(back_button, "", 30, WIDTH - 50, 50, SQUARE_LENGTH, SQUARE_LENGTH)
-
-    settings_button_group = pygame.sprite.Group()
-    settings_button_group.add(button_to_hold_narrator_volume, button_to_hold_sound_volume, 
-                            narrator_volume_scroller, sound_volume_scroller,
-                            delete_save_button, go_back_button)
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if go_back_button.rect.collidepoint(event.pos): # If the back button is pressed by the mouse...
-                        game.garbage_disposal([settings_title, narrator_volume_text, sound_volume_text,
-                                              delete_save_text, narrator_volume_number, sound_volume_number,
-                                              settings_button_group])
-                        menu_backward.play()
-
-                        # Updates the sounds
-                        update_sounds(file="volume.txt", mode="write", volume1=narrator_volume, volume2=sound_volume)
-
-                        # Make sure the user goes to a menu
-                        try:
-                            return_menu(True, True) # Back to the return menu
-                        # If the menu does not satisfy the arguments, call the menu with none
-                        except TypeError:
-                            return_menu()
-                    
-                    # Take user to confirmation of deletion menu
-                    if delete_save_button.rect.collidepoint(event.pos):
-                        menu_forward.play()
-                        confirm_data_deletion()
-
-                    if narrator_volume_scroller.rect.collidepoint(event.pos):
-                        narrator_moving = True
-                    if sound_volume_scroller.rect.collidepoint(event.pos):
-                        sound_moving = True
-
-            if event.type == pygame.MOUSEMOTION: # If the mouse moves..
-                # If the narrator scroll is being moved and is within the boundaries, move it
-                if narrator_moving == True and LOWERBOUND <= narrator_volume_scroller.rect.x <= UPPERBOUND:
-                    narrator_volume_scroller.rect.move_ip(event.rel[0], 0)
-                    narrator_volume += (event.rel[0] / (2 * RANGE)) # Formula to change volume relative to movement
-
-                    # Keeps the volume at minimum if minimum and maximum if maximum 
-                    if narrator_volume >= 0.5:
-                        narrator_volume = 0.5
-                    if narrator_volume <= 0:
-                        narrator_volume = 0
-
-                    game.garbage_disposal([narrator_volume_number]) # Free the memory
-
-                    # Update the text so the user knows the volume has changed
-                    narrator_ui_volume = str(round(narrator_volume * 200)) 
-                    narrator_volume_number = Text(narrator_ui_volume, WIDTH//2.25, HEIGHT//2.75, 30)
-
-                    sounds.change_volume(narrator_sound_list, narrator_volume)
-
-                if sound_moving == True and LOWERBOUND <= sound_volume_scroller.rect.x <= UPPERBOUND:
-
-                    sound_volume_scroller.rect.move_ip(event.rel[0], 0)
-                    sound_volume += (event.rel[0] / (2 * RANGE))
-
-                    if sound_volume >= 0.5:
-                        sound_volume = 0.5
-                    if sound_volume <= 0:
-                        sound_volume = 0
-
-                    game.garbage_disposal([sound_volume_number])
-
-                    sound_ui_volume = str(round(sound_volume * 200))
-                    sound_volume_number = Text(sound_ui_volume, WIDTH//2.25, HEIGHT//2.75 + 150, 30)
-
-                    sounds.change_volume(sound_list, sound_volume) # Change the volume of all sounds
-
-            if event.type == pygame.MOUSEBUTTONUP: # If the mouse button is released..
-                # If the scroll is released and is beyond the boundaries, bring it back to the boundaries
-                if narrator_moving == True:
-                    if narrator_volume_scroller.rect.x < LOWERBOUND:
-                        narrator_volume_scroller.rect.x = LOWERBOUND
-                    if narrator_volume_scroller.rect.x > UPPERBOUND:
-                        narrator_volume_scroller.rect.x = UPPERBOUND
-
-                if sound_moving == True:
-                    if sound_volume_scroller.rect.x < LOWERBOUND:
-                        sound_volume_scroller.rect.x =  LOWERBOUND
-                    if sound_volume_scroller.rect.x > UPPERBOUND:
-                        sound_volume_scroller.rect.x = UPPERBOUND
-
-                narrator_moving = False
-                sound_moving = False
-
-        
+    def __init__(self, return_scene = None):
+        """Settings menu so the user can change features of the game."""
+        super().__init__()
+        self.return_scene = return_scene # The scene to go back to, which is the main menu if there isn't one
+
+    def enter(self):
+        """Positions every widget based on the current volume."""
+        self.narrator_moving = False
+        self.sound_moving = False
+
+        (self.settings_title, self.narrator_volume_text, self.sound_volume_text, self.delete_save_text,
+         self.button_to_hold_narrator_volume, self.button_to_hold_sound_volume,
+         self.delete_save_button, self.go_back_button) = settings_menu_widgets()
+
+        self.narrator_volume_number = Text(str(round(narrator_volume * 200)), WIDTH//2.25, HEIGHT//2.75, 30) # 0.5 in program = 100 in game
+        self.sound_volume_number = Text(str(round(sound_volume * 200)), WIDTH//2.25, HEIGHT//2.75 + 150, 30)
+
+        # Repositioned buttons to ensure that the volume sliding is not broken
+        self.narrator_volume_scroller = Button(volume_button, "", 50, 697 + ((2 * narrator_volume) * (1200 - 697)), HEIGHT//2.75, SQUARE_LENGTH, SQUARE_LENGTH * 1.5) # 697 = most left, 1200 = most right
+        self.sound_volume_scroller = Button(volume_button, "", 50, 697 + ((2 * sound_volume) * (1200 - 697)), HEIGHT//2.75 + 150, SQUARE_LENGTH, SQUARE_LENGTH * 1.5)
+
+        self.settings_button_group = pygame.sprite.Group()
+        self.settings_button_group.add(self.button_to_hold_narrator_volume, self.button_to_hold_sound_volume,
+                                       self.narrator_volume_scroller, self.sound_volume_scroller,
+                                       self.delete_save_button, self.go_back_button)
+
+        self.renderer = game.DirtyRenderer(self.settings_button_group) # Tracks the parts of the screen that change
+
+    def handle_event(self, event):
+        """Moves the volume scrollers and checks which button has been pressed."""
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                if self.go_back_button.rect.collidepoint(event.pos): # If the back button is pressed by the mouse...
+                    sounds.bank.play(menu_backward)
+
+                    # Make sure the user goes to a menu
+                    self.switch(self.return_scene if self.return_scene is not None else MainMenu())
+                    return
+
+                # Take user to confirmation of deletion menu
+                if self.delete_save_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_forward)
+                    self.switch(ConfirmDataDeletion(self))
+                    return
+
+                if self.narrator_volume_scroller.rect.collidepoint(event.pos):
+                    self.narrator_moving = True
+                if self.sound_volume_scroller.rect.collidepoint(event.pos):
+                    self.sound_moving = True
+
+        if event.type == pygame.MOUSEMOTION: # If the mouse moves..
+            # If the narrator scroll is being moved and is within the boundaries, move it
+            if self.narrator_moving and self.LOWERBOUND <= self.narrator_volume_scroller.rect.x <= self.UPPERBOUND:
+                self.narrator_volume_scroller.rect.move_ip(event.rel[0], 0)
+                volume = narrator_volume + (event.rel[0] / (2 * self.RANGE)) # Formula to change volume relative to movement
+
+                # Keeps the volume at minimum if minimum and maximum if maximum
+                if volume >= 0.5:
+                    volume = 0.5
+                if volume <= 0:
+                    volume = 0
+
+                settings.store.set("narrator_volume", volume) # Changes the volume of every narrator sound
+
+                self.renderer.mark(self.narrator_volume_number.rect) # The old number needs to be cleared
+
+                # Update the text so the user knows the volume has changed
+                self.narrator_volume_number = Text(str(round(narrator_volume * 200)), WIDTH//2.25, HEIGHT//2.75, 30)
+                self.renderer.mark(self.narrator_volume_number.rect)
+
+            if self.sound_moving and self.LOWERBOUND <= self.sound_volume_scroller.rect.x <= self.UPPERBOUND:
+                self.sound_volume_scroller.rect.move_ip(event.rel[0], 0)
+                volume = sound_volume + (event.rel[0] / (2 * self.RANGE))
+
+                if volume >= 0.5:
+                    volume = 0.5
+                if volume <= 0:
+                    volume = 0
+
+                settings.store.set("sound_volume", volume) # Changes the volume of all sounds
+
+                self.renderer.mark(self.sound_volume_number.rect)
+
+                self.sound_volume_number = Text(str(round(sound_volume * 200)), WIDTH//2.25, HEIGHT//2.75 + 150, 30)
+                self.renderer.mark(self.sound_volume_number.rect)
+
+        if event.type == pygame.MOUSEBUTTONUP: # If the mouse button is released..
+            # If the scroll is released and is beyond the boundaries, bring it back to the boundaries
+            if self.narrator_moving:
+                if self.narrator_volume_scroller.rect.x < self.LOWERBOUND:
+                    self.narrator_volume_scroller.rect.x = self.LOWERBOUND
+                if self.narrator_volume_scroller.rect.x > self.UPPERBOUND:
+                    self.narrator_volume_scroller.rect.x = self.UPPERBOUND
+
+            if self.sound_moving:
+                if self.sound_volume_scroller.rect.x < self.LOWERBOUND:
+                    self.sound_volume_scroller.rect.x = self.LOWERBOUND
+                if self.sound_volume_scroller.rect.x > self.UPPERBOUND:
+                    self.sound_volume_scroller.rect.x = self.UPPERBOUND
+
+            self.narrator_moving = False
+            self.sound_moving = False
+
+    def draw(self):
+        """Draws the settings menu."""
         game.generate_background(background2)
 
-        settings_title.update()
-        narrator_volume_text.update()
-        sound_volume_text.update()
-        delete_save_text.update()
-        narrator_volume_number.update()
-        sound_volume_number.update()
-
-        settings_button_group.update()
+        self.settings_title.update()
+        self.narrator_volume_text.update()
+        self.sound_volume_text.update()
+        self.delete_save_text.update()
+        self.narrator_volume_number.update()
+        self.sound_volume_number.update()
 
-        game.update_state()
+        self.settings_button_group.update()
 
-def confirm_data_deletion():
-    """Menu for confirming that the data should be deleted."""
+        return self.renderer.rects()
 
-    # Creating a see-through background
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((20, 20, 20))
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # EVENT LOOP
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            # If the user presses the left mouse button, check if they press a button
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    # If the user presses 'no', go back to the settings menu
-                    if no_button.rect.collidepoint(event.pos):
-                        menu_backward.play()
-                        settings_menu()
-                    # If the user presses 'yes', reset all the data in the game and the file and go back to the settings menu
-                    if yes_button.rect.collidepoint(event.pos):
-                        reset_levels(list_of_levels)
-                        game.update_file("gamedata.txt", get_unlocked_level_number(list_of_levels))
-                        menu_forward.play()
-                        settings_menu()
+class ConfirmDataDeletion(Scene):
+    capped = False # Not limiting the frame rate creates the fade out effect
 
+    def __init__(self, settings_scene):
+        """Menu for confirming that the data should be deleted."""
+        super().__init__()
+        self.settings_scene = settings_scene # The settings menu to go back to
+        self.warning_text, self.yes_button, self.no_button, self.data_deletion_group = data_deletion_widgets()
+
+        # Creating a see-through background
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((20, 20, 20))
+        self.overlay_rect = self.overlay.get_rect(topleft = (0, 0))
+
+    def handle_event(self, event):
+        """Checks if the user has pressed 'yes' or 'no'."""
+        # If the user presses the left mouse button, check if they press a button
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                # If the user presses 'no', go back to the settings menu
+                if self.no_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_backward)
+                    self.switch(self.settings_scene)
+                # If the user presses 'yes', reset all the data in the game and the file and go back to the settings menu
+                elif self.yes_button.rect.collidepoint(event.pos):
+                    reset_levels(level_buttons())
+                    save_progress()
+                    sounds.bank.play(menu_forward)
+                    self.switch(self.settings_scene)
+
+    def draw(self):
+        """Fades the warning in over the settings menu."""
         # Update the background
-        overlay.set_alpha(2) # 7 -> 2
-        screen.blit(overlay, overlay_rect)
+        self.overlay.set_alpha(2) # 7 -> 2
+        screen.blit(self.overlay, self.overlay_rect)
 
         # Update GUI
-        warning_text.update()
-        data_deletion_group.update()
+        self.warning_text.update()
+        self.data_deletion_group.update()
 
-        pygame.display.update() # Use this and don't update FPS - Updating FPS creates fade out effect
+class LevelSelection(Scene):
+    def __init__(self):
+        """Gets the widgets of the level selection menu, building them if this is the first visit."""
+        super().__init__()
+        self.title, self.go_back_button, self.button_group = level_selection_widgets()
+
+    def enter(self):
+        """Generates the level selection menu where the user can select a level to play."""
+        self.renderer = game.DirtyRenderer(self.button_group) # Tracks the parts of the screen that change
+
+    def handle_event(self, event):
+        """Checks which level has been selected."""
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                if self.go_back_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_backward)
+                    self.switch(MainMenu())
+                    return
+                # For each level that exists in the menu, check if the player has pressed it
+                for level in self.button_group:
+                    if isinstance(level, Level):
+                        level_scene = level.go_to_level(event.pos)
+                        if level_scene is not None:
+                            self.switch(level_scene)
+                            return
+
+        # TEST CODE - DELETE WHEN USED
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_u:
+                get_unlocked_level_number(level_buttons())
+            if event.key == pygame.K_l:
+                reset_levels(level_buttons())
+
+    def draw(self):
+        """Draws the level selection menu."""
+        game.generate_background(background4)
 
-def level_selection():
-    """Generates the level selection menu where the user can select a level to play."""
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if go_back_button_2.rect.collidepoint(event.pos):
-                        game.garbage_disposal([level_selection_title, level_selection_button_group])
-                        menu_backward.play()
-                        main_menu()
-                    # For each level that exists in the menu, check if the player has pressed it
-                    for level in level_selection_button_group:
-                        if isinstance(level, Level):
-                            level.go_to_level(event.pos)
-
-            # TEST CODE - DELETE WHEN USED
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_u:
-                    get_unlocked_level_number(list_of_levels)
-                if event.key == pygame.K_l:
-                    reset_levels(list_of_levels)
+        self.title.update()
 
-        game.generate_background(background4)
+        self.button_group.update()
 
-        level_selection_title.update()
+        return self.renderer.rects()
 
-        level_selection_button_group.update()
+class WinMenu(Scene):
+    capped = False # So that there is no animation
 
-        game.update_state()
+    def __init__(self, number: int, rng = random):
+        """Generates the win menu for the level with the given number."""
+        super().__init__()
+        self.number = number
+        self.random = rng # Decides if a voice line is played
+
+        self.transparent = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Background with editable transparency
+        self.transparent.fill((100, 100, 0)) # Yellow background - BLACK DID NOT WORK :(
+        self.transparent_rect = self.transparent.get_rect(topleft=(0, 0))
+        self.win_menu_sound = None
+        self.win_title, self.win_shadow, self.next_level_button, self.go_back_to_levels_button, self.win_buttons = win_menu_widgets()
+
+    def enter(self):
+        """Plays the win sounds and unlocks the next level."""
+        player_move_sound.stop() # Fixes bug with win sound not playing sometimes
+        sounds.bank.play(win_sound) # Plays a random winning narrator sound
+
+        # 20% to play a random winning narration sound
+        if self.random.randint(0, 4) == 3:
+            self.win_menu_sound = sounds.bank.get(self.random.choice(sounds.win_state_sounds))
+            self.win_menu_sound.set_volume(narrator_volume)
+            sounds.bank.play(self.win_menu_sound) # Plays a random winning narration sound
+
+        # Unlocks the next level, if there is one
+        list_of_levels = level_buttons()
+        if self.number < len(list_of_levels):
+            list_of_levels[self.number].unlock()
+
+        save_progress() # Write how many levels are unlocked
+
+    def handle_event(self, event):
+        """Checks if the user wants to go to the next level or back to the level selection."""
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                # Transport player to next level if they want to.
+                if self.next_level_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_forward)
+
+                    # Stops any sounds from overlapping
+                    if self.win_menu_sound is not None:
+                        self.win_menu_sound.stop()
+
+                    # Go to the level selection if a new level isn't available
+                    if self.number < len(level_buttons()):
+                        self.switch(play_level(self.number + 1))
+                    else:
+                        self.switch(LevelSelection())
 
-def win_menu(level):
-    """Generates the win menu.""" 
-    transparent = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Background with editable transparency
-    transparent.fill((100, 100, 0)) # Yellow background - BLACK DID NOT WORK :(
-    transparent_rect = transparent.get_rect(topleft=(0, 0))
+                # Go back to level selection if you press the right button
+                elif self.go_back_to_levels_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_backward)
+                    self.switch(LevelSelection())
 
-    player_move_sound.stop() # Fixes bug with win sound not playing sometimes
-    win_sound.play() # Plays a random winning narrator sound
+    def draw(self):
+        """Fades the win menu in over the level."""
+        self.transparent.set_alpha(1)
+        screen.blit(self.transparent, self.transparent_rect)
 
-    # 20% to play a random winning narration sound
-    if random.randint(0, 4) == 3:
-        win_menu_sound = pygame.mixer.Sound(random.choice(sounds.win_state_sounds))
-        win_menu_sound.set_volume(narrator_volume)
-        win_menu_sound.play() # Plays a random winning narration sound
-    
-    level_to = str(level.__name__).split("_") # Gets the name of the level into a list
-    level_to[1] = str(int(level_to[1]) + 1) # Adds one to the number in the level name
-    next_level_name = "_".join(level_to) # Puts the level name back all together
-    next_level = globals().get(next_level_name) # Turns the string into a function
+        self.win_buttons.update()
+        self.win_shadow.update()
+        self.win_title.update()
 
-    level_button =  f'{next_level_name}_button' # The next level's name relative to the naming scheme
+class PauseMenu(Scene):
+    capped = False # A still background is required
 
-    try:
-        globals().get(level_button).locked = False # Unlocks the level
-    # Don't unlock the level if the level doesn't exist
-    except AttributeError:
-        pass
+    def __init__(self, level: LevelScene):
+        """Want to pause the game? This scene does that."""
+        super().__init__()
+        self.level = level # The level to go back to
 
-    game.update_file("gamedata.txt", get_unlocked_level_number(list_of_levels)) # Write how many levels are unlocked
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
+        self.overlay.fill((10, 10, 10)) # Grey
+        self.overlay_rect = self.overlay.get_rect(topleft = (0, 0))
+        self.pause_title, self.resume_button, self.settings_button, self.to_level_select_button, self.pause_group = pause_menu_widgets()
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    # Transport player to next level if they want to.
-                    if next_level_button.rect.collidepoint(event.pos):
-                        menu_forward.play()
-
-                        # Try to stop the sound if it is defined
-                        try:
-                            win_menu_sound.stop() # Stops any sounds from overlapping
-                        except UnboundLocalError:
-                            pass
-                        
-                        # Go to the level selection if a new level isn't available
-                        try:
-                            next_level()
-                        except TypeError:
-                            level_selection()
-
-                    # Go back to level selection if you press the right button
-                    if go_back_to_levels_button.rect.collidepoint(event.pos):
-                        menu_backward.play()
-                        level_selection()
-
-        transparent.set_alpha(1)
-        screen.blit(transparent, transparent_rect)
-
-        win_buttons.update()
-        win_shadow.update()
-        win_title.update()
-
-        pygame.display.update() # So that there is no animation - DO NOT USE game.update_state()
-
-def pause_menu(level):
-    """Want to pause the game? This procedure does that."""
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) # Overlays the level translucent
-    overlay.fill((10, 10, 10)) # Grey
-    overlay_rect = overlay.get_rect(topleft = (0, 0))
-
-    # Event loop:
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.terminate()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    if to_level_select_button.rect.collidepoint(event.pos):
-                        menu_backward.play()
-                        level_selection()
-                    if settings_button.rect.collidepoint(event.pos):
-                        menu_forward.play()
-                        settings_menu(level)
-                    if resume_button.rect.collidepoint(event.pos):
-                        menu_backward.play()
-                        level(True, False) # Load the level back in but do not instantly pause it
-
-        # Add the background#
-        overlay.set_alpha(7) # Sets the alpha value - How translucent is it????
-        screen.blit(overlay, overlay_rect)
+    def enter(self):
+        """Puts the paused level back behind the menu."""
+        self.level.draw()
 
-        # Update the screen with GUI elements
-        pause_title.update()
-        pause_group.update()
+        # Fixes the flashing bug
+        self.overlay.set_alpha(10)
+        screen.blit(self.overlay, self.overlay_rect)
+
+    def handle_event(self, event):
+        """Checks which button has been pressed."""
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                if self.to_level_select_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_backward)
+                    self.switch(LevelSelection())
+                elif self.settings_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_forward)
+                    self.switch(SettingsMenu(self))
+                elif self.resume_button.rect.collidepoint(event.pos):
+                    sounds.bank.play(menu_backward)
+                    self.switch(self.level) # Load the level back in but do not instantly pause it
+
+    def draw(self):
+        """Fades the pause menu in over the level."""
+        # Add the background
+        self.overlay.set_alpha(7) # Sets the alpha value - How translucent is it????
+        screen.blit(self.overlay, self.overlay_rect)
 
-        # DO NOT USE game.upadte_state() - A still background is required
-        pygame.display.update()
-        #game.update_state()
+        # Update the screen with GUI elements
+        self.pause_title.update()
+        self.pause_group.update()
 
 # ----------------------------------------------------------------------- #
 
 # This is the main file
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    create_app(report="--startup-report" in sys.argv) # 'python main.py --startup-report' prints how long starting took
+
+    # 'python main.py --profile' shows the profiler overlay, which can also be shown with F3
+    if "--profile" in sys.argv:
+        profiler.toggle_overlay()
+
+    # 'python main.py --record replays' saves every finished attempt at a level into the replays folder
+    if "--record" in sys.argv and sys.argv.index("--record") + 1 < len(sys.argv):
+        recording_folder = sys.argv[sys.argv.index("--record") + 1]
+
+    # 'python main.py --trace trace.json' saves the time taken by every frame when the game closes, as JSON or CSV
+    if "--trace" in sys.argv and sys.argv.index("--trace") + 1 < len(sys.argv):
+        profiler.dump_at_exit(sys.argv[sys.argv.index("--trace") + 1])
+
+    run(MainMenu())
@@ -0,0 +1,177 @@
+# Python file for timing where each frame goes
+
+import csv
+import json
+import time
+import atexit
+import pygame
+import assets
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+HISTORY = 600 # Frames kept, which is 10 seconds at 60 frames per second
+OVERLAY_REFRESH = 0.25 # Seconds between redrawing the numbers on the overlay, so they can be read
+OVERLAY_FONT_SIZE = 20
+OVERLAY_COLOUR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 170) # See-through black behind the numbers
+
+# Timer handed out while the profiler is off, so timing costs next to nothing
+NO_TIMER = nullcontext()
+
+def percentile(values: list, percent: float) -> float:
+    """Returns the value that percent of the sorted values are at or below."""
+    if not values:
+        return 0.0
+    index = round(percent / 100 * (len(values) - 1))
+    return values[index]
+
+class Profiler():
+    def __init__(self, history: int = HISTORY):
+        """
+        Times the phases of each frame, such as handling events, updating and drawing, for the most recent frames.
+
+        Phases can be inside each other, so drawing includes the background, and a phase that happens
+        more than once in a frame, like a tick, is added up. Nothing is timed while the profiler is off.
+        """
+        self.enabled = False
+        self.overlay = False # Whether the numbers are drawn on top of the game
+        self.frames = deque(maxlen=history) # (frame time, {phase: seconds}) of the most recent frames
+        self.phases = {} # Phase -> seconds spent on it so far this frame
+        self.frame_start = None
+
+        # The overlay is only redrawn every so often
+        self.overlay_image = None
+        self.overlay_drawn = 0
+        self.full_update = False # Whether all of the screen has to be updated to get rid of the overlay
+
+    def reset(self, history: int = None):
+        """Forgets every frame that has been timed, optionally keeping a different number of frames from now on."""
+        self.frames = deque(maxlen=history if history is not None else self.frames.maxlen)
+        self.phases = {}
+        self.frame_start = None
+
+    def phase(self, name: str):
+        """Returns a context manager that adds the time spent inside it to a phase of the current frame."""
+        if not self.enabled:
+            return NO_TIMER
+        return self.timer(name)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Times a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def end_frame(self):
+        """Finishes the current frame, which is timed from the end of the last one."""
+        now = time.perf_counter()
+        if self.enabled and self.frame_start is not None:
+            self.frames.append((now - self.frame_start, self.phases))
+        self.phases = {}
+        self.frame_start = now
+
+    def toggle_overlay(self):
+        """Shows or hides the overlay, timing frames while it is shown."""
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.enabled
+        self.overlay_image = None
+        self.full_update = not self.overlay
+
+    def handle_event(self, event):
+        """F3 shows or hides the overlay and F4 saves what has been timed so far."""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                self.toggle_overlay()
+            if event.key == pygame.K_F4:
+                self.dump(f"profile_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+
+    def phase_names(self) -> list:
+        """Returns every phase that has been timed, in the order they were first seen."""
+        names = {}
+        for _, phases in self.frames:
+            for name in phases:
+                names[name] = None
+        return list(names)
+
+    def stats(self) -> dict:
+        """Returns the frames per second and the p50 and p99 of the frame time and each phase, in milliseconds."""
+        frame_times = sorted(frame_time for frame_time, _ in self.frames)
+        total = sum(frame_times)
+        stats = {"frames": len(frame_times),
+                 "fps": len(frame_times) / total if total else 0.0,
+                 "p50": percentile(frame_times, 50) * 1000,
+                 "p99": percentile(frame_times, 99) * 1000,
+                 "phases": {}}
+
+        for name in self.phase_names():
+            # Frames where a phase didn't happen spent no time on it
+            times = sorted(phases.get(name, 0.0) for _, phases in self.frames)
+            stats["phases"][name] = {"mean": sum(times) / len(times) * 1000,
+                                     "p50": percentile(times, 50) * 1000,
+                                     "p99": percentile(times, 99) * 1000}
+
+        return stats
+
+    def dump(self, path: str):
+        """Saves every frame that has been kept, as JSON if the path ends in '.json' and as CSV otherwise."""
+        names = self.phase_names()
+
+        if path.endswith(".json"):
+            trace = {"stats": self.stats(),
+                     "frames": [{"frame_ms": frame_time * 1000,
+                                 "phases_ms": {name: seconds * 1000 for name, seconds in phases.items()}}
+                                for frame_time, phases in self.frames]}
+            with open(path, "w") as trace_file:
+                json.dump(trace, trace_file, indent=4)
+            return
+
+        with open(path, "w", newline="") as trace_file:
+            writer = csv.writer(trace_file)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in names])
+            for index, (frame_time, phases) in enumerate(self.frames):
+                writer.writerow([index, f"{frame_time * 1000:.3f}"] +
+                                [f"{phases.get(name, 0.0) * 1000:.3f}" for name in names])
+
+    def dump_at_exit(self, path: str):
+        """Times every frame and saves them when the game closes."""
+        self.enabled = True
+        atexit.register(self.dump, path)
+
+    def draw(self, surface: pygame.Surface) -> pygame.Rect:
+        """Draws the overlay in the top left corner, returning the part of the surface it covers."""
+        now = time.perf_counter()
+        if self.overlay_image is None or now - self.overlay_drawn >= OVERLAY_REFRESH:
+            self.overlay_image = self.render()
+            self.overlay_drawn = now
+
+        return surface.blit(self.overlay_image, (0, 0))
+
+    def render(self) -> pygame.Surface:
+        """Puts the current numbers onto a see-through panel."""
+        stats = self.stats()
+        lines = [f"{stats['fps']:.0f} FPS   p50 {stats['p50']:.2f} ms   p99 {stats['p99']:.2f} ms"]
+        for name, phase in stats["phases"].items():
+            lines.append(f"{name}: {phase['p50']:.2f} / {phase['p99']:.2f} ms")
+
+        # The numbers change all the time, so they are rendered directly instead of going through the text cache
+        font = assets.load_font(None, OVERLAY_FONT_SIZE)
+        images = [font.render(line, True, OVERLAY_COLOUR) for line in lines]
+
+        padding = 6
+        width = max(image.get_width() for image in images) + padding * 2
+        height = sum(image.get_height() for image in images) + padding * 2
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+
+        y = padding
+        for image in images:
+            panel.blit(image, (padding, y))
+            y += image.get_height()
+
+        return panel
+
+# Profiler shared by the whole game
+profiler = Profiler()
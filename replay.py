@@ -0,0 +1,139 @@
+# Python file for recording the keys pressed in a level and playing them back
+
+import os
+import sys
+import time
+import struct
+import levels
+from os.path import join
+from typing import NamedTuple
+
+# Layout of a replay file: a header followed by one entry per key press, all little-endian
+MAGIC = b"LPRP"
+REPLAY_VERSION = 2
+HEADER = struct.Struct("<4sBHqIBI") # Magic, version, level, seed, frames played, result, number of key presses
+OLD_HEADERS = {1: struct.Struct("<4sBHIIBI")} # Earlier versions that can still be read, which only held 32 bit seeds
+SEED_RANGE = range(-2 ** 63, 2 ** 63) # Seeds that fit in a replay
+PRESS = struct.Struct("<IB") # Frame the key was pressed before, index of the key in KEY_ORDER
+
+KEY_ORDER = "WASD"
+RESULTS = (None, "won", "lost") # Stored as their index, so 0 is an attempt that didn't finish
+
+class Recording(NamedTuple):
+    """Everything needed to play an attempt at a level again exactly as it happened."""
+    number: int # Level that was played
+    seed: int # Seed the level was played with
+    inputs: tuple # (frame, key) of every key press, where the key is one of 'W', 'A', 'S' or 'D'
+    frames: int = 0 # Frames that were played
+    result: str = None # 'won', 'lost' or None if the attempt didn't finish
+
+def save(recording: Recording, path: str):
+    """Writes a recording to a file, which takes 5 bytes for each key press."""
+    if recording.seed not in SEED_RANGE:
+        raise ValueError(f"Seed {recording.seed} is too big to be saved in a replay, which holds 64 bit seeds.")
+
+    data = bytearray(HEADER.pack(MAGIC, REPLAY_VERSION, recording.number, recording.seed,
+                                 recording.frames, RESULTS.index(recording.result), len(recording.inputs)))
+    for frame, key in recording.inputs:
+        data += PRESS.pack(frame, KEY_ORDER.index(key))
+
+    with open(path, "wb") as replay_file:
+        replay_file.write(data)
+
+def load(path: str) -> Recording:
+    """Reads a recording from a file."""
+    with open(path, "rb") as replay_file:
+        data = replay_file.read()
+
+    if len(data) < 5 or data[:4] != MAGIC:
+        raise ValueError(f"'{path}' is not a replay.")
+
+    version = data[4]
+    header = HEADER if version == REPLAY_VERSION else OLD_HEADERS.get(version)
+    if header is None:
+        raise ValueError(f"'{path}' is from version {version} of the replay format, which can't be read.")
+    if len(data) < header.size:
+        raise ValueError(f"'{path}' is too short to be a replay.")
+
+    _, _, number, seed, frames, result, count = header.unpack_from(data)
+    if len(data) != header.size + count * PRESS.size:
+        raise ValueError(f"'{path}' should have {count} key presses but is the wrong length.")
+
+    inputs = tuple((frame, KEY_ORDER[key]) for frame, key in PRESS.iter_unpack(data[header.size:]))
+    return Recording(number, seed, inputs, frames, RESULTS[result])
+
+def record(state, result: str = None) -> Recording:
+    """Makes a recording of the attempt that a level state has played so far."""
+    return Recording(state.data.number, state.seed, tuple(state.inputs), state.frame, result)
+
+def save_attempt(state, result: str, folder: str) -> str:
+    """Saves a finished attempt into a folder, returning where it was saved."""
+    os.makedirs(folder, exist_ok=True)
+    path = join(folder, f"level_{state.data.number}_{time.strftime('%Y%m%d_%H%M%S')}_{state.seed}.replay")
+    save(record(state, result), path)
+    return path
+
+def play(recording: Recording):
+    """Plays a recording back as fast as possible without a display, returning the result and the frames played."""
+    import simulation # Only imported here, so that a real-time replay can open a window first
+
+    return simulation.simulate(recording.number, recording.inputs, max(recording.frames, 1), recording.seed)
+
+def watch(recording: Recording):
+    """Plays a recording back in a window at the normal speed, closing the game once it is over."""
+    import main
+    import game
+    import pygame
+
+    keys = {letter: key for key, letter in main.MOVEMENT_KEYS.items()}
+
+    class ReplayScene(main.LevelScene):
+        def __init__(self):
+            """A level that presses the recorded keys itself and ignores the keyboard."""
+            super().__init__(levels.load_level(recording.number), recording.seed)
+            self.presses = {}
+            for frame, key in recording.inputs:
+                self.presses.setdefault(frame, []).append(key)
+
+        def handle_event(self, event):
+            """Only lets the game be paused, as the keys come from the recording."""
+            if event.type != pygame.KEYDOWN:
+                super().handle_event(event)
+
+        def update(self):
+            """Presses the keys for this frame, then plays it, closing the game when the recording is over."""
+            for key in self.presses.get(self.state.frame, ()):
+                self.state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=keys[key]))
+
+            result = self.state.step()
+            if result is not None or self.state.frame >= recording.frames:
+                print(f"Level {recording.number}: {result or 'unfinished'} after {self.state.frame} frames")
+                game.terminate()
+
+    main.create_app()
+    main.run(ReplayScene())
+
+if __name__ == "__main__":
+    # 'python replay.py level_1.replay' checks that a replay plays out the same way it was recorded, as fast as possible
+    # 'python replay.py level_1.replay --real-time' shows it in a window instead
+    real_time = "--real-time" in sys.argv
+    paths = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+
+    if real_time:
+        watch(load(paths[0]))
+
+    mismatches = 0
+    for path in paths:
+        recording = load(path)
+        start = time.perf_counter()
+        result, frames = play(recording)
+        seconds = time.perf_counter() - start
+
+        print(f"{path}: {result or 'unfinished'} after {frames} frames ({frames / seconds:,.0f} frames per second)")
+
+        # A replay that plays out differently means the game no longer behaves the way it did when it was recorded
+        if (result, frames) != (recording.result, recording.frames):
+            mismatches += 1
+            print(f"    It was recorded as {recording.result or 'unfinished'} after {recording.frames} frames.")
+
+    sys.exit(1 if mismatches else 0)
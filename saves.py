@@ -0,0 +1,143 @@
+# Python file for saving and loading the data of the game
+
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from os.path import exists, dirname, abspath
+
+SAVE_FORMAT = "text" # 'text' for one value per line in a file per section, 'json' for everything in one file
+SAVE_FILE = "save.json" # Where everything is saved in the JSON format
+SAVE_VERSION = 1 # Changed whenever the JSON format changes
+
+# The file each section is saved in using the text format
+TEXT_FILES = {"progress": "gamedata.txt",
+              "settings": "volume.txt"}
+
+def write_atomic(path: str, contents: str):
+    """Writes a whole file in one go through a temporary file, so it is never left half written."""
+    folder = dirname(abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=folder, prefix=".save-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as temporary_file:
+            temporary_file.write(contents)
+        os.replace(temporary_path, path) # Swapping files is atomic, so the old file is kept if anything goes wrong
+    except OSError:
+        if exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+def convert(value, default):
+    """Converts a saved value to the type of its default, returning the default if it can't be converted."""
+    try:
+        return type(default)(value)
+    except (TypeError, ValueError):
+        return default
+
+class SaveManager():
+    def __init__(self, save_format: str = SAVE_FORMAT, save_file: str = SAVE_FILE, text_files: dict = TEXT_FILES):
+        """
+        Reads and writes the sections of saved data, such as the progress and the settings.
+
+        Every write replaces a whole file in a single pass. Inside a batch, writes are held back
+        and only made when the batch ends, so anything changed together is written together.
+        """
+        if save_format not in ("text", "json"):
+            raise ValueError(f"'{save_format}' is not a save format.")
+
+        self.save_format = save_format
+        self.save_file = save_file
+        self.text_files = text_files
+        self.sections = None # Every section that has been read or written, loaded the first time it is needed
+        self.unsaved = set() # Sections waiting to be written
+        self.batching = 0 # How many batches are open
+        self.lock = threading.RLock() # Settings are saved from a background thread
+
+    def load(self):
+        """Reads every section from the disk."""
+        self.sections = {}
+
+        if self.save_format == "json" and exists(self.save_file):
+            with open(self.save_file, "r") as save_file:
+                save_data = json.load(save_file)
+            if save_data.get("version") == SAVE_VERSION:
+                self.sections = save_data.get("sections", {})
+                return
+
+        # Text files are also read for the JSON format when there is no save yet, so old saves are kept
+        for section, path in self.text_files.items():
+            if exists(path):
+                with open(path, "r") as text_file:
+                    self.sections[section] = text_file.read().splitlines()
+
+    def read(self, section: str, defaults: dict) -> dict:
+        """Returns the saved values of a section, using the defaults for anything that has not been saved."""
+        with self.lock:
+            if self.sections is None:
+                self.load()
+            saved = self.sections.get(section)
+
+        values = dict(defaults)
+        if isinstance(saved, dict):
+            for name in defaults:
+                if name in saved:
+                    values[name] = convert(saved[name], defaults[name])
+        # Text files have one value per line, in the same order as the defaults
+        elif isinstance(saved, list):
+            for name, line in zip(defaults, saved):
+                values[name] = convert(line, defaults[name])
+
+            # Now that the lines have names, keep them so they can be saved in any format
+            with self.lock:
+                self.sections[section] = dict(values)
+
+        return values
+
+    def write(self, section: str, values: dict):
+        """Saves the values of a section, waiting until the end of the batch if there is one."""
+        with self.lock:
+            if self.sections is None:
+                self.load()
+            self.sections[section] = dict(values)
+            self.unsaved.add(section)
+
+            if not self.batching:
+                self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Holds back every write made inside the 'with' block and then writes them together."""
+        with self.lock:
+            self.batching += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batching -= 1
+                if not self.batching:
+                    self.flush()
+
+    def flush(self):
+        """Writes every section that is waiting to be written."""
+        with self.lock:
+            if not self.unsaved:
+                return
+
+            # Everything goes into one file
+            if self.save_format == "json":
+                save_data = {"version": SAVE_VERSION,
+                             "sections": {section: values for section, values in self.sections.items()
+                                          if isinstance(values, dict)}}
+                write_atomic(self.save_file, json.dumps(save_data, indent=4))
+
+            # One file per section, each written once
+            else:
+                for section in self.unsaved:
+                    values = self.sections[section]
+                    write_atomic(self.text_files[section], "".join(f"{value}\n" for value in values.values()))
+
+            self.unsaved.clear()
+
+# Saved data shared by the whole game
+manager = SaveManager()
@@ -0,0 +1,28 @@
+# Python file for the random numbers of the game, which can be made the same every time
+
+import random
+import secrets
+
+def stream(seed, *names) -> random.Random:
+    """
+    Returns a random number generator for one purpose, such as ('level', 3, 'enemy', 0).
+
+    With a seed, the same seed and names always give the same numbers, and different names give
+    numbers that don't affect each other, so one enemy can't change what another one does.
+    Without a seed, the numbers are different every time.
+    """
+    if seed is None:
+        return random.Random()
+
+    # Strings are hashed into the seed, which is the same on every computer and every run
+    return random.Random("/".join(str(part) for part in (seed,) + names))
+
+def new_seed() -> int:
+    """Returns an unpredictable seed, without touching the random module, so that whatever uses it can be repeated."""
+    return secrets.randbits(32)
+
+def derive(seed, *names):
+    """Returns a new whole number seed for one purpose, or None if there is no seed."""
+    if seed is None:
+        return None
+    return stream(seed, *names).getrandbits(32)
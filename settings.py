@@ -0,0 +1,109 @@
+# Python file for storing the settings of the game
+
+import threading
+import weakref
+import saves
+
+SAVE_DELAY = 0.5 # Seconds to wait after a change before saving, so dragging a slider only saves once
+
+# Every setting in the order they are saved in, with the value used if the file has none
+DEFAULTS = {"narrator_volume": 0.5,
+            "sound_volume": 0.5}
+
+class Settings():
+    def __init__(self, section: str = "settings", defaults: dict = DEFAULTS, save_delay: float = SAVE_DELAY):
+        """
+        Holds the settings of the game in memory, only reading the save the first time a setting is needed.
+
+        Anything that cares about a setting can subscribe to be told when it changes.
+        Changes are saved to the file in the background once they have stopped for a moment.
+        """
+        self.section = section # Which section of the save the settings are kept in
+        self.defaults = dict(defaults)
+        self.save_delay = save_delay
+        self.values = None # Loaded the first time they are needed
+        self.subscribers = [] # Weak references to callbacks, so subscribing never keeps anything alive
+        self.lock = threading.Lock()
+        self.timer = None # Waits to save the settings
+        self.unsaved = False
+
+    def load(self):
+        """Reads the settings from the save, falling back on the defaults for anything missing."""
+        self.values = saves.manager.read(self.section, self.defaults)
+
+    def get(self, name: str) -> float:
+        """Returns the value of a setting."""
+        if self.values is None:
+            self.load()
+        return self.values[name]
+
+    def set(self, name: str, value: float):
+        """Changes a setting, telling every subscriber and saving it soon after."""
+        if self.get(name) == value:
+            return
+
+        with self.lock:
+            self.values[name] = value
+            self.unsaved = True
+
+        self.notify(name, value)
+        self.save_later()
+
+    def subscribe(self, callback):
+        """Calls callback(name, value) whenever a setting changes, until the callback no longer exists."""
+        # Methods need a WeakMethod, otherwise the reference would die as soon as it is made
+        # Each reference forgets itself once its callback is deleted, even if no setting ever changes
+        if hasattr(callback, "__self__"):
+            self.subscribers.append(weakref.WeakMethod(callback, self.forget))
+        else:
+            self.subscribers.append(weakref.ref(callback, self.forget))
+
+    def forget(self, reference):
+        """Drops the reference to a callback that has been deleted."""
+        # A new list is made, so a notify() that is going through the old one isn't affected
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber is not reference]
+
+    def unsubscribe(self, callback):
+        """Stops telling a callback about changes."""
+        self.subscribers = [reference for reference in self.subscribers if reference() not in (None, callback)]
+
+    def notify(self, name: str, value: float):
+        """Tells every subscriber that a setting has changed."""
+        alive = []
+        for reference in self.subscribers:
+            callback = reference()
+            # Forget about anything that has been deleted
+            if callback is not None:
+                callback(name, value)
+                alive.append(reference)
+        self.subscribers = alive
+
+    def save_later(self):
+        """Saves the settings once they have not changed for the save delay."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.save_delay, self.save)
+            self.timer.daemon = True # Never stop the game from closing
+            self.timer.start()
+
+    def save(self):
+        """Writes the settings to the save."""
+        with self.lock:
+            self.timer = None
+            if not self.unsaved:
+                return
+            values = dict(self.values)
+            self.unsaved = False
+
+        saves.manager.write(self.section, values)
+
+    def flush(self):
+        """Saves any changes straight away instead of waiting."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+        self.save()
+
+# Settings shared by the whole game
+store = Settings()
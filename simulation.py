@@ -0,0 +1,170 @@
+# Python file for playing levels without a display
+
+import os
+import sys
+import time
+import pygame
+import main
+import config
+import enemy
+import levels
+import seeds
+
+# Keys the player can press
+KEYS = {"W": pygame.K_w,
+        "A": pygame.K_a,
+        "S": pygame.K_s,
+        "D": pygame.K_d}
+
+# Change in (column, row) for each key
+STEPS = {"W": (0, -1),
+         "A": (-1, 0),
+         "S": (0, 1),
+         "D": (1, 0)}
+
+def headless():
+    """
+    Gives SDL drivers that show and play nothing, unless other drivers have been chosen already.
+
+    Processes started afterwards inherit them. This happens as soon as this file is imported,
+    so every tool that plays levels through it needs no window or speakers.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+headless()
+
+class Simulation():
+    def __init__(self, number: int, seed: int = None):
+        """
+        Plays a level frame by frame without drawing anything or waiting between frames.
+
+        Keys are pressed by calling press() before step(), just like a key press arriving before a frame.
+        With a seed, the same key presses always give the same result.
+        """
+        main.create_app(display=False)
+        self.number = number
+        self.state = main.LevelState(levels.load_level(number), seed)
+        self.result = None # WON or LOST once the level is over
+
+    @property
+    def frame(self) -> int:
+        """How many frames have been played."""
+        return self.state.frame
+
+    def press(self, key: str):
+        """Presses one of 'W', 'A', 'S' or 'D'."""
+        self.state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=KEYS[key.upper()]))
+
+    def step(self):
+        """Plays a single frame, returning WON or LOST if the level ended on it."""
+        if self.result is None:
+            self.result = self.state.step()
+        return self.result
+
+    def run(self, inputs = (), max_frames: int = 3600):
+        """
+        Plays until the level is over or max_frames have been played, returning the result.
+
+        Inputs are (frame, key) pairs, where the key is pressed just before that frame is played.
+        """
+        presses = {}
+        for frame, key in inputs:
+            presses.setdefault(frame, []).append(key)
+
+        while self.result is None and self.frame < max_frames:
+            for key in presses.get(self.frame, ()):
+                self.press(key)
+            self.step()
+
+        return self.result
+
+def simulate(number: int, inputs = (), max_frames: int = 3600, seed: int = None):
+    """Plays a level without a display, returning the result and how many frames it took."""
+    simulation = Simulation(number, seed)
+    result = simulation.run(inputs, max_frames)
+    return result, simulation.frame
+
+def compare(number: int, seed: int, max_frames: int = 3600, key_interval: int = 12):
+    """
+    Plays a level with its dynamic enemies as sprites and again as a swarm, pressing the same random keys in both.
+
+    Returns the first frame on which an enemy is somewhere different or the levels end differently, or None if they agree.
+    """
+    data = levels.load_level(number)
+    sprites = main.LevelState(data._replace(swarm=False), seed)
+    swarmed = main.LevelState(data._replace(swarm=True), seed)
+    rng = seeds.stream(seed, "compare", "player")
+
+    for frame in range(max_frames):
+        if frame % key_interval == 0:
+            key = rng.choice("WASD")
+            for state in (sprites, swarmed):
+                state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=KEYS[key]))
+
+        results = (sprites.step(), swarmed.step())
+        positions = [thing.rect.topleft for thing in sprites.enemies if isinstance(thing, enemy.Enemy.Dynamic)]
+        if results[0] != results[1] or positions != list(zip(swarmed.swarm.x.tolist(), swarmed.swarm.y.tolist())):
+            return sprites.frame
+        if results[0] is not None:
+            break
+
+    return None
+
+def stress(count: int, ticks: int, number: int = 8):
+    """Fills the open tiles of a level with a swarm of enemies of every style and reports how quickly it moves them."""
+    import swarm # Needs NumPy, so it is only imported when it is used
+
+    data = levels.load_level(number)
+    tile_map = levels.load_tile_map(data.walls)
+    open_tiles = [(column, row) for column in range(tile_map.columns) for row in range(tile_map.rows)
+                  if (column, row) not in tile_map.blocked]
+
+    enemies = []
+    for index in range(count):
+        column, row = open_tiles[index % len(open_tiles)]
+        enemies.append((column * config.SQUARE_LENGTH, row * config.SQUARE_LENGTH,
+                        3 + index % 4, index % 30, list(swarm.STYLES)[index % len(swarm.STYLES)]))
+    enemy_swarm = swarm.Swarm(tile_map, enemies, seed=0)
+
+    # The player stands still on its starting tile
+    player = pygame.Rect(data.player[0] * config.SQUARE_LENGTH, data.player[1] * config.SQUARE_LENGTH,
+                         config.SQUARE_LENGTH, config.SQUARE_LENGTH)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        enemy_swarm.step(player)
+    seconds = time.perf_counter() - start
+    print(f"{count} enemies: {ticks / seconds:,.0f} ticks per second ({count * ticks / seconds:,.0f} enemy updates per second)")
+
+if __name__ == "__main__":
+    # 'python simulation.py --swarm 1000' moves a swarm of 1000 enemies instead of playing the levels
+    if len(sys.argv) > 2 and sys.argv[1] == "--swarm":
+        stress(int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 600)
+        sys.exit()
+
+    # 'python simulation.py --compare 50' checks that swarms move like sprites on every level with dynamic enemies
+    if len(sys.argv) > 1 and sys.argv[1] == "--compare":
+        seed_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        differences = 0
+        for number in range(1, levels.level_count() + 1):
+            if not any(enemy_data.type == "dynamic" for enemy_data in levels.load_level(number).enemies):
+                continue
+            frames = {seed: compare(number, seed) for seed in range(seed_count)}
+            differing = {seed: frame for seed, frame in frames.items() if frame is not None}
+            if differing:
+                seed, frame = min(differing.items(), key=lambda item: item[1])
+                print(f"Level {number}: differs with {len(differing)} of {seed_count} seeds, first on frame {frame} with seed {seed}")
+            else:
+                print(f"Level {number}: sprites and swarm agree with all {seed_count} seeds")
+            differences += len(differing)
+        sys.exit(1 if differences else 0)
+
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3600 # Frames to play each level for
+
+    # Plays every level with nobody pressing anything and reports how quickly it was simulated
+    for number in range(1, levels.level_count() + 1):
+        start = time.perf_counter()
+        result, played = simulate(number, max_frames=frames)
+        seconds = time.perf_counter() - start
+        print(f"Level {number}: {result or 'unfinished'} after {played} frames ({played / seconds:,.0f} frames per second)")
@@ -0,0 +1,193 @@
+# Python file for proving that levels can be won and finding the quickest way to win them
+
+import os
+import sys
+import time
+import heapq
+import argparse
+import pygame
+import main
+import enemy
+import config
+import levels
+import replay
+from simulation import KEYS, STEPS # Importing simulation also means nothing is shown or heard
+from itertools import count
+from typing import NamedTuple
+
+FRAMES = 3600 # Frames a solution can take before the search gives up on it, which is a minute of play
+WAIT = None # Action that presses nothing for a frame
+
+class Solution(NamedTuple):
+    """What a search of a level found."""
+    number: int # Level that was searched
+    seed: int # Seed the level was played with, as random enemies only move the same way with the same seed
+    inputs: tuple # (frame, key) of every key press in the quickest win, or None if there is no way to win
+    frames: int # Frames the quickest win takes, or 0 if there isn't one
+    explored: int # Moments in the level that were played on from
+    complete: bool # Whether every way of playing was tried, rather than some being cut off by the frame limit
+
+    @property
+    def solved(self) -> bool:
+        return self.inputs is not None
+
+def timed(state: main.LevelState) -> bool:
+    """
+    Checks if the level plays differently depending on how long it has been going.
+
+    Random enemies use up their random numbers as time goes on, so the same positions at
+    different times aren't the same moment. Everything else only depends on where things are.
+    """
+    styles = [thing.style for thing in state.enemies if isinstance(thing, enemy.Enemy.Dynamic)]
+    if state.swarm is not None:
+        styles += [data.style.lower() for data in state.data.enemies if data.type == "dynamic"]
+    return any(style != "seek" for style in styles)
+
+def state_key(state: main.LevelState, with_frame: bool) -> tuple:
+    """
+    Returns what the level looks like while the player is standing still, leaving out anything that doesn't
+    change how it plays, such as animations. Two moments with the same key play out the same way from then on.
+    """
+    player = state.player
+    key = [player.rect.topleft]
+    for thing in state.enemies:
+        if isinstance(thing, enemy.Enemy.Dynamic):
+            key.append((thing.rect.topleft, thing.dx, thing.dy, thing.current_frame, thing.moving, thing.since_movement,
+                        thing.player_position, thing.burst_count, thing.burst_direction, thing.burst_complete))
+
+    if state.swarm is not None:
+        swarm = state.swarm
+        key.append(b"".join(array.tobytes() for array in (swarm.x, swarm.y, swarm.dx, swarm.dy, swarm.current_frame,
+                                                         swarm.moving, swarm.since_movement, swarm.player_x, swarm.player_y,
+                                                         swarm.burst_count, swarm.burst_direction)))
+
+    if with_frame:
+        key.append(state.frame)
+    return tuple(key)
+
+def play(state: main.LevelState, action: str):
+    """
+    Presses a key, or nothing for a frame, and plays until the player can move again.
+
+    Returns the result of the level if it ended on the way, otherwise None.
+    """
+    if action is WAIT:
+        return state.step()
+
+    state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=KEYS[action]))
+    result = state.step()
+    while result is None and state.player.moving:
+        result = state.step()
+    return result
+
+def solve(data: levels.LevelData, seed: int = 0, max_frames: int = FRAMES) -> Solution:
+    """
+    Finds the quickest way to win a level with A*, trying every key and waiting a frame whenever the player can move.
+
+    Each moment is a snapshot of the level, so every move is played by the game itself and the solution
+    plays out exactly the same in the game with the same seed. Moments that have been reached before are
+    only played on from once. With random enemies the solution only works for the seed it was found with.
+    """
+    main.create_app(display=False)
+    state = main.LevelState(data, seed)
+    tile_map = state.player.tile_map
+    distances = tile_map.distance_field(data.win)
+    with_frame = timed(state)
+
+    def estimate(state):
+        """Fewest frames left to reach the win block, which is never more than it really takes."""
+        distance = distances.get(tile_map.tile(state.player.rect.x, state.player.rect.y))
+        return None if distance is None else distance * state.player.target_frame
+
+    remaining = estimate(state)
+    if remaining is None:
+        return Solution(data.number, seed, None, 0, 0, True) # The win block can't be reached at all
+
+    # Heap of (estimated total frames, key presses, tie breaker, frames, snapshot or the presses of a win)
+    # Ties are broken by pressing fewer keys, then by whatever was found first
+    order = count()
+    queue = [(remaining, 0, next(order), 0, state.snapshot(), False)]
+    best = {state_key(state, with_frame): 0} # Key -> fewest frames it has been reached in
+    explored = 0
+    complete = True
+
+    while queue:
+        _, pressed, _, frames, snapshot, won = heapq.heappop(queue)
+
+        # Nothing left in the queue can win any sooner, as the estimates are never too high
+        if won:
+            return Solution(data.number, seed, snapshot, frames, explored, complete)
+
+        state.restore(snapshot)
+        if best.get(state_key(state, with_frame), frames) < frames:
+            continue # Reached more quickly another way since this was queued
+        explored += 1
+
+        x, y = state.player.rect.topleft
+        for action in (WAIT, *STEPS):
+            if action is not WAIT:
+                move_x, move_y = STEPS[action]
+                if tile_map.is_blocked(x + move_x * config.SQUARE_LENGTH, y + move_y * config.SQUARE_LENGTH):
+                    continue # Bumping into a wall is only waiting without being able to move
+
+            state.restore(snapshot)
+            result = play(state, action)
+            next_pressed = pressed + (action is not WAIT)
+
+            if result == main.WON:
+                heapq.heappush(queue, (state.frame, next_pressed, next(order), state.frame, tuple(state.inputs), True))
+                continue
+
+            # Once the player has been caught the level is lost, whatever is pressed
+            if result == main.LOST or state.player.loss:
+                continue
+
+            if state.frame >= max_frames:
+                complete = False
+                continue
+
+            key = state_key(state, with_frame)
+            if best.get(key, max_frames) <= state.frame:
+                continue
+            best[key] = state.frame
+
+            heapq.heappush(queue, (state.frame + estimate(state), next_pressed, next(order), state.frame,
+                                   state.snapshot(), False))
+
+    return Solution(data.number, seed, None, 0, explored, complete)
+
+def describe(solution: Solution) -> str:
+    """Says what a search found in a line."""
+    if solution.solved:
+        return f"won in {solution.frames} frames with {len(solution.inputs)} key presses"
+    if solution.complete:
+        return "can't be won"
+    return "can't be won within the frame limit"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Finds the quickest way to win every level, or proves that it can't be won.")
+    parser.add_argument("--levels", type=int, nargs="+", help="levels to solve, which is all of them by default")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random enemies")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="frames a solution can take before it is given up on")
+    parser.add_argument("--save", help="folder to save each solution to as a replay, which 'python replay.py --real-time' can show")
+    arguments = parser.parse_args()
+    if arguments.save and arguments.seed not in replay.SEED_RANGE:
+        parser.error("--seed must fit in 64 bits for the solutions to be saved as replays")
+
+    numbers = arguments.levels or list(range(1, levels.level_count() + 1))
+
+    unsolved = 0
+    for number in numbers:
+        start = time.perf_counter()
+        solution = solve(levels.load_level(number), arguments.seed, arguments.frames)
+        seconds = time.perf_counter() - start
+        print(f"Level {number}: {describe(solution)} ({solution.explored:,} moments explored in {seconds:.2f} seconds)")
+
+        if not solution.solved:
+            unsolved += 1
+        elif arguments.save:
+            os.makedirs(arguments.save, exist_ok=True)
+            path = os.path.join(arguments.save, f"level_{number}_solution.replay")
+            replay.save(replay.Recording(number, arguments.seed, solution.inputs, solution.frames, main.WON), path)
+
+    sys.exit(1 if unsolved else 0) # Lets scripts notice a level that can't be won
@@ -1,3 +1,5 @@
+import pygame
+import threading
 from os.path import join
 
 # Lists or sets of voice lines
@@ -49,3 +51,128 @@ def change_volume(sounds: list, volume: float):
     for sound in sounds: # For each sound...
         sound.set_volume(volume) # Set the volume to "volume"
 
+CHANNEL_COUNT = 16 # How many sounds can play at once
+
+def all_sounds() -> list:
+    """Returns the path of every sound in the game, with the sound effects first as they are needed first."""
+    return (effect_sounds + main_menu_sounds + main_menu_return_sounds +
+            level_with_only_player_sounds + level_containing_static_sounds + level_containing_dynamic_sounds +
+            lose_state_sounds + win_state_sounds)
+
+class SilentSound():
+    """Stands in for a Sound when there is no mixer, so anything holding one can carry on without checking."""
+
+    def set_volume(self, volume: float):
+        pass
+
+    def get_volume(self) -> float:
+        return 0.0
+
+    def play(self, loops: int = 0):
+        return None
+
+    def stop(self):
+        pass
+
+silent = SilentSound() # Handed out by the bank for every sound while there is no mixer
+
+class SoundBank():
+    def __init__(self, channel_count: int = CHANNEL_COUNT):
+        """
+        Decodes every sound once and hands the same Sound object to everything that asks for it.
+
+        Sounds are played on a fixed pool of channels, so starting a sound never has to wait for anything.
+        """
+        self.channel_count = channel_count
+        self.sounds = {} # Path -> decoded Sound
+        self.lock = threading.Lock() # Only held while deciding who decodes a sound, never while decoding
+        self.decoding = {} # Path -> Event set once the sound being decoded for it is ready
+        self.loader = None # Thread decoding the sounds in the background
+        self.channels = [] # Made once the mixer is running
+        self.next_channel = 0 # The channel to take over when every channel is busy
+
+    def preload(self, paths: list = None):
+        """Starts decoding sounds in the background, which is every sound in the game by default."""
+        if not pygame.mixer.get_init() or self.loader is not None:
+            return
+
+        paths = all_sounds() if paths is None else paths
+        self.loader = threading.Thread(target=self.load_all, args=(paths,), daemon=True)
+        self.loader.start()
+
+    def load_all(self, paths: list):
+        """Decodes each sound in turn."""
+        for path in paths:
+            # Stop if the mixer is closed, which can happen while the game is quitting
+            if not pygame.mixer.get_init():
+                return
+            try:
+                self.get(path)
+            except pygame.error:
+                return
+
+    def get(self, path: str) -> pygame.mixer.Sound:
+        """Returns the Sound for a path, decoding it first if it hasn't been decoded yet, or a silent one without the mixer."""
+        if not pygame.mixer.get_init():
+            return silent
+
+        # Sounds that have been decoded are handed out straight away, as reading a dictionary is safe between threads
+        sound = self.sounds.get(path)
+        if sound is not None:
+            return sound
+
+        # Sounds are shared, so only the first thread to ask for one decodes it and the rest wait for it
+        with self.lock:
+            sound = self.sounds.get(path)
+            if sound is not None:
+                return sound
+            ready = self.decoding.get(path)
+            decoder = ready is None
+            if decoder:
+                ready = self.decoding[path] = threading.Event()
+
+        if not decoder:
+            ready.wait()
+            # The other thread failed to decode it, so try again here and let any error come out
+            return self.sounds.get(path) or self.get(path)
+
+        # Decoding happens outside the lock, so sounds that are ready never wait on the loader
+        try:
+            sound = self.sounds[path] = pygame.mixer.Sound(path)
+        finally:
+            with self.lock:
+                del self.decoding[path]
+            ready.set()
+        return sound
+
+    def play(self, sound, loops: int = 0):
+        """Plays a Sound or the sound at a path on a channel from the pool."""
+        # Nothing can be played without the mixer
+        if not pygame.mixer.get_init():
+            return None
+
+        if isinstance(sound, str):
+            sound = self.get(sound)
+        if sound is silent:
+            return None
+
+        channel = self.get_channel()
+        channel.play(sound, loops)
+        return channel
+
+    def get_channel(self) -> pygame.mixer.Channel:
+        """Returns an idle channel, or the channel that was taken over the longest time ago if they are all busy."""
+        if not self.channels:
+            pygame.mixer.set_num_channels(self.channel_count)
+            self.channels = [pygame.mixer.Channel(index) for index in range(self.channel_count)]
+
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % self.channel_count
+        return channel
+
+# Sounds shared by the whole game
+bank = SoundBank()
@@ -0,0 +1,259 @@
+# Python file for moving large numbers of enemies at once
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("Enemy swarms need NumPy, which can be installed with 'pip install numpy'.") from error
+
+import pygame
+import config
+import assets
+from enemy import ALL_DIRECTIONS, AXES
+from os.path import join
+
+# Styles of movement, matching the styles of Enemy.Dynamic
+STYLES = {"seek": 0,
+          "randomised": 1,
+          "burst": 2,
+          "axisbound": 3}
+
+# Change in (column, row) for each direction, in the same order as enemy.Direction: left, right, up, down
+DIRECTION_X = np.array([-1, 1, 0, 0])
+DIRECTION_Y = np.array([0, 0, -1, 1])
+
+UNREACHABLE = 1 << 30 # Distance given to tiles that can't reach the player
+TARGET_FRAME = 10 # Ticks taken to move one tile
+BURST_LENGTH = 3 # Moves in a row made by burst enemies
+BURST_REST = -60 # Where the movement timer starts after a burst, so burst enemies rest for a second
+ANIMATION_SPEED = 60 / 1100 # Animation frames per tick
+
+# Arrays that change as the swarm moves, which are copied by snapshot()
+STATE_ARRAYS = ("x", "y", "previous_x", "previous_y", "dx", "dy", "current_frame", "moving", "since_movement",
+                "player_x", "player_y", "burst_count", "burst_direction", "index")
+
+class Swarm():
+    def __init__(self, tile_map, enemies, seed = None, streams = None):
+        """
+        Any number of dynamic enemies stored as arrays, so all of them are moved at once instead of one at a time.
+
+        Enemies are (x, y, frequency, delay, style) and behave like Enemy.Dynamic, apart from making no sound.
+
+        Random moves come from one NumPy generator made from the seed. Streams can be given instead, one
+        random.Random per enemy, and each enemy then draws its moves from its stream exactly as an
+        Enemy.Dynamic with the same stream would, so the swarm moves the same way as the sprites.
+        """
+        enemies = list(enemies)
+        self.tile_map = tile_map
+        self.random = np.random.default_rng(seed)
+        self.streams = list(streams) if streams is not None else None
+        self.frames = assets.load_animation(join("Assets", "Enemy", "DynamicBeing", "DynamicBeing.png"), 2,
+                                            (config.SQUARE_LENGTH, config.SQUARE_LENGTH))
+
+        # Where each enemy is and where it was before the last tick
+        self.x = np.array([enemy[0] for enemy in enemies], dtype=float)
+        self.y = np.array([enemy[1] for enemy in enemies], dtype=float)
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+        # Movement
+        count = len(enemies)
+        self.dx = np.zeros(count)
+        self.dy = np.zeros(count)
+        self.current_frame = np.zeros(count, dtype=int)
+        self.moving = np.zeros(count, dtype=bool)
+        self.since_movement = -np.array([enemy[3] for enemy in enemies], dtype=int)
+        self.target_movement_time = np.array([round(config.TICK_RATE / enemy[2]) for enemy in enemies], dtype=int)
+        self.style = np.array([STYLES[enemy[4].lower()] for enemy in enemies], dtype=int)
+        self.player_x = np.zeros(count) # Where each enemy last saw the player
+        self.player_y = np.zeros(count)
+
+        # Burst and axisbound
+        self.burst_count = np.zeros(count, dtype=int)
+        self.burst_direction = np.full(count, -1) # -1 until a burst starts
+        if self.streams is None:
+            self.axis = self.random.integers(0, 2, count) # 0 for left and right, 1 for up and down
+        else:
+            # Only axisbound enemies pick an axis, like Enemy.Dynamic, so the other streams aren't used up
+            self.axis = np.array([AXES.index(stream.choice(AXES)) if style == STYLES["axisbound"] else 0
+                                  for stream, style in zip(self.streams, self.style)], dtype=int)
+
+        self.index = np.zeros(count) # Animation frame
+
+        # Blocked tiles with a blocked border, so looking next to the edge never goes off the grid
+        self.blocked = np.ones((tile_map.columns + 2, tile_map.rows + 2), dtype=bool)
+        self.blocked[1:-1, 1:-1] = False
+        for column, row in tile_map.blocked:
+            if 0 <= column < tile_map.columns and 0 <= row < tile_map.rows:
+                self.blocked[column + 1, row + 1] = True
+
+        self.distance_fields = {} # Player tile -> array of distances
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def snapshot(self) -> tuple:
+        """Returns a copy of everything that changes as the swarm moves, so it can be put back with restore()."""
+        streams = tuple(stream.getstate() for stream in self.streams) if self.streams is not None else None
+        return tuple(getattr(self, name).copy() for name in STATE_ARRAYS) + (streams, self.random.bit_generator.state)
+
+    def restore(self, snapshot: tuple):
+        """Puts every enemy back how it was when a snapshot was taken."""
+        for name, values in zip(STATE_ARRAYS, snapshot):
+            getattr(self, name)[:] = values
+        if self.streams is not None:
+            for stream, state in zip(self.streams, snapshot[-2]):
+                stream.setstate(state)
+        self.random.bit_generator.state = snapshot[-1]
+
+    def distance_field(self, target: tuple[int, int]) -> np.ndarray:
+        """Returns the tile map's distances to a tile as an array with the same border as the blocked tiles."""
+        if target not in self.distance_fields:
+            field = np.full(self.blocked.shape, UNREACHABLE, dtype=np.int64)
+            for (column, row), distance in self.tile_map.distance_field(target).items():
+                field[column + 1, row + 1] = distance
+            self.distance_fields[target] = field
+        return self.distance_fields[target]
+
+    def tiles(self, indexes):
+        """Returns the (column, row) of the tiles that the chosen enemies are on, shifted by the border."""
+        columns = np.rint(self.x[indexes] / config.SQUARE_LENGTH).astype(int) + 1
+        rows = np.rint(self.y[indexes] / config.SQUARE_LENGTH).astype(int) + 1
+        return columns, rows
+
+    def collides(self, rect) -> bool:
+        """Checks if any enemy is overlapping a rectangle the size of a tile."""
+        return bool(np.any((np.abs(self.x - rect.x) < config.SQUARE_LENGTH) & (np.abs(self.y - rect.y) < config.SQUARE_LENGTH)))
+
+    def step(self, player_rect):
+        """Moves every enemy on by one tick."""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
+        # Animation
+        self.index += ANIMATION_SPEED
+        self.index[self.index >= len(self.frames)] = 0
+
+        # Enemies look at the player the tick before they move
+        looking = ~self.moving & (self.since_movement == self.target_movement_time - 1)
+        self.player_x[looking] = player_rect.x
+        self.player_y[looking] = player_rect.y
+
+        # Move the enemies that are moving
+        sliding = self.moving & (self.current_frame < TARGET_FRAME)
+        self.x[sliding] += self.dx[sliding]
+        self.y[sliding] += self.dy[sliding]
+        self.current_frame[sliding] += 1
+
+        # Stop the enemies that have finished moving, with bursts carrying on until they are complete
+        finished = self.moving & (self.current_frame >= TARGET_FRAME)
+        bursting = finished & (self.burst_direction >= 0)
+        burst_complete = bursting & (self.burst_count >= BURST_LENGTH)
+        self.since_movement[finished] = 0
+        self.since_movement[bursting & ~burst_complete] = self.target_movement_time[bursting & ~burst_complete] - 2
+        self.since_movement[burst_complete] = BURST_REST
+        self.burst_count[burst_complete] = 0
+        self.burst_direction[burst_complete] = -1
+        self.current_frame[finished] = 0
+        self.moving[finished] = False
+
+        # Count the ticks for the enemies that are waiting, and move the ones that have waited long enough
+        waiting = ~self.moving & ~finished
+        self.since_movement[waiting] += 1
+        ready = np.flatnonzero(waiting & (self.since_movement >= self.target_movement_time))
+        if len(ready):
+            self.choose_moves(ready)
+
+    def choose_moves(self, ready):
+        """Picks a direction for each enemy that is ready to move, using its style."""
+        directions = np.full(len(ready), -1) # -1 to stay still
+        style = self.style[ready]
+
+        if self.streams is None:
+            self.draw_moves(ready, style, directions)
+        else:
+            self.draw_stream_moves(ready, style, directions)
+
+        # Seeking enemies follow the distance field to wherever they last saw the player
+        seek = np.flatnonzero(style == STYLES["seek"])
+        if len(seek):
+            directions[seek] = self.seek(ready[seek])
+
+        # Work out the velocities, staying still if the tile being moved to is blocked
+        columns, rows = self.tiles(ready)
+        moves = directions >= 0
+        blocked = np.ones(len(ready), dtype=bool)
+        blocked[moves] = self.blocked[columns[moves] + DIRECTION_X[directions[moves]], rows[moves] + DIRECTION_Y[directions[moves]]]
+        step = config.SQUARE_LENGTH / TARGET_FRAME
+        self.dx[ready] = np.where(blocked, 0, DIRECTION_X[directions] * step)
+        self.dy[ready] = np.where(blocked, 0, DIRECTION_Y[directions] * step)
+        self.moving[ready] = True
+
+    def draw_moves(self, ready, style, directions):
+        """Fills in the directions of the randomised, axisbound and burst enemies from the NumPy generator."""
+        # Randomised enemies go any way
+        randomised = style == STYLES["randomised"]
+        directions[randomised] = self.random.integers(0, 4, np.count_nonzero(randomised))
+
+        # Axisbound enemies go either way along their axis
+        axisbound = style == STYLES["axisbound"]
+        directions[axisbound] = self.axis[ready[axisbound]] * 2 + self.random.integers(0, 2, np.count_nonzero(axisbound))
+
+        # Burst enemies keep going the way their burst started
+        burst = style == STYLES["burst"]
+        starting = burst & (self.burst_direction[ready] < 0)
+        self.burst_direction[ready[starting]] = self.random.integers(0, 4, np.count_nonzero(starting))
+        directions[burst] = self.burst_direction[ready[burst]]
+        self.burst_count[ready[burst]] += 1
+
+    def draw_stream_moves(self, ready, style, directions):
+        """Fills in the directions of the randomised, axisbound and burst enemies from their own streams, one at a time."""
+        for position in np.flatnonzero(style != STYLES["seek"]):
+            index = ready[position]
+            stream = self.streams[index]
+
+            # Every style draws a direction, even bursts that are already heading one way, like Enemy.Dynamic
+            if style[position] == STYLES["axisbound"]:
+                directions[position] = stream.choice(AXES[self.axis[index]])
+            else:
+                directions[position] = stream.choice(ALL_DIRECTIONS)
+
+            if style[position] == STYLES["burst"]:
+                if self.burst_direction[index] < 0:
+                    self.burst_direction[index] = directions[position]
+                directions[position] = self.burst_direction[index]
+                self.burst_count[index] += 1
+
+    def seek(self, seekers):
+        """Returns the best direction for each seeking enemy, or -1 if it can't get any closer."""
+        directions = np.full(len(seekers), -1)
+        columns, rows = self.tiles(seekers)
+        target_columns = np.rint(self.player_x[seekers] / config.SQUARE_LENGTH).astype(int)
+        target_rows = np.rint(self.player_y[seekers] / config.SQUARE_LENGTH).astype(int)
+
+        # Enemies that saw the player on the same tile share one distance field
+        targets = target_columns * self.tile_map.rows + target_rows
+        for target in np.unique(targets):
+            group = np.flatnonzero(targets == target)
+            field = self.distance_field((int(target // self.tile_map.rows), int(target % self.tile_map.rows)))
+
+            # Distances from each tile next to each enemy, one column per direction
+            next_columns = columns[group, None] + DIRECTION_X
+            next_rows = rows[group, None] + DIRECTION_Y
+            distances = field[next_columns, next_rows]
+            closer = distances < field[columns[group], rows[group]][:, None]
+
+            # Ties are broken by the straight line distance, like Enemy.Dynamic
+            straight_line = ((self.player_x[seekers[group], None] - (next_columns - 1) * config.SQUARE_LENGTH) ** 2 +
+                             (self.player_y[seekers[group], None] - (next_rows - 1) * config.SQUARE_LENGTH) ** 2)
+            score = np.where(closer, distances * 1e9 + straight_line, np.inf)
+            best = np.argmin(score, axis=1)
+            directions[group] = np.where(np.isfinite(score[np.arange(len(group)), best]), best, -1)
+
+        return directions
+
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0):
+        """Draws every enemy part way between where it was and where it is."""
+        x = np.rint(self.previous_x + (self.x - self.previous_x) * alpha).astype(int)
+        y = np.rint(self.previous_y + (self.y - self.previous_y) * alpha).astype(int)
+        images = [self.frames[int(index)] for index in self.index]
+        surface.blits(list(zip(images, zip(x.tolist(), y.tolist()))), False)
@@ -0,0 +1,125 @@
+# Python file for checking that levels can be won, by playing each of them many times at once
+
+import json
+import time
+import argparse
+import config
+import levels
+import seeds
+import simulation # Plays the levels, without a window or speakers in this process or the ones it starts
+from concurrent.futures import ProcessPoolExecutor
+
+SEEDS = 200 # Attempts at each level for each kind of player
+FRAMES = 3600 # Frames an attempt can last before it counts as stuck, which is a minute of play
+KEY_INTERVAL = 12 # Frames between key presses for the random player
+CHUNK_SIZE = 25 # Attempts handed to a process at a time
+
+def random_player(seed: int):
+    """Returns a player that presses a random key every so often."""
+    rng = seeds.stream(seed, "validate", "player")
+
+    def choose(game):
+        if game.frame % KEY_INTERVAL == 0:
+            return rng.choice("WASD")
+        return None
+
+    return choose
+
+def path_player(seed: int):
+    """Returns a player that walks the shortest way to the win block, paying no attention to the enemies."""
+    def choose(game):
+        player = game.state.player
+        if player.moving:
+            return None
+
+        distances = player.tile_map.distance_field(game.state.data.win)
+        column, row = player.tile_map.tile(player.rect.x, player.rect.y)
+
+        # Take the step that gets closest to the win block, if there is a way there at all
+        options = [(distances[(column + move_x, row + move_y)], key) for key, (move_x, move_y) in simulation.STEPS.items()
+                   if (column + move_x, row + move_y) in distances]
+        return min(options)[1] if options else None
+
+    return choose
+
+PLAYERS = {"random": random_player,
+           "path": path_player}
+
+def attempt(number: int, player: str, seed: int, max_frames: int) -> tuple:
+    """Plays one attempt at a level, returning the result, or None if it got stuck, and the frames it took."""
+    game = simulation.Simulation(number, seed)
+    choose = PLAYERS[player](seed)
+    while game.result is None and game.frame < max_frames:
+        key = choose(game)
+        if key is not None:
+            game.press(key)
+        game.step()
+
+    return game.result, game.frame
+
+def attempts(number: int, player: str, seed_list: list, max_frames: int) -> list:
+    """Plays an attempt for every seed, which is the work given to one process at a time."""
+    return [attempt(number, player, seed, max_frames) for seed in seed_list]
+
+def summarise(results: list) -> dict:
+    """Works out the win rate, the average time taken to win or lose, and how often attempts got stuck."""
+    won = [frames for result, frames in results if result == "won"]
+    lost = [frames for result, frames in results if result == "lost"]
+    stuck = len(results) - len(won) - len(lost)
+
+    return {"attempts": len(results),
+            "win_rate": len(won) / len(results),
+            "lose_rate": len(lost) / len(results),
+            "stuck_rate": stuck / len(results),
+            "average_time_to_win": sum(won) / len(won) / config.TICK_RATE if won else None,
+            "average_time_to_lose": sum(lost) / len(lost) / config.TICK_RATE if lost else None}
+
+def validate(numbers: list, players: list, seed_count: int = SEEDS, max_frames: int = FRAMES, workers: int = None) -> dict:
+    """Plays every level with every kind of player across a pool of processes, returning a summary of each."""
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for number in numbers:
+            for player in players:
+                for start in range(0, seed_count, CHUNK_SIZE):
+                    seed_list = list(range(start, min(start + CHUNK_SIZE, seed_count)))
+                    jobs[executor.submit(attempts, number, player, seed_list, max_frames)] = (number, player)
+
+        results = {}
+        for job, key in jobs.items():
+            results.setdefault(key, []).extend(job.result())
+
+    return {f"{number}/{player}": summarise(results[(number, player)]) for number, player in results}
+
+def describe(seconds) -> str:
+    """Shows a number of seconds, or a dash if there isn't one."""
+    return "-" if seconds is None else f"{seconds:.1f}s"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays every level many times with different seeds and reports how it went.")
+    parser.add_argument("--levels", type=int, nargs="+", help="levels to play, which is all of them by default")
+    parser.add_argument("--players", nargs="+", choices=list(PLAYERS), default=list(PLAYERS), help="kinds of player to try")
+    parser.add_argument("--seeds", type=int, default=SEEDS, help="attempts at each level for each kind of player")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="frames an attempt can last before it counts as stuck")
+    parser.add_argument("--workers", type=int, help="processes to use, which is one per core by default")
+    parser.add_argument("--output", help="where to save the results as JSON")
+    arguments = parser.parse_args()
+
+    numbers = arguments.levels or list(range(1, levels.level_count() + 1))
+
+    start = time.perf_counter()
+    summary = validate(numbers, arguments.players, arguments.seeds, arguments.frames, arguments.workers)
+    seconds = time.perf_counter() - start
+
+    print(f"{'level':>8} {'player':>8} {'won':>7} {'lost':>7} {'stuck':>7} {'to win':>8} {'to lose':>8}")
+    for key, level in summary.items():
+        number, player = key.split("/")
+        print(f"{number:>8} {player:>8} {level['win_rate']:>7.1%} {level['lose_rate']:>7.1%} {level['stuck_rate']:>7.1%} "
+              f"{describe(level['average_time_to_win']):>8} {describe(level['average_time_to_lose']):>8}")
+
+    attempt_count = sum(level["attempts"] for level in summary.values())
+    print(f"Played {attempt_count:,} attempts in {seconds:.1f} seconds")
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(summary, output_file, indent=4)
+        print(f"Saved the results to {arguments.output}")